@@ -0,0 +1,73 @@
+"""product balances
+
+Revision ID: 3f2a9c1d7b10
+Revises:
+Create Date: 2026-10-18 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "3f2a9c1d7b10"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("products") or inspector.has_table("product_balances"):
+        return
+
+    op.create_table(
+        "product_balances",
+        sa.Column("product_id", sa.Integer(), sa.ForeignKey("products.id"), primary_key=True),
+        sa.Column("in_sum", sa.Integer(), nullable=False),
+        sa.Column("out_sum", sa.Integer(), nullable=False),
+        sa.Column("balance", sa.Integer(), nullable=False),
+        sa.Column("last_movement_id", sa.Integer(), nullable=True),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index("ix_product_balances_balance", "product_balances", ["balance"])
+
+    if not inspector.has_table("stock_movements"):
+        op.execute(
+            "INSERT INTO product_balances (product_id, in_sum, out_sum, balance) "
+            "SELECT id, 0, 0, 0 FROM products"
+        )
+        return
+
+    op.execute(
+        """
+        INSERT INTO product_balances
+            (product_id, in_sum, out_sum, balance, last_movement_id, updated_at)
+        SELECT
+            p.id,
+            COALESCE(t.in_sum, 0),
+            COALESCE(t.out_sum, 0),
+            COALESCE(t.in_sum, 0) - COALESCE(t.out_sum, 0),
+            t.last_movement_id,
+            CURRENT_TIMESTAMP
+        FROM products p
+        LEFT JOIN (
+            SELECT
+                product_id,
+                SUM(CASE WHEN movement_type = 'IN' THEN quantity ELSE 0 END) AS in_sum,
+                SUM(CASE WHEN movement_type = 'OUT' THEN quantity ELSE 0 END) AS out_sum,
+                MAX(id) AS last_movement_id
+            FROM stock_movements
+            GROUP BY product_id
+        ) t ON t.product_id = p.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_product_balances_balance", table_name="product_balances")
+    op.drop_table("product_balances")
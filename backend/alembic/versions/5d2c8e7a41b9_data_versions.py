@@ -0,0 +1,35 @@
+"""data versions
+
+Revision ID: 5d2c8e7a41b9
+Revises: e4a81b6d93f2
+Create Date: 2026-10-18 16:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "5d2c8e7a41b9"
+down_revision = "e4a81b6d93f2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("products") or inspector.has_table("data_versions"):
+        return
+
+    data_versions = op.create_table(
+        "data_versions",
+        sa.Column("scope", sa.String(length=32), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+    )
+    op.bulk_insert(
+        data_versions,
+        [{"scope": "stock", "version": 0}, {"scope": "settings", "version": 0}],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("data_versions")
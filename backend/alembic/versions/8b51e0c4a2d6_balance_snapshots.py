@@ -0,0 +1,51 @@
+"""balance snapshots
+
+Revision ID: 8b51e0c4a2d6
+Revises: 3f2a9c1d7b10
+Create Date: 2026-10-18 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "8b51e0c4a2d6"
+down_revision = "3f2a9c1d7b10"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("products"):
+        return
+
+    if not inspector.has_table("balance_snapshots"):
+        op.create_table(
+            "balance_snapshots",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("snapshot_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("product_id", sa.Integer(), sa.ForeignKey("products.id"), nullable=False),
+            sa.Column("in_sum", sa.Integer(), nullable=False),
+            sa.Column("out_sum", sa.Integer(), nullable=False),
+            sa.Column("balance", sa.Integer(), nullable=False),
+        )
+        op.create_index("ix_balance_snapshots_id", "balance_snapshots", ["id"])
+        op.create_index(
+            "ix_balance_snapshots_snapshot_at_product_id",
+            "balance_snapshots",
+            ["snapshot_at", "product_id"],
+            unique=True,
+        )
+
+    if inspector.has_table("stock_movements"):
+        indexes = {index["name"] for index in inspector.get_indexes("stock_movements")}
+        if "ix_stock_movements_created_at" not in indexes:
+            op.create_index("ix_stock_movements_created_at", "stock_movements", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_stock_movements_created_at", table_name="stock_movements")
+    op.drop_index("ix_balance_snapshots_snapshot_at_product_id", table_name="balance_snapshots")
+    op.drop_index("ix_balance_snapshots_id", table_name="balance_snapshots")
+    op.drop_table("balance_snapshots")
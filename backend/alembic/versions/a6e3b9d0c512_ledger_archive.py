@@ -0,0 +1,70 @@
+"""ledger archive
+
+Revision ID: a6e3b9d0c512
+Revises: 5d2c8e7a41b9
+Create Date: 2026-10-18 18:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "a6e3b9d0c512"
+down_revision = "5d2c8e7a41b9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("products"):
+        return
+
+    if not inspector.has_table("stock_movements_archive"):
+        op.create_table(
+            "stock_movements_archive",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+            sa.Column("product_id", sa.Integer(), sa.ForeignKey("products.id"), nullable=False),
+            sa.Column("movement_type", sa.String(length=3), nullable=False),
+            sa.Column("quantity", sa.Integer(), nullable=False),
+            sa.Column("note", sa.String(length=500), nullable=True),
+            sa.Column("created_by", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        )
+        op.create_index(
+            "ix_stock_movements_archive_product_id_created_at_id",
+            "stock_movements_archive",
+            ["product_id", "created_at", "id"],
+        )
+        op.create_index(
+            "ix_stock_movements_archive_created_at_id",
+            "stock_movements_archive",
+            ["created_at", "id"],
+        )
+
+    if not inspector.has_table("ledger_archives"):
+        op.create_table(
+            "ledger_archives",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("cutoff", sa.DateTime(timezone=True), nullable=False, unique=True),
+            sa.Column("movements", sa.Integer(), nullable=False),
+            sa.Column("products", sa.Integer(), nullable=False),
+            sa.Column(
+                "archived_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=False,
+            ),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("ledger_archives")
+    op.drop_index(
+        "ix_stock_movements_archive_created_at_id", table_name="stock_movements_archive"
+    )
+    op.drop_index(
+        "ix_stock_movements_archive_product_id_created_at_id",
+        table_name="stock_movements_archive",
+    )
+    op.drop_table("stock_movements_archive")
@@ -0,0 +1,68 @@
+"""product search index
+
+Revision ID: c7d93e15f0a4
+Revises: 8b51e0c4a2d6
+Create Date: 2026-10-18 13:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "c7d93e15f0a4"
+down_revision = "8b51e0c4a2d6"
+branch_labels = None
+depends_on = None
+
+
+SQLITE_UPGRADE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5("
+    "name, content='products', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN "
+    "INSERT INTO products_fts(rowid, name) VALUES (new.id, new.name); END",
+    "CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN "
+    "INSERT INTO products_fts(products_fts, rowid, name) VALUES ('delete', old.id, old.name); END",
+    "CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE OF name ON products BEGIN "
+    "INSERT INTO products_fts(products_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+    "INSERT INTO products_fts(rowid, name) VALUES (new.id, new.name); END",
+    "INSERT INTO products_fts(products_fts) VALUES ('rebuild')",
+)
+SQLITE_DOWNGRADE = (
+    "DROP TRIGGER IF EXISTS products_fts_au",
+    "DROP TRIGGER IF EXISTS products_fts_ad",
+    "DROP TRIGGER IF EXISTS products_fts_ai",
+    "DROP TABLE IF EXISTS products_fts",
+)
+POSTGRES_UPGRADE = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_products_name_trgm ON products USING gin (name gin_trgm_ops)",
+)
+POSTGRES_DOWNGRADE = ("DROP INDEX IF EXISTS ix_products_name_trgm",)
+
+
+def _run(statements) -> None:
+    bind = op.get_bind()
+    try:
+        with bind.begin_nested():
+            for statement in statements:
+                bind.exec_driver_sql(statement)
+    except sa.exc.DBAPIError:
+        print("Product search index unavailable; falling back to ILIKE search.")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table("products"):
+        return
+    if bind.dialect.name == "sqlite":
+        _run(SQLITE_UPGRADE)
+    elif bind.dialect.name == "postgresql":
+        _run(POSTGRES_UPGRADE)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        _run(SQLITE_DOWNGRADE)
+    elif bind.dialect.name == "postgresql":
+        _run(POSTGRES_DOWNGRADE)
@@ -0,0 +1,45 @@
+"""ledger composite indexes
+
+Revision ID: e4a81b6d93f2
+Revises: c7d93e15f0a4
+Create Date: 2026-10-18 14:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "e4a81b6d93f2"
+down_revision = "c7d93e15f0a4"
+branch_labels = None
+depends_on = None
+
+
+COMPOSITE_INDEXES = {
+    "ix_stock_movements_product_id_movement_type_quantity": [
+        "product_id",
+        "movement_type",
+        "quantity",
+    ],
+    "ix_stock_movements_product_id_created_at_id": ["product_id", "created_at", "id"],
+    "ix_stock_movements_created_at_id": ["created_at", "id"],
+}
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("stock_movements"):
+        return
+
+    indexes = {index["name"] for index in inspector.get_indexes("stock_movements")}
+    for name, columns in COMPOSITE_INDEXES.items():
+        if name not in indexes:
+            op.create_index(name, "stock_movements", columns)
+    if "ix_stock_movements_created_at" in indexes:
+        op.drop_index("ix_stock_movements_created_at", table_name="stock_movements")
+
+
+def downgrade() -> None:
+    op.create_index("ix_stock_movements_created_at", "stock_movements", ["created_at"])
+    for name in COMPOSITE_INDEXES:
+        op.drop_index(name, table_name="stock_movements")
@@ -0,0 +1,47 @@
+import hmac
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.auth import auth_cache_stats
+from app.core.config import settings
+from app.core.jwt import token_cache_stats
+from app.core.metrics import request_metrics
+from app.core.password_pool import get_password_pool
+from app.db.session import database_stats
+
+
+def require_admin_token(request: Request) -> None:
+    if not settings.admin_api_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(
+        token.encode(), settings.admin_api_token.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin_token)],
+)
+
+
+@router.get("/stats")
+def admin_stats() -> dict:
+    return {
+        "auth": auth_cache_stats(),
+        "tokens": token_cache_stats(),
+        "database": database_stats(),
+        "password_pool": get_password_pool().stats(),
+    }
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def admin_metrics() -> str:
+    return request_metrics.render()
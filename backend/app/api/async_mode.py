@@ -0,0 +1,103 @@
+import inspect
+from functools import wraps
+
+from fastapi import APIRouter, Depends, params
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.api.movements import list_movements, list_movements_async
+from app.api.stock import stock_overview, stock_overview_async
+from app.core.auth import get_current_user, get_current_user_async
+from app.db.deps import get_async_db, get_async_read_db, get_db, get_read_db
+
+
+ASYNC_DEPENDENCIES = {
+    get_db: get_async_db,
+    get_read_db: get_async_read_db,
+    get_current_user: get_current_user_async,
+}
+NATIVE_ENDPOINTS = {
+    list_movements: list_movements_async,
+    stock_overview: stock_overview_async,
+}
+
+
+def uses_database(dependency) -> bool:
+    return any(
+        isinstance(parameter.default, params.Depends)
+        and parameter.default.dependency in ASYNC_DEPENDENCIES
+        for parameter in inspect.signature(dependency).parameters.values()
+    )
+
+
+def async_dependency(dependency: params.Depends) -> params.Depends:
+    target = dependency.dependency
+    if target in ASYNC_DEPENDENCIES:
+        target = ASYNC_DEPENDENCIES[target]
+    elif uses_database(target):
+        target = async_endpoint(target)
+    return Depends(target, use_cache=dependency.use_cache)
+
+
+def async_signature(endpoint) -> inspect.Signature:
+    signature = inspect.signature(endpoint)
+    return signature.replace(
+        parameters=[
+            parameter.replace(default=async_dependency(parameter.default))
+            if isinstance(parameter.default, params.Depends)
+            else parameter
+            for parameter in signature.parameters.values()
+        ]
+    )
+
+
+def async_endpoint(endpoint):
+    native = NATIVE_ENDPOINTS.get(endpoint)
+    if native is not None:
+
+        async def call(**kwargs):
+            if not isinstance(kwargs["db"], AsyncSession):
+                return await run_in_threadpool(endpoint, **kwargs)
+            return await native(**kwargs)
+
+    elif inspect.iscoroutinefunction(endpoint):
+
+        async def call(**kwargs):
+            return await endpoint(**kwargs)
+
+    else:
+
+        async def call(**kwargs):
+            db = kwargs.get("db")
+            if not isinstance(db, AsyncSession):
+                return await run_in_threadpool(endpoint, **kwargs)
+            return await db.run_sync(lambda session: endpoint(**{**kwargs, "db": session}))
+
+    call = wraps(endpoint)(call)
+    call.__signature__ = async_signature(endpoint)
+    return call
+
+
+def async_router(router: APIRouter) -> APIRouter:
+    converted = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            converted.routes.append(route)
+            continue
+        converted.add_api_route(
+            route.path,
+            async_endpoint(route.endpoint),
+            methods=sorted(route.methods),
+            response_model=route.response_model,
+            status_code=route.status_code,
+            dependencies=[async_dependency(dependency) for dependency in route.dependencies],
+            tags=route.tags,
+            name=route.name,
+            summary=route.summary,
+            description=route.description,
+            responses=route.responses,
+            response_class=route.response_class,
+            include_in_schema=route.include_in_schema,
+        )
+    return converted
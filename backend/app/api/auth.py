@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from app.core.security import verify_password
-from app.core.jwt import create_access_token
+from app.core.password_pool import (
+    PasswordPoolBusy,
+    PasswordPoolUnavailable,
+    get_password_pool,
+)
+from app.core.security import password_needs_rehash
+from app.core.jwt import create_access_token, revoke_access_token
 from app.db.deps import get_db
 from app.models.user import User
 from app.schemas.auth import LoginRequest, TokenResponse, UserMe
@@ -12,10 +18,36 @@ from app.core.auth import get_current_user
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+def find_user(db: Session, email: str) -> User | None:
+    return db.query(User).filter(User.email == email).first()
+
+
 @router.post("/login", response_model=TokenResponse)
-def login(payload: LoginRequest, response: Response, db: Session = Depends(get_db)) -> TokenResponse:
-    user = db.query(User).filter(User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.hashed_password):
+async def login(
+    payload: LoginRequest, response: Response, db: Session = Depends(get_db)
+) -> TokenResponse:
+    user = await run_in_threadpool(find_user, db, payload.email)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    pool = get_password_pool()
+    try:
+        verified = await pool.verify(payload.password, user.hashed_password)
+        if verified and user.is_active and password_needs_rehash(user.hashed_password):
+            user.hashed_password = await pool.hash(payload.password)
+            await run_in_threadpool(db.commit)
+    except PasswordPoolBusy:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again shortly",
+            headers={"Retry-After": "1"},
+        )
+    except PasswordPoolUnavailable:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Login is temporarily unavailable",
+            headers={"Retry-After": "1"},
+        )
+    if not verified:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     if not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive user")
@@ -36,6 +68,9 @@ def me(current_user: User = Depends(get_current_user)) -> UserMe:
 
 
 @router.post("/logout")
-def logout(response: Response) -> dict:
+def logout(request: Request, response: Response) -> dict:
+    token = request.cookies.get("access_token")
+    if token:
+        revoke_access_token(token)
     response.delete_cookie("access_token")
     return {"status": "ok"}
@@ -1,15 +1,18 @@
 import csv
 import io
+from collections.abc import Iterable, Iterator
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, Query, Response
-from sqlalchemy import case, func
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api.protected import router as protected_router
-from app.db.deps import get_db
+from app.db.deps import get_read_db, session_iterator
 from app.models.product import Product
-from app.models.stock_movement import StockMovement
+from app.services.archive import movement_history
+from app.services.balance import to_utc
+from app.services.stock_query import PRODUCT_ROWS, stock_params, stock_query
 
 
 router = APIRouter(
@@ -19,57 +22,36 @@ router = APIRouter(
 )
 
 
-def build_csv_response(filename: str, headers: list[str], rows: list[tuple]) -> Response:
+CSV_CHUNK_ROWS = 1000
+
+
+def iter_csv(headers: list[str], rows: Iterable[tuple]) -> Iterator[bytes]:
     buffer = io.StringIO()
     writer = csv.writer(buffer)
+    buffer.write("\ufeff")
     writer.writerow(headers)
-    writer.writerows(rows)
-    content = buffer.getvalue().encode("utf-8-sig")
-    return Response(
-        content=content,
+    for index, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if index % CSV_CHUNK_ROWS == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def build_csv_response(
+    db: Session, filename: str, headers: list[str], rows: Iterable[tuple]
+) -> StreamingResponse:
+    return StreamingResponse(
+        session_iterator(db, iter_csv(headers, rows)),
         media_type="text/csv; charset=utf-8",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
 @router.get("/products.csv")
-def export_products(db: Session = Depends(get_db)) -> Response:
-    in_sum = func.coalesce(
-        func.sum(case((StockMovement.movement_type == "IN", StockMovement.quantity), else_=0)),
-        0,
-    )
-    out_sum = func.coalesce(
-        func.sum(case((StockMovement.movement_type == "OUT", StockMovement.quantity), else_=0)),
-        0,
-    )
-    movement_totals = (
-        db.query(
-            StockMovement.product_id.label("product_id"),
-            in_sum.label("in_sum"),
-            out_sum.label("out_sum"),
-        )
-        .group_by(StockMovement.product_id)
-        .subquery()
-    )
-    balance_expr = func.coalesce(movement_totals.c.in_sum, 0) - func.coalesce(
-        movement_totals.c.out_sum, 0
-    )
-
-    rows = (
-        db.query(
-            Product.id,
-            Product.name,
-            Product.unit,
-            Product.min_stock,
-            Product.low_stock_enabled,
-            Product.is_active,
-            Product.created_at,
-            balance_expr.label("balance"),
-        )
-        .outerjoin(movement_totals, movement_totals.c.product_id == Product.id)
-        .order_by(Product.id)
-        .all()
-    )
+def export_products(db: Session = Depends(get_read_db)) -> StreamingResponse:
+    rows = db.execute(PRODUCT_ROWS, execution_options={"yield_per": CSV_CHUNK_ROWS})
 
     headers = [
         "id",
@@ -81,7 +63,7 @@ def export_products(db: Session = Depends(get_db)) -> Response:
         "created_at",
         "balance",
     ]
-    data_rows = [
+    data_rows = (
         (
             row.id,
             row.name,
@@ -93,37 +75,40 @@ def export_products(db: Session = Depends(get_db)) -> Response:
             int(row.balance or 0),
         )
         for row in rows
-    ]
-    return build_csv_response("products.csv", headers, data_rows)
+    )
+    return build_csv_response(db, "products.csv", headers, data_rows)
 
 
 @router.get("/movements.csv")
 def export_movements(
     start_at: datetime | None = Query(None),
     end_at: datetime | None = Query(None),
-    db: Session = Depends(get_db),
-) -> Response:
+    db: Session = Depends(get_read_db),
+) -> StreamingResponse:
+    start_at = to_utc(start_at) if start_at else None
+    end_at = to_utc(end_at) if end_at else None
+    ledger = movement_history(db, start_at)
     query = (
         db.query(
-            StockMovement.id,
-            StockMovement.product_id,
+            ledger.c.id,
+            ledger.c.product_id,
             Product.name.label("product_name"),
             Product.unit.label("unit"),
-            StockMovement.movement_type,
-            StockMovement.quantity,
-            StockMovement.note,
-            StockMovement.created_by,
-            StockMovement.created_at,
+            ledger.c.movement_type,
+            ledger.c.quantity,
+            ledger.c.note,
+            ledger.c.created_by,
+            ledger.c.created_at,
         )
-        .join(Product, Product.id == StockMovement.product_id)
-        .order_by(StockMovement.created_at.desc(), StockMovement.id.desc())
+        .join(Product, Product.id == ledger.c.product_id)
+        .order_by(ledger.c.created_at.desc(), ledger.c.id.desc())
     )
     if start_at:
-        query = query.filter(StockMovement.created_at >= start_at)
+        query = query.filter(ledger.c.created_at >= start_at)
     if end_at:
-        query = query.filter(StockMovement.created_at <= end_at)
+        query = query.filter(ledger.c.created_at <= end_at)
 
-    rows = query.all()
+    rows = query.yield_per(CSV_CHUNK_ROWS)
     headers = [
         "id",
         "product_id",
@@ -135,7 +120,7 @@ def export_movements(
         "created_by",
         "created_at",
     ]
-    data_rows = [
+    data_rows = (
         (
             row.id,
             row.product_id,
@@ -148,8 +133,8 @@ def export_movements(
             row.created_at.isoformat() if row.created_at else "",
         )
         for row in rows
-    ]
-    return build_csv_response("movements.csv", headers, data_rows)
+    )
+    return build_csv_response(db, "movements.csv", headers, data_rows)
 
 
 @router.get("/stock_overview.csv")
@@ -160,70 +145,18 @@ def export_stock_overview(
     sort_by: str = Query("name", pattern="^(name|balance)$"),
     sort_dir: str = Query("asc", pattern="^(asc|desc)$"),
     low_stock_first: bool = False,
-    db: Session = Depends(get_db),
-) -> Response:
-    in_sum = func.coalesce(
-        func.sum(case((StockMovement.movement_type == "IN", StockMovement.quantity), else_=0)),
-        0,
-    )
-    out_sum = func.coalesce(
-        func.sum(case((StockMovement.movement_type == "OUT", StockMovement.quantity), else_=0)),
-        0,
-    )
-    movement_totals = (
-        db.query(
-            StockMovement.product_id.label("product_id"),
-            in_sum.label("in_sum"),
-            out_sum.label("out_sum"),
-        )
-        .group_by(StockMovement.product_id)
-        .subquery()
-    )
-
-    balance_expr = func.coalesce(movement_totals.c.in_sum, 0) - func.coalesce(
-        movement_totals.c.out_sum, 0
-    )
-    low_stock_expr = case(
-        (
-            (Product.low_stock_enabled.is_(True)) & (balance_expr <= Product.min_stock),
-            True,
+    as_of: datetime | None = None,
+    db: Session = Depends(get_read_db),
+) -> StreamingResponse:
+    query = stock_query(db, as_of)
+    search_mode, params = stock_params(db, search, as_of)
+    rows = db.execute(
+        query.ordered(
+            search_mode, active_only, low_stock_only, sort_by, sort_dir, low_stock_first
         ),
-        else_=False,
+        params,
+        execution_options={"yield_per": CSV_CHUNK_ROWS},
     )
-
-    query = (
-        db.query(
-            Product.id,
-            Product.name,
-            Product.unit,
-            Product.min_stock,
-            Product.low_stock_enabled,
-            Product.is_active,
-            Product.created_at,
-            balance_expr.label("balance"),
-            low_stock_expr.label("low_stock"),
-        )
-        .outerjoin(movement_totals, movement_totals.c.product_id == Product.id)
-    )
-
-    if search:
-        query = query.filter(Product.name.ilike(f"%{search}%"))
-    if active_only:
-        query = query.filter(Product.is_active.is_(True))
-    if low_stock_only:
-        query = query.filter(low_stock_expr.is_(True))
-
-    if low_stock_first:
-        query = query.order_by(low_stock_expr.desc())
-
-    sort_columns = {"name": Product.name, "balance": balance_expr}
-    sort_column = sort_columns[sort_by]
-    if sort_dir == "desc":
-        query = query.order_by(sort_column.desc())
-    else:
-        query = query.order_by(sort_column.asc())
-
-    rows = query.all()
     headers = [
         "id",
         "name",
@@ -235,7 +168,7 @@ def export_stock_overview(
         "balance",
         "low_stock",
     ]
-    data_rows = [
+    data_rows = (
         (
             row.id,
             row.name,
@@ -248,5 +181,5 @@ def export_stock_overview(
             bool(row.low_stock),
         )
         for row in rows
-    ]
-    return build_csv_response("stock_overview.csv", headers, data_rows)
+    )
+    return build_csv_response(db, "stock_overview.csv", headers, data_rows)
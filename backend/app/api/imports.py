@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+
+from app.api.protected import router as protected_router
+from app.core.auth import get_current_user
+from app.core.uploads import open_text, spool_request_body
+from app.db.deps import get_db, run_in_session
+from app.models.user import User
+from app.schemas.product import ProductImportResult
+from app.services.product_import import import_products
+
+
+router = APIRouter(
+    prefix="/import",
+    tags=["import"],
+    dependencies=protected_router.dependencies,
+)
+
+
+def run_product_import(db: Session, spool, created_by: int) -> ProductImportResult:
+    result = import_products(db, open_text(spool), created_by)
+    db.commit()
+    return result
+
+
+@router.post("/products.csv", response_model=ProductImportResult)
+async def import_products_csv(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> ProductImportResult:
+    spool = await spool_request_body(request)
+    try:
+        return await run_in_session(db, run_product_import, spool, current_user.id)
+    finally:
+        spool.close()
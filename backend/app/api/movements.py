@@ -1,13 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.protected import router as protected_router
 from app.core.auth import get_current_user
-from app.db.deps import get_db
+from app.core.etag import stock_etag
+from app.core.pagination import (
+    page_params,
+    page_statement,
+    paginate_statement,
+    paginate_statement_async,
+    row_dicts,
+)
+from app.core.uploads import is_ndjson, open_text, spool_request_body
+from app.db.deps import get_db, get_read_db, run_in_session
 from app.models.product import Product
 from app.models.stock_movement import StockMovement
 from app.models.user import User
-from app.schemas.movement import MovementCreate, MovementList, MovementOut
+from app.schemas.movement import (
+    MovementBulkCreate,
+    MovementBulkResult,
+    MovementCreate,
+    MovementList,
+    MovementOut,
+)
+from app.services.archive import LEDGER_COLUMNS, history_since, movement_history
+from app.services.balance import ARCHIVE_CUTOFF, apply_movement, to_utc
+from app.services.movements import (
+    BulkIngestError,
+    bulk_create_movements,
+    parse_movement_rows,
+    validate_movement_rows,
+)
 
 
 router = APIRouter(
@@ -35,25 +62,147 @@ def create_movement(
         created_by=current_user.id,
     )
     db.add(movement)
+    db.flush()
+    apply_movement(db, movement)
     db.commit()
     db.refresh(movement)
     return movement
 
 
-@router.get("", response_model=MovementList)
+def ingest_movements(db: Session, rows, created_by: int, mode: str) -> MovementBulkResult:
+    try:
+        result = bulk_create_movements(db, rows, created_by, atomic=mode == "atomic")
+    except BulkIngestError as exc:
+        db.rollback()
+        raise HTTPException(
+            status_code=422,
+            detail=[{"index": error.index, "detail": error.detail} for error in exc.errors],
+        )
+    db.commit()
+    return result
+
+
+@router.post("/bulk", response_model=MovementBulkResult, status_code=status.HTTP_201_CREATED)
+def create_movements_bulk(
+    payload: MovementBulkCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> MovementBulkResult:
+    return ingest_movements(
+        db, validate_movement_rows(payload.items), current_user.id, payload.mode
+    )
+
+
+@router.post(
+    "/bulk/upload", response_model=MovementBulkResult, status_code=status.HTTP_201_CREATED
+)
+async def upload_movements_bulk(
+    request: Request,
+    mode: str = Query("atomic", pattern="^(atomic|partial)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> MovementBulkResult:
+    spool = await spool_request_body(request)
+    try:
+        rows = parse_movement_rows(
+            open_text(spool), ndjson=is_ndjson(request.headers.get("content-type"))
+        )
+        return await run_in_session(db, ingest_movements, rows, current_user.id, mode)
+    finally:
+        spool.close()
+
+
+def movement_key(movement) -> tuple:
+    return movement.created_at, movement.id
+
+
+def movement_page(
+    ledger,
+    product_id: int | None,
+    movement_type: str | None,
+    start_at: datetime | None,
+    end_at: datetime | None,
+    cursor: str | None,
+    skip: int,
+    limit: int,
+) -> tuple[Select, Select, dict]:
+    statement = select(*(ledger.c[name] for name in LEDGER_COLUMNS))
+    if product_id is not None:
+        statement = statement.where(ledger.c.product_id == product_id)
+    if movement_type:
+        statement = statement.where(ledger.c.movement_type == movement_type)
+    if start_at:
+        statement = statement.where(ledger.c.created_at >= start_at)
+    if end_at:
+        statement = statement.where(ledger.c.created_at <= end_at)
+
+    keys = [(ledger.c.created_at, True), (ledger.c.id, True)]
+    return (
+        select(func.count()).select_from(statement.subquery()),
+        page_statement(statement, keys, bool(cursor)),
+        page_params(keys, "movements", cursor, skip, limit),
+    )
+
+
+@router.get("", response_model=MovementList, dependencies=[Depends(stock_etag)])
 def list_movements(
     product_id: int | None = Query(None, ge=1),
     movement_type: str | None = Query(None, min_length=1),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
-    db: Session = Depends(get_db),
+    cursor: str | None = None,
+    include_total: bool = True,
+    start_at: datetime | None = None,
+    end_at: datetime | None = None,
+    db: Session = Depends(get_read_db),
 ) -> MovementList:
-    query = db.query(StockMovement).order_by(StockMovement.created_at.desc(), StockMovement.id.desc())
-    if product_id is not None:
-        query = query.filter(StockMovement.product_id == product_id)
-    if movement_type:
-        query = query.filter(StockMovement.movement_type == movement_type)
+    start_at = to_utc(start_at) if start_at else None
+    end_at = to_utc(end_at) if end_at else None
+    count, page, params = movement_page(
+        movement_history(db, start_at),
+        product_id,
+        movement_type,
+        start_at,
+        end_at,
+        cursor,
+        skip,
+        limit,
+    )
+    total = db.scalar(count) if include_total else None
+    rows, next_cursor = paginate_statement(db, page, params, "movements", limit, movement_key)
+    return MovementList(
+        items=row_dicts(rows), total=total, skip=skip, limit=limit, next_cursor=next_cursor
+    )
+
 
-    total = query.count()
-    items = query.offset(skip).limit(limit).all()
-    return MovementList(items=items, total=total, skip=skip, limit=limit)
+async def list_movements_async(
+    product_id: int | None,
+    movement_type: str | None,
+    skip: int,
+    limit: int,
+    cursor: str | None,
+    include_total: bool,
+    start_at: datetime | None,
+    end_at: datetime | None,
+    db: AsyncSession,
+) -> MovementList:
+    start_at = to_utc(start_at) if start_at else None
+    end_at = to_utc(end_at) if end_at else None
+    cutoff = await db.scalar(ARCHIVE_CUTOFF)
+    count, page, params = movement_page(
+        history_since(to_utc(cutoff) if cutoff is not None else None, start_at),
+        product_id,
+        movement_type,
+        start_at,
+        end_at,
+        cursor,
+        skip,
+        limit,
+    )
+    total = await db.scalar(count) if include_total else None
+    rows, next_cursor = await paginate_statement_async(
+        db, page, params, "movements", limit, movement_key
+    )
+    return MovementList(
+        items=row_dicts(rows), total=total, skip=skip, limit=limit, next_cursor=next_cursor
+    )
@@ -1,13 +1,20 @@
+from typing import List
+
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.api.protected import router as protected_router
 from app.core.auth import get_current_user
-from app.db.deps import get_db
+from app.core.etag import stock_etag
+from app.core.pagination import paginate
+from app.db.deps import get_db, get_read_db
 from app.models.product import Product
 from app.models.stock_movement import StockMovement
+from app.models.stock_movement_archive import StockMovementArchive
 from app.models.user import User
 from app.schemas.product import ProductCreate, ProductList, ProductOut, ProductUpdate
+from app.services.balance import apply_movement, create_balance, delete_balance
+from app.services.search import name_filter, search_products
 
 
 router = APIRouter(
@@ -37,6 +44,7 @@ def create_product(
     )
     db.add(product)
     db.flush()
+    create_balance(db, product.id)
     if payload.initial_stock and payload.initial_stock > 0:
         movement = StockMovement(
             product_id=product.id,
@@ -46,6 +54,8 @@ def create_product(
             created_by=current_user.id,
         )
         db.add(movement)
+        db.flush()
+        apply_movement(db, movement)
     db.commit()
     db.refresh(product)
     return product
@@ -91,21 +101,45 @@ def delete_product(product_id: int, db: Session = Depends(get_db)) -> ProductOut
     db.query(StockMovement).filter(StockMovement.product_id == product_id).delete(
         synchronize_session=False
     )
+    db.query(StockMovementArchive).filter(StockMovementArchive.product_id == product_id).delete(
+        synchronize_session=False
+    )
+    delete_balance(db, product_id)
     db.delete(product)
     db.commit()
     return product
 
 
-@router.get("", response_model=ProductList)
+@router.get("/search", response_model=List[ProductOut])
+def search_product_names(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    active_only: bool = True,
+    db: Session = Depends(get_db),
+) -> List[ProductOut]:
+    return search_products(db, q, limit, active_only=active_only)
+
+
+@router.get("", response_model=ProductList, dependencies=[Depends(stock_etag)])
 def list_products(
     search: str | None = Query(None, min_length=1),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
-    db: Session = Depends(get_db),
+    cursor: str | None = None,
+    include_total: bool = True,
+    db: Session = Depends(get_read_db),
 ) -> ProductList:
-    query = db.query(Product).order_by(Product.id)
+    query = db.query(Product)
     if search:
-        query = query.filter(Product.name.ilike(f"%{search}%"))
-    total = query.count()
-    items = query.offset(skip).limit(limit).all()
-    return ProductList(items=items, total=total, skip=skip, limit=limit)
+        query = query.filter(name_filter(db, search))
+    total = query.count() if include_total else None
+    items, next_cursor = paginate(
+        query,
+        [(Product.id, False)],
+        "products",
+        cursor,
+        skip,
+        limit,
+        lambda product: (product.id,),
+    )
+    return ProductList(items=items, total=total, skip=skip, limit=limit, next_cursor=next_cursor)
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from app.api.protected import router as protected_router
+from app.core.etag import settings_etag
 from app.db.deps import get_db
 from app.models.settings import Settings
 from app.schemas.settings import SettingsOut, SettingsUpdate
@@ -26,7 +27,7 @@ def get_or_create_settings(db: Session) -> Settings:
     return settings
 
 
-@router.get("", response_model=SettingsOut)
+@router.get("", response_model=SettingsOut, dependencies=[Depends(settings_etag)])
 def get_settings(db: Session = Depends(get_db)) -> SettingsOut:
     return get_or_create_settings(db)
 
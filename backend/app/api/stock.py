@@ -1,12 +1,34 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import case, func
+from collections.abc import Callable
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.api.protected import router as protected_router
-from app.db.deps import get_db
-from app.models.product import Product
-from app.models.stock_movement import StockMovement
-from app.schemas.stock import StockOverviewItem, StockOverviewList
+from app.core.config import settings
+from app.core.etag import stock_etag
+from app.core.pagination import (
+    page_params,
+    paginate_statement,
+    paginate_statement_async,
+    row_dicts,
+)
+from app.db.deps import close_session, get_db, get_read_db
+from app.schemas.stock import StockOverviewList
+from app.services.inventory import get_inventory_index
+from app.services.low_stock import get_low_stock_cache
+from app.services.stock_events import get_stock_events
+from app.services.stock_query import (
+    CURRENT_STOCK,
+    LOW_STOCK_COUNT,
+    StockQuery,
+    stock_params,
+    stock_query,
+)
 
 
 router = APIRouter(
@@ -16,7 +38,48 @@ router = APIRouter(
 )
 
 
-@router.get("/overview", response_model=StockOverviewList)
+def overview_page(
+    query: StockQuery,
+    search_mode: str | None,
+    low_stock_only: bool,
+    active_only: bool,
+    sort_by: str,
+    sort_dir: str,
+    low_stock_first: bool,
+    skip: int,
+    limit: int,
+    cursor: str | None,
+) -> tuple[Select, Select, dict, str, Callable]:
+    scope = f"stock:{sort_by}:{sort_dir}:{int(low_stock_first)}"
+    keys = query.sort_keys(sort_by, sort_dir, low_stock_first)
+
+    def sort_key(row) -> list:
+        values = [row.name if sort_by == "name" else int(row.balance or 0), row.id]
+        if low_stock_first:
+            values.insert(0, bool(row.low_stock))
+        return values
+
+    page = query.page(
+        search_mode,
+        active_only,
+        low_stock_only,
+        sort_by,
+        sort_dir,
+        low_stock_first,
+        bool(cursor),
+    )
+    return (
+        query.count(search_mode, active_only, low_stock_only),
+        page,
+        page_params(keys, scope, cursor, skip, limit),
+        scope,
+        sort_key,
+    )
+
+
+@router.get(
+    "/overview", response_model=StockOverviewList, dependencies=[Depends(stock_etag)]
+)
 def stock_overview(
     search: str | None = Query(None, min_length=1),
     low_stock_only: bool = False,
@@ -24,126 +87,129 @@ def stock_overview(
     sort_by: str = Query("name", pattern="^(name|balance)$"),
     sort_dir: str = Query("asc", pattern="^(asc|desc)$"),
     low_stock_first: bool = False,
+    as_of: datetime | None = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=200),
-    db: Session = Depends(get_db),
+    cursor: str | None = None,
+    include_total: bool = True,
+    db: Session = Depends(get_read_db),
 ) -> StockOverviewList:
-    in_sum = func.coalesce(
-        func.sum(case((StockMovement.movement_type == "IN", StockMovement.quantity), else_=0)),
-        0,
-    )
-    out_sum = func.coalesce(
-        func.sum(case((StockMovement.movement_type == "OUT", StockMovement.quantity), else_=0)),
-        0,
-    )
-    movement_totals = (
-        db.query(
-            StockMovement.product_id.label("product_id"),
-            in_sum.label("in_sum"),
-            out_sum.label("out_sum"),
+    index = get_inventory_index()
+    if index is not None and as_of is None:
+        return index.overview(
+            search=search,
+            low_stock_only=low_stock_only,
+            active_only=active_only,
+            sort_by=sort_by,
+            sort_dir=sort_dir,
+            low_stock_first=low_stock_first,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total,
         )
-        .group_by(StockMovement.product_id)
-        .subquery()
-    )
 
-    balance_expr = func.coalesce(movement_totals.c.in_sum, 0) - func.coalesce(
-        movement_totals.c.out_sum, 0
+    query = stock_query(db, as_of)
+    search_mode, params = stock_params(db, search, as_of)
+    count, page, page_values, scope, sort_key = overview_page(
+        query,
+        search_mode,
+        low_stock_only,
+        active_only,
+        sort_by,
+        sort_dir,
+        low_stock_first,
+        skip,
+        limit,
+        cursor,
     )
-    low_stock_expr = case(
-        (
-            (Product.low_stock_enabled.is_(True)) & (balance_expr <= Product.min_stock),
-            True,
-        ),
-        else_=False,
+    total = db.execute(count, params).scalar_one() if include_total else None
+    rows, next_cursor = paginate_statement(
+        db, page, {**params, **page_values}, scope, limit, sort_key
     )
-
-    query = (
-        db.query(
-            Product.id,
-            Product.name,
-            Product.unit,
-            Product.min_stock,
-            Product.low_stock_enabled,
-            Product.is_active,
-            Product.created_at,
-            balance_expr.label("balance"),
-            low_stock_expr.label("low_stock"),
-        )
-        .outerjoin(movement_totals, movement_totals.c.product_id == Product.id)
+    return StockOverviewList(
+        items=row_dicts(rows), total=total, skip=skip, limit=limit, next_cursor=next_cursor
     )
 
-    if search:
-        query = query.filter(Product.name.ilike(f"%{search}%"))
-    if active_only:
-        query = query.filter(Product.is_active.is_(True))
-    if low_stock_only:
-        query = query.filter(low_stock_expr.is_(True))
-
-    if low_stock_first:
-        query = query.order_by(low_stock_expr.desc())
-
-    sort_columns = {"name": Product.name, "balance": balance_expr}
-    sort_column = sort_columns[sort_by]
-    if sort_dir == "desc":
-        query = query.order_by(sort_column.desc())
-    else:
-        query = query.order_by(sort_column.asc())
-
-    total = query.count()
-    rows = query.offset(skip).limit(limit).all()
-    items = [
-        StockOverviewItem(
-            id=row.id,
-            name=row.name,
-            unit=row.unit,
-            min_stock=row.min_stock,
-            low_stock_enabled=row.low_stock_enabled,
-            is_active=row.is_active,
-            created_at=row.created_at,
-            balance=int(row.balance or 0),
-            low_stock=bool(row.low_stock),
-        )
-        for row in rows
-    ]
-    return StockOverviewList(items=items, total=total, skip=skip, limit=limit)
 
+async def stock_overview_async(
+    search: str | None,
+    low_stock_only: bool,
+    active_only: bool,
+    sort_by: str,
+    sort_dir: str,
+    low_stock_first: bool,
+    as_of: datetime | None,
+    skip: int,
+    limit: int,
+    cursor: str | None,
+    include_total: bool,
+    db: AsyncSession,
+) -> StockOverviewList:
+    query = dict(
+        search=search,
+        low_stock_only=low_stock_only,
+        active_only=active_only,
+        sort_by=sort_by,
+        sort_dir=sort_dir,
+        low_stock_first=low_stock_first,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total,
+    )
+    index = get_inventory_index()
+    if index is not None and as_of is None:
+        return await run_in_threadpool(lambda: index.overview(**query))
+    if as_of is not None:
+        return await db.run_sync(lambda session: stock_overview(as_of=as_of, db=session, **query))
 
-@router.get("/low/count")
-def low_stock_count(db: Session = Depends(get_db)) -> dict:
-    in_sum = func.coalesce(
-        func.sum(case((StockMovement.movement_type == "IN", StockMovement.quantity), else_=0)),
-        0,
+    search_mode, params = await db.run_sync(stock_params, search)
+    count, page, page_values, scope, sort_key = overview_page(
+        CURRENT_STOCK,
+        search_mode,
+        low_stock_only,
+        active_only,
+        sort_by,
+        sort_dir,
+        low_stock_first,
+        skip,
+        limit,
+        cursor,
     )
-    out_sum = func.coalesce(
-        func.sum(case((StockMovement.movement_type == "OUT", StockMovement.quantity), else_=0)),
-        0,
+    total = (await db.execute(count, params)).scalar_one() if include_total else None
+    rows, next_cursor = await paginate_statement_async(
+        db, page, {**params, **page_values}, scope, limit, sort_key
     )
-    movement_totals = (
-        db.query(
-            StockMovement.product_id.label("product_id"),
-            in_sum.label("in_sum"),
-            out_sum.label("out_sum"),
-        )
-        .group_by(StockMovement.product_id)
-        .subquery()
+    return StockOverviewList(
+        items=row_dicts(rows), total=total, skip=skip, limit=limit, next_cursor=next_cursor
     )
 
-    balance_expr = func.coalesce(movement_totals.c.in_sum, 0) - func.coalesce(
-        movement_totals.c.out_sum, 0
-    )
-    low_stock_expr = case(
-        (
-            (Product.low_stock_enabled.is_(True)) & (balance_expr <= Product.min_stock),
-            True,
-        ),
-        else_=False,
-    )
 
-    total = (
-        db.query(Product)
-        .outerjoin(movement_totals, movement_totals.c.product_id == Product.id)
-        .filter(Product.is_active.is_(True))
-        .filter(low_stock_expr.is_(True))
-        .count()
+@router.get("/low/count")
+def low_stock_count(db: Session = Depends(get_read_db)) -> dict:
+    cache = get_low_stock_cache()
+    if cache is not None:
+        return {"count": cache.count()}
+    return {"count": db.execute(LOW_STOCK_COUNT).scalar_one()}
+
+
+@router.get("/events")
+async def stock_events(
+    request: Request,
+    last_event_id: str | None = Header(None),
+    db: Session = Depends(get_db),
+) -> StreamingResponse:
+    broadcaster = get_stock_events()
+    if broadcaster is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Stock events are disabled"
+        )
+    await close_session(db)
+    return StreamingResponse(
+        broadcaster.stream(
+            last_event_id, request.is_disconnected, settings.stock_events_keepalive_seconds
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    return {"count": total}
@@ -1,17 +1,92 @@
+import threading
+import time
 from typing import Optional
 
 from fastapi import Depends, HTTPException, Request, status
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
+from app.core.config import settings
 from app.core.jwt import decode_access_token
-from app.db.deps import get_db
+from app.db.deps import get_async_db, get_db
 from app.models.user import User
 
 
+_user_cache: dict[int, tuple[float, User]] = {}
+_user_cache_lock = threading.Lock()
+_auth_stats = {"db_hits": 0, "cache_hits": 0, "invalidations": 0}
+
+
+def _cached_user(user_id: int) -> Optional[User]:
+    with _user_cache_lock:
+        entry = _user_cache.get(user_id)
+        if entry and entry[0] > time.monotonic():
+            _auth_stats["cache_hits"] += 1
+            return entry[1]
+        _user_cache.pop(user_id, None)
+        _auth_stats["db_hits"] += 1
+        return None
+
+
+def _remember_user(user: User) -> None:
+    if settings.auth_user_cache_ttl_seconds <= 0:
+        return
+    snapshot = User(
+        id=user.id,
+        email=user.email,
+        hashed_password=user.hashed_password,
+        is_active=user.is_active,
+        created_at=user.created_at,
+    )
+    make_transient_to_detached(snapshot)
+    expires_at = time.monotonic() + settings.auth_user_cache_ttl_seconds
+    with _user_cache_lock:
+        _user_cache[user.id] = (expires_at, snapshot)
+
+
+def invalidate_user(user_id: int) -> None:
+    with _user_cache_lock:
+        if _user_cache.pop(user_id, None) is not None:
+            _auth_stats["invalidations"] += 1
+
+
+def clear_user_cache() -> None:
+    with _user_cache_lock:
+        _user_cache.clear()
+
+
+def auth_cache_stats() -> dict:
+    with _user_cache_lock:
+        return {**_auth_stats, "cached_users": len(_user_cache)}
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target: User) -> None:
+    invalidate_user(target.id)
+
+
+def load_active_user(db: Session, user_id: int) -> Optional[User]:
+    cached = _cached_user(user_id)
+    if cached is not None:
+        return db.merge(cached, load=False)
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if user and user.is_active:
+        _remember_user(user)
+        return user
+    return None
+
+
 def get_current_user(
     request: Request,
     db: Session = Depends(get_db),
 ) -> User:
+    current_user = getattr(request.state, "current_user", None)
+    if current_user is not None:
+        return current_user
+
     token = request.cookies.get("access_token")
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
@@ -25,8 +100,19 @@ def get_current_user(
     if not subject:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    user = db.query(User).filter(User.id == int(subject)).first()
-    if not user or not user.is_active:
+    user = load_active_user(db, int(subject))
+    if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Inactive user")
 
+    request.state.current_user = user
     return user
+
+
+async def get_current_user_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    current_user = getattr(request.state, "current_user", None)
+    if current_user is not None:
+        return current_user
+    return await db.run_sync(lambda session: get_current_user(request, session))
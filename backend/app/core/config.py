@@ -5,10 +5,46 @@ class Settings(BaseSettings):
     app_name: str = "StockCheck"
     secret_key: str = "change-me"
     database_url: str = "sqlite:///./app.db"
+    database_async: bool = False
+    database_async_url: str = ""
+    database_read_url: str = ""
+    database_read_your_writes_seconds: float = 5
+    database_pool_size: int = 10
+    database_max_overflow: int = 30
+    database_pool_timeout: int = 30
+    database_pool_recycle: int = 1800
+    database_pool_pre_ping: bool = True
+    database_statement_timeout_ms: int = 0
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size: int = -64000
+    sqlite_mmap_size: int = 268435456
     frontend_origin: str = "http://localhost:5173"
     admin_email: str = "admin@example.com"
     admin_password: str = "change-me"
     access_token_expire_minutes: int = 60
+    access_token_cache_size: int = 4096
+    auth_user_cache_ttl_seconds: int = 30
+    password_hash_iterations: int = 100_000
+    password_hash_workers: int = 2
+    password_hash_queue: int = 32
+    balance_snapshot_interval_hours: int = 24
+    balance_snapshot_lag_seconds: int = 300
+    product_search_backend: str = "auto"
+    inventory_index_enabled: bool = False
+    low_stock_cache_enabled: bool = False
+    stock_events_enabled: bool = False
+    stock_events_backend: str = "auto"
+    stock_events_buffer: int = 1000
+    stock_events_keepalive_seconds: float = 15
+    compression_minimum_size: int = 1024
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    request_metrics_enabled: bool = False
+    admin_api_token: str = ""
+    slow_query_ms: float = 200
+    n_plus_one_threshold: int = 10
 
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=False)
 
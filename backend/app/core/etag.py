@@ -0,0 +1,33 @@
+from collections.abc import Callable
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session
+
+from app.db.changes import SETTINGS_VERSION, STOCK_VERSION, version_tag
+from app.db.deps import get_db, get_read_db
+
+
+def _opaque(tag: str) -> str:
+    return tag.strip().removeprefix("W/")
+
+
+def etag_matches(if_none_match: str | None, tag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {_opaque(candidate) for candidate in if_none_match.split(",")}
+    return "*" in candidates or _opaque(tag) in candidates
+
+
+def conditional_get(scope: str, database: Callable = get_read_db) -> Callable:
+    def check_etag(request: Request, response: Response, db: Session = Depends(database)) -> None:
+        tag = f'W/"{version_tag(db, scope)}"'
+        headers = {"ETag": tag, "Cache-Control": "private, no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), tag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+    return check_etag
+
+
+stock_etag = conditional_get(STOCK_VERSION)
+settings_etag = conditional_get(SETTINGS_VERSION, get_db)
@@ -1,3 +1,8 @@
+import hashlib
+import secrets
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 
 import jwt
@@ -5,11 +10,82 @@ import jwt
 from app.core.config import settings
 
 
+_token_cache: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+_revoked_tokens: dict[bytes, float] = {}
+_token_lock = threading.Lock()
+_token_stats = {"hits": 0, "misses": 0, "evictions": 0, "revocations": 0}
+
+
 def create_access_token(subject: str) -> str:
     expires = datetime.now(timezone.utc) + timedelta(minutes=settings.access_token_expire_minutes)
-    payload = {"sub": subject, "exp": expires}
+    payload = {"sub": subject, "exp": expires, "jti": secrets.token_urlsafe(12)}
     return jwt.encode(payload, settings.secret_key, algorithm="HS256")
 
 
+def _token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
 def decode_access_token(token: str) -> dict:
-    return jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+    key = _token_key(token)
+    now = time.time()
+    with _token_lock:
+        if key in _revoked_tokens:
+            raise jwt.InvalidTokenError("Token has been revoked")
+        entry = _token_cache.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                _token_cache.move_to_end(key)
+                _token_stats["hits"] += 1
+                return dict(entry[1])
+            del _token_cache[key]
+        _token_stats["misses"] += 1
+
+    payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+    if settings.access_token_cache_size <= 0:
+        return payload
+    expires_at = float(payload.get("exp", now))
+    with _token_lock:
+        if key in _revoked_tokens:
+            raise jwt.InvalidTokenError("Token has been revoked")
+        _token_cache[key] = (expires_at, payload)
+        _token_cache.move_to_end(key)
+        while len(_token_cache) > settings.access_token_cache_size:
+            _token_cache.popitem(last=False)
+            _token_stats["evictions"] += 1
+    return dict(payload)
+
+
+def revoke_access_token(token: str) -> None:
+    try:
+        payload = jwt.decode(
+            token, settings.secret_key, algorithms=["HS256"], options={"verify_exp": False}
+        )
+    except jwt.InvalidTokenError:
+        return
+    key = _token_key(token)
+    now = time.time()
+    with _token_lock:
+        for revoked, expires_at in list(_revoked_tokens.items()):
+            if expires_at <= now:
+                del _revoked_tokens[revoked]
+        _revoked_tokens[key] = float(payload.get("exp", now))
+        _token_cache.pop(key, None)
+        _token_stats["revocations"] += 1
+
+
+def clear_token_cache() -> None:
+    with _token_lock:
+        _token_cache.clear()
+        _revoked_tokens.clear()
+
+
+def token_cache_stats() -> dict:
+    with _token_lock:
+        lookups = _token_stats["hits"] + _token_stats["misses"]
+        return {
+            **_token_stats,
+            "hit_rate": round(_token_stats["hits"] / lookups, 4) if lookups else 0.0,
+            "cached_tokens": len(_token_cache),
+            "revoked_tokens": len(_revoked_tokens),
+        }
@@ -0,0 +1,220 @@
+import logging
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class RequestProfile:
+    slow_query_seconds: float
+    queries: int = 0
+    db_seconds: float = 0.0
+    slow_queries: int = 0
+    statements: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.queries += 1
+        self.db_seconds += elapsed
+        self.statements[statement] += 1
+        if elapsed >= self.slow_query_seconds:
+            self.slow_queries += 1
+            logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, statement)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [
+            (statement, count) for statement, count in self.statements.items() if count >= threshold
+        ]
+
+    def server_timing(self, elapsed: float) -> str:
+        return (
+            f"app;dur={elapsed * 1000:.1f}, "
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries"'
+        )
+
+
+_profile: ContextVar[RequestProfile | None] = ContextVar("request_profile", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _profile.get() is not None and context is not None:
+        context.query_started = time.perf_counter()
+
+
+def _record_query(context, statement: str) -> None:
+    profile = _profile.get()
+    started = getattr(context, "query_started", None)
+    if profile is None or started is None:
+        return
+    profile.record(statement, time.perf_counter() - started)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    _record_query(context, statement)
+
+
+def _handle_error(exception_context) -> None:
+    _record_query(exception_context.execution_context, exception_context.statement)
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+    return engine
+
+
+@dataclass
+class RouteStats:
+    buckets: list[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+    count: int = 0
+    seconds: float = 0.0
+    queries: int = 0
+    db_seconds: float = 0.0
+    slow_queries: int = 0
+    n_plus_one: int = 0
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.routes: dict[tuple[str, str], RouteStats] = {}
+        self._lock = threading.Lock()
+
+    def observe(
+        self, method: str, route: str, elapsed: float, profile: RequestProfile, n_plus_one: int
+    ) -> None:
+        with self._lock:
+            stats = self.routes.setdefault((method, route), RouteStats())
+            stats.count += 1
+            stats.seconds += elapsed
+            stats.queries += profile.queries
+            stats.db_seconds += profile.db_seconds
+            stats.slow_queries += profile.slow_queries
+            stats.n_plus_one += n_plus_one
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if elapsed <= bound:
+                    stats.buckets[index] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.routes.clear()
+
+    def render(self) -> str:
+        with self._lock:
+            routes = sorted(self.routes.items())
+            histogram = []
+            counters: dict[str, list[str]] = {
+                "db_queries_total": [],
+                "db_duration_seconds_total": [],
+                "slow_queries_total": [],
+                "n_plus_one_total": [],
+            }
+            for (method, route), stats in routes:
+                labels = f'method="{method}",route="{_escape(route)}"'
+                for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                    histogram.append(
+                        f"stockcheck_request_duration_seconds_bucket"
+                        f'{{{labels},le="{bound}"}} {count}'
+                    )
+                histogram.extend(
+                    [
+                        f'stockcheck_request_duration_seconds_bucket{{{labels},le="+Inf"}} '
+                        f"{stats.count}",
+                        f"stockcheck_request_duration_seconds_sum{{{labels}}} {stats.seconds:.6f}",
+                        f"stockcheck_request_duration_seconds_count{{{labels}}} {stats.count}",
+                    ]
+                )
+                counters["db_queries_total"].append(f"{{{labels}}} {stats.queries}")
+                counters["db_duration_seconds_total"].append(
+                    f"{{{labels}}} {stats.db_seconds:.6f}"
+                )
+                counters["slow_queries_total"].append(f"{{{labels}}} {stats.slow_queries}")
+                counters["n_plus_one_total"].append(f"{{{labels}}} {stats.n_plus_one}")
+
+        lines = [
+            "# HELP stockcheck_request_duration_seconds Request latency by route.",
+            "# TYPE stockcheck_request_duration_seconds histogram",
+            *histogram,
+        ]
+        descriptions = {
+            "db_queries_total": "SQL statements executed by route.",
+            "db_duration_seconds_total": "Time spent in SQL statements by route.",
+            "slow_queries_total": "SQL statements slower than SLOW_QUERY_MS by route.",
+            "n_plus_one_total": "Requests repeating one statement N_PLUS_ONE_THRESHOLD times.",
+        }
+        for name, samples in counters.items():
+            lines.append(f"# HELP stockcheck_{name} {descriptions[name]}")
+            lines.append(f"# TYPE stockcheck_{name} counter")
+            lines.extend(f"stockcheck_{name}{sample}" for sample in samples)
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def route_name(scope: Scope) -> str:
+    route = scope.get("fastapi", {}).get("effective_route_context") or scope.get("route")
+    return getattr(route, "path_format", None) or "unmatched"
+
+
+request_metrics = RequestMetrics()
+
+
+class RequestMetricsMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        metrics: RequestMetrics = request_metrics,
+        slow_query_ms: float = 200,
+        n_plus_one_threshold: int = 10,
+    ) -> None:
+        self.app = app
+        self.metrics = metrics
+        self.slow_query_seconds = slow_query_ms / 1000
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(self.slow_query_seconds)
+        token = _profile.set(profile)
+        started = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                timing = profile.server_timing(time.perf_counter() - started)
+                MutableHeaders(scope=message).append("Server-Timing", timing)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _profile.reset(token)
+            route = route_name(scope)
+            repeated = profile.repeated(self.n_plus_one_threshold)
+            for statement, count in repeated:
+                logger.warning(
+                    "Possible N+1 in %s %s: %d executions of %s",
+                    scope["method"],
+                    route,
+                    count,
+                    statement,
+                )
+            self.metrics.observe(
+                scope["method"], route, time.perf_counter() - started, profile, int(bool(repeated))
+            )
@@ -0,0 +1,147 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, bindparam, literal, or_, tuple_
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.elements import ClauseElement, ColumnElement
+
+
+SortKey = Sequence[tuple[ColumnElement, bool]]
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(scope: str, values: Sequence[Any]) -> str:
+    payload = {"s": scope, "v": [_encode_value(value) for value in values]}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, scope: str, size: int) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = [_decode_value(value) for value in payload["v"]]
+        valid = payload["s"] == scope and len(values) == size
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        valid = False
+    if not valid:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
+
+
+def order_by_keys(keys: SortKey) -> list[ColumnElement]:
+    return [column.desc() if descending else column.asc() for column, descending in keys]
+
+
+def keyset_condition(keys: SortKey, values: Sequence[Any]) -> ColumnElement:
+    values = [
+        value if isinstance(value, ClauseElement) else literal(value, column.type)
+        for (column, _), value in zip(keys, values)
+    ]
+    directions = {descending for _, descending in keys}
+    if len(directions) == 1:
+        columns = tuple_(*[column for column, _ in keys])
+        if directions.pop():
+            return columns < tuple_(*values)
+        return columns > tuple_(*values)
+
+    clauses = []
+    for index, (column, descending) in enumerate(keys):
+        equal = [keys[prior][0] == values[prior] for prior in range(index)]
+        after = column < values[index] if descending else column > values[index]
+        clauses.append(and_(*equal, after))
+    return or_(*clauses)
+
+
+def row_dicts(rows: Sequence) -> list[dict]:
+    if not rows:
+        return []
+    fields = rows[0]._fields
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def _finish_page(rows: list, scope: str, limit: int, key_of: Callable[[Any], Sequence[Any]]):
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(scope, key_of(rows[-1]))
+
+
+def paginate(
+    query,
+    keys: SortKey,
+    scope: str,
+    cursor: str | None,
+    skip: int,
+    limit: int,
+    key_of: Callable[[Any], Sequence[Any]],
+) -> tuple[list, str | None]:
+    query = query.order_by(*order_by_keys(keys))
+    if cursor:
+        values = decode_cursor(cursor, scope, len(keys))
+        query = query.filter(keyset_condition(keys, values))
+    else:
+        query = query.offset(skip)
+
+    return _finish_page(query.limit(limit + 1).all(), scope, limit, key_of)
+
+
+def page_statement(statement: Select, keys: SortKey, with_cursor: bool) -> Select:
+    statement = statement.order_by(*order_by_keys(keys))
+    if with_cursor:
+        values = [
+            bindparam(f"cursor_{index}", type_=column.type)
+            for index, (column, _) in enumerate(keys)
+        ]
+        statement = statement.where(keyset_condition(keys, values))
+    else:
+        statement = statement.offset(bindparam("skip"))
+    return statement.limit(bindparam("limit"))
+
+
+def page_params(keys: SortKey, scope: str, cursor: str | None, skip: int, limit: int) -> dict:
+    params = {"limit": limit + 1}
+    if cursor:
+        values = decode_cursor(cursor, scope, len(keys))
+        params.update({f"cursor_{index}": value for index, value in enumerate(values)})
+    else:
+        params["skip"] = skip
+    return params
+
+
+def paginate_statement(
+    db,
+    statement: Select,
+    params: dict,
+    scope: str,
+    limit: int,
+    key_of: Callable[[Any], Sequence[Any]],
+) -> tuple[list, str | None]:
+    return _finish_page(db.execute(statement, params).all(), scope, limit, key_of)
+
+
+async def paginate_statement_async(
+    db,
+    statement: Select,
+    params: dict,
+    scope: str,
+    limit: int,
+    key_of: Callable[[Any], Sequence[Any]],
+) -> tuple[list, str | None]:
+    result = await db.execute(statement, params)
+    return _finish_page(result.all(), scope, limit, key_of)
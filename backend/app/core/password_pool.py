@@ -0,0 +1,114 @@
+import asyncio
+import multiprocessing
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.security import hash_password, verify_password
+
+
+class PasswordPoolBusy(Exception):
+    pass
+
+
+class PasswordPoolUnavailable(Exception):
+    pass
+
+
+class PasswordPool:
+    def __init__(self, workers: int = 2, queue_limit: int = 32):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.pending = 0
+        self.rejected = 0
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _submit(self, function: Callable, *args):
+        for _ in range(2):
+            executor = self.executor
+            try:
+                return await asyncio.wrap_future(executor.submit(function, *args))
+            except BrokenProcessPool:
+                self._discard(executor)
+        raise PasswordPoolUnavailable()
+
+    def _reserve(self) -> None:
+        with self._lock:
+            if self.pending >= max(self.workers, 1) + self.queue_limit:
+                self.rejected += 1
+                raise PasswordPoolBusy()
+            self.pending += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    async def _run(self, function: Callable, *args):
+        self._reserve()
+        try:
+            if self.workers <= 0:
+                return await run_in_threadpool(function, *args)
+            return await self._submit(function, *args)
+        finally:
+            self._release()
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, password, hashed_password)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password, settings.password_hash_iterations)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_limit": self.queue_limit,
+                "pending": self.pending,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool: PasswordPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_password_pool() -> PasswordPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = PasswordPool(settings.password_hash_workers, settings.password_hash_queue)
+        return _pool
+
+
+def stop_password_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
@@ -2,19 +2,40 @@ import hashlib
 import hmac
 import secrets
 
+from app.core.config import settings
 
-def hash_password(password: str) -> str:
+
+LEGACY_ITERATIONS = 100_000
+
+
+def hash_password(password: str, iterations: int | None = None) -> str:
+    iterations = iterations or settings.password_hash_iterations
     salt = secrets.token_bytes(16)
-    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 100_000)
-    return f"{salt.hex()}:{digest.hex()}"
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
+    return f"{iterations}:{salt.hex()}:{digest.hex()}"
 
 
-def verify_password(password: str, hashed_password: str) -> bool:
+def _parse_hash(hashed_password: str) -> tuple[int, bytes, bytes] | None:
+    parts = hashed_password.split(":")
+    if len(parts) == 2:
+        parts.insert(0, str(LEGACY_ITERATIONS))
+    if len(parts) != 3 or not parts[0].isdigit():
+        return None
     try:
-        salt_hex, digest_hex = hashed_password.split(":", 1)
+        return int(parts[0]), bytes.fromhex(parts[1]), bytes.fromhex(parts[2])
     except ValueError:
+        return None
+
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    parsed = _parse_hash(hashed_password)
+    if parsed is None:
         return False
-    salt = bytes.fromhex(salt_hex)
-    expected = bytes.fromhex(digest_hex)
-    calculated = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 100_000)
+    iterations, salt, expected = parsed
+    calculated = hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations)
     return hmac.compare_digest(calculated, expected)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    parsed = _parse_hash(hashed_password)
+    return parsed is not None and parsed[0] != settings.password_hash_iterations
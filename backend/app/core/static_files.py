@@ -0,0 +1,113 @@
+import hashlib
+import mimetypes
+import re
+from dataclasses import dataclass, field
+from email.utils import formatdate
+from pathlib import Path
+
+from fastapi import Request, Response
+from fastapi.responses import FileResponse
+
+from app.core.compression import accepted_encodings
+from app.core.etag import etag_matches
+
+
+HASHED_ASSET_DIR = "assets/"
+HASHED_ASSET = re.compile(r"-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+MEMORY_LIMIT = 256 * 1024
+
+
+@dataclass
+class StaticVariant:
+    path: Path
+    size: int
+    etag: str
+    body: bytes | None = None
+
+
+@dataclass
+class StaticAsset:
+    media_type: str
+    cache_control: str
+    last_modified: str
+    variants: dict[str, StaticVariant] = field(default_factory=dict)
+
+
+def is_hashed_asset(name: str) -> bool:
+    return name.startswith(HASHED_ASSET_DIR) and HASHED_ASSET.search(name) is not None
+
+
+def _variant(path: Path, suffix: str, memory_limit: int) -> StaticVariant:
+    stat = path.stat()
+    if stat.st_size <= memory_limit:
+        body = path.read_bytes()
+        digest = hashlib.blake2b(body, digest_size=12).hexdigest()
+    else:
+        body = None
+        digest = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+    return StaticVariant(path, stat.st_size, f'"{digest}{suffix}"', body)
+
+
+class StaticSite:
+    def __init__(self, directory: Path, memory_limit: int = MEMORY_LIMIT):
+        self.directory = directory
+        self.memory_limit = memory_limit
+        self.assets: dict[str, StaticAsset] = {}
+        if directory.is_dir():
+            self.scan()
+
+    @property
+    def index(self) -> StaticAsset | None:
+        return self.assets.get("index.html")
+
+    def scan(self) -> None:
+        assets = {}
+        for path in sorted(self.directory.rglob("*")):
+            if not path.is_file() or path.suffix in {".br", ".gz"}:
+                continue
+            name = path.relative_to(self.directory).as_posix()
+            media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            if media_type.startswith("text/") or media_type == "application/javascript":
+                media_type = f"{media_type}; charset=utf-8"
+            asset = StaticAsset(
+                media_type=media_type,
+                cache_control=IMMUTABLE if is_hashed_asset(name) else REVALIDATE,
+                last_modified=formatdate(path.stat().st_mtime, usegmt=True),
+            )
+            asset.variants["identity"] = _variant(path, "", self.memory_limit)
+            for encoding, suffix in PRECOMPRESSED:
+                compressed = path.with_name(path.name + suffix)
+                if compressed.is_file():
+                    asset.variants[encoding] = _variant(
+                        compressed, f"-{encoding}", self.memory_limit
+                    )
+            assets[name] = asset
+        self.assets = assets
+
+    def lookup(self, full_path: str) -> StaticAsset | None:
+        return self.assets.get(full_path) or self.index
+
+    def response(self, asset: StaticAsset, request: Request) -> Response:
+        encodings = accepted_encodings(request.headers.get("accept-encoding", ""))
+        encoding = next(
+            (name for name, _ in PRECOMPRESSED if name in asset.variants and name in encodings),
+            "identity",
+        )
+        variant = asset.variants[encoding]
+        headers = {
+            "ETag": variant.etag,
+            "Cache-Control": asset.cache_control,
+            "Last-Modified": asset.last_modified,
+        }
+        if len(asset.variants) > 1:
+            headers["Vary"] = "Accept-Encoding"
+        if etag_matches(request.headers.get("if-none-match"), variant.etag):
+            return Response(status_code=304, headers=headers)
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        if variant.body is not None:
+            return Response(variant.body, headers=headers, media_type=asset.media_type)
+        return FileResponse(variant.path, headers=headers, media_type=asset.media_type)
@@ -0,0 +1,24 @@
+import io
+import tempfile
+
+from fastapi import Request
+
+
+UPLOAD_SPOOL_BYTES = 8 * 1024 * 1024
+
+
+async def spool_request_body(request: Request) -> tempfile.SpooledTemporaryFile:
+    spool = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES)
+    async for chunk in request.stream():
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
+def open_text(spool: tempfile.SpooledTemporaryFile) -> io.TextIOWrapper:
+    return io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+
+
+def is_ndjson(content_type: str | None) -> bool:
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    return media_type in {"application/x-ndjson", "application/ndjson", "application/jsonl"}
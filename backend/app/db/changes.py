@@ -0,0 +1,205 @@
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+
+from sqlalchemy import bindparam, event, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.models.data_version import DataVersion
+from app.models.product import Product
+from app.models.settings import Settings
+from app.models.stock_movement import StockMovement
+
+
+logger = logging.getLogger(__name__)
+
+ChangeListener = Callable[[Engine, frozenset[int] | None], None]
+
+ALL_PRODUCTS = "all"
+STOCK_VERSION = "stock"
+SETTINGS_VERSION = "settings"
+BUMP_ATTEMPTS = 3
+BUMP_RETRY_SECONDS = 0.05
+
+data_versions = DataVersion.__table__
+CURRENT_VERSION = select(data_versions.c.version).where(
+    data_versions.c.scope == bindparam("version_scope")
+)
+BUMP_VERSION = (
+    update(data_versions)
+    .where(data_versions.c.scope == bindparam("version_scope"))
+    .values(version=data_versions.c.version + 1)
+)
+UPSERT_VERSION = (
+    postgresql_insert(data_versions)
+    .values(scope=bindparam("version_scope"), version=1)
+    .on_conflict_do_update(
+        index_elements=[data_versions.c.scope], set_={"version": data_versions.c.version + 1}
+    )
+)
+
+_listeners: list[ChangeListener] = []
+_listeners_lock = threading.Lock()
+_version_epochs: dict[str, int] = {}
+_unbumped_scopes: set[str] = set()
+_versions_lock = threading.Lock()
+
+
+def subscribe(listener: ChangeListener) -> None:
+    with _listeners_lock:
+        if listener not in _listeners:
+            _listeners.append(listener)
+
+
+def unsubscribe(listener: ChangeListener) -> None:
+    with _listeners_lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+
+class ChangeFollower(ABC):
+    def __init__(self, session_factory: sessionmaker):
+        self.session_factory = session_factory
+        self.engine: Engine = session_factory.kw["bind"]
+        self.binds: set[Engine] = {self.engine}
+        self.loaded = False
+        self._lock = threading.RLock()
+
+    @abstractmethod
+    def load(self) -> None: ...
+
+    @abstractmethod
+    def refresh(self, product_ids: Iterable[int], bind: Engine | None = None) -> None: ...
+
+    def watch(self, bind: Engine) -> None:
+        self.binds.add(bind)
+
+    def on_commit(self, bind: Engine, product_ids: frozenset[int] | None) -> None:
+        if bind not in self.binds or not self.loaded:
+            return
+        try:
+            if product_ids is None:
+                self.load()
+            else:
+                self.refresh(product_ids, bind)
+        except Exception:
+            logger.exception("%s refresh failed; falling back to SQL", type(self).__name__)
+            self.loaded = False
+
+
+def mark_changed(db: Session, product_ids: Iterable[int] | None) -> None:
+    if product_ids is None:
+        db.info["changed_products"] = ALL_PRODUCTS
+        return
+    changed = db.info.setdefault("changed_products", set())
+    if changed is not ALL_PRODUCTS:
+        changed.update(product_ids)
+
+
+def current_version(db: Session, scope: str) -> int:
+    return db.execute(CURRENT_VERSION, {"version_scope": scope}).scalar_one_or_none() or 0
+
+
+def version_tag(db: Session, scope: str) -> str:
+    version = current_version(db, scope)
+    with _versions_lock:
+        epoch = _version_epochs.get(scope, 0)
+    return f"{scope}-{version}.{epoch}" if epoch else f"{scope}-{version}"
+
+
+def bump_version(db: Session | Connection, scope: str) -> None:
+    if db.execute(BUMP_VERSION, {"version_scope": scope}).rowcount == 0:
+        db.execute(insert(data_versions).values(scope=scope, version=1))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_changes(session: Session, flush_context) -> None:
+    product_ids = set()
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(instance, Product) and instance.id is not None:
+            product_ids.add(instance.id)
+        elif isinstance(instance, StockMovement) and instance.product_id is not None:
+            product_ids.add(instance.product_id)
+        elif isinstance(instance, Settings):
+            session.info["settings_changed"] = True
+    if product_ids:
+        mark_changed(session, product_ids)
+
+
+def changed_scopes(session: Session) -> list[str]:
+    scopes = []
+    if session.info.get("changed_products"):
+        scopes.append(STOCK_VERSION)
+    if session.info.get("settings_changed"):
+        scopes.append(SETTINGS_VERSION)
+    return scopes
+
+
+def bumps_after_commit(bind: Engine) -> bool:
+    return bind.dialect.name == "postgresql"
+
+
+def _upsert_version(connection: Connection, scope: str) -> None:
+    connection.execute(UPSERT_VERSION, {"version_scope": scope})
+
+
+def _bump_committed_versions(bind: Engine, scopes: list[str]) -> None:
+    with _versions_lock:
+        pending = [*scopes, *(_unbumped_scopes - set(scopes))]
+    for attempt in range(1, BUMP_ATTEMPTS + 1):
+        try:
+            with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                while pending:
+                    _upsert_version(connection, pending[0])
+                    with _versions_lock:
+                        _unbumped_scopes.discard(pending.pop(0))
+            return
+        except Exception:
+            if attempt == BUMP_ATTEMPTS:
+                logger.exception("Bumping data versions %s failed", pending)
+            else:
+                time.sleep(BUMP_RETRY_SECONDS * attempt)
+    with _versions_lock:
+        for scope in pending:
+            _version_epochs[scope] = _version_epochs.get(scope, 0) + 1
+            _unbumped_scopes.add(scope)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_data_versions(session: Session) -> None:
+    session.flush()
+    scopes = changed_scopes(session)
+    if not scopes or bumps_after_commit(session.get_bind()):
+        return
+    for scope in scopes:
+        bump_version(session, scope)
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_changes(session: Session) -> None:
+    scopes = changed_scopes(session)
+    session.info.pop("settings_changed", None)
+    changed = session.info.pop("changed_products", None)
+    if scopes and bumps_after_commit(session.get_bind()):
+        _bump_committed_versions(session.get_bind(), scopes)
+    if not changed:
+        return
+    with _listeners_lock:
+        listeners = list(_listeners)
+    if not listeners:
+        return
+
+    bind = session.get_bind()
+    product_ids = None if changed is ALL_PRODUCTS else frozenset(changed)
+    for listener in listeners:
+        listener(bind, product_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    session.info.pop("changed_products", None)
+    session.info.pop("settings_changed", None)
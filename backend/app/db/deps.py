@@ -1,11 +1,76 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Generator, Iterator
+from typing import Any
 
-from app.db.session import SessionLocal
+from fastapi import Depends, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.util import greenlet_spawn
 
+from app.db import session
+from app.db.routing import reads_primary, track_writer
 
-def get_db() -> Generator:
-    db = SessionLocal()
+
+def get_db(response: Response) -> Generator:
+    db = session.SessionLocal()
+    if session.ReadSessionLocal is not None:
+        track_writer(db, response)
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_db(request: Request, db: Session = Depends(get_db)) -> Generator:
+    if session.ReadSessionLocal is None or reads_primary(request):
+        yield db
+        return
+    replica = session.ReadSessionLocal()
+    try:
+        yield replica
+    finally:
+        replica.close()
+
+
+async def get_async_db(response: Response) -> AsyncGenerator:
+    if session.AsyncSessionLocal is None:
+        raise RuntimeError("Async database mode is disabled; set DATABASE_ASYNC=true")
+    async with session.AsyncSessionLocal() as db:
+        if session.AsyncReadSessionLocal is not None:
+            track_writer(db.sync_session, response)
+        yield db
+
+
+async def get_async_read_db(
+    request: Request, db: AsyncSession = Depends(get_async_db)
+) -> AsyncGenerator:
+    if session.AsyncReadSessionLocal is None or reads_primary(request):
+        yield db
+        return
+    async with session.AsyncReadSessionLocal() as replica:
+        yield replica
+
+
+async def run_in_session(db: Session | AsyncSession, fn: Callable[..., Any], *args) -> Any:
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args)
+    return await run_in_threadpool(fn, db, *args)
+
+
+async def close_session(db: Session | AsyncSession) -> None:
+    if isinstance(db, AsyncSession):
+        await db.close()
+    else:
+        await run_in_threadpool(db.close)
+
+
+async def _iterate_in_greenlet(iterator: Iterator) -> AsyncIterator:
+    done = object()
+    while (item := await greenlet_spawn(next, iterator, done)) is not done:
+        yield item
+
+
+def session_iterator(db: Session, iterator: Iterator) -> Iterator | AsyncIterator:
+    if db.info.get("async"):
+        return _iterate_in_greenlet(iterator)
+    return iterator
@@ -0,0 +1,43 @@
+import math
+import time
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+
+RECENT_WRITE_COOKIE = "recent_write"
+
+
+def track_writer(db: Session, response: Response) -> None:
+    db.info["writer_response"] = response
+
+
+def record_write(response: Response) -> None:
+    window = settings.database_read_your_writes_seconds
+    if window <= 0:
+        return
+    response.set_cookie(
+        RECENT_WRITE_COOKIE,
+        f"{time.time() + window:.3f}",
+        max_age=math.ceil(window),
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def reads_primary(request: Request) -> bool:
+    try:
+        expires_at = float(request.cookies.get(RECENT_WRITE_COOKIE, ""))
+    except ValueError:
+        return False
+    return expires_at > time.time()
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_writer(session: Session) -> None:
+    response = session.info.get("writer_response")
+    if response is not None:
+        record_write(response)
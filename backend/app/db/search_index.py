@@ -0,0 +1,48 @@
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+
+SQLITE_FTS_TABLE = "products_fts"
+
+SQLITE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5("
+    "name, content='products', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN "
+    "INSERT INTO products_fts(rowid, name) VALUES (new.id, new.name); END",
+    "CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN "
+    "INSERT INTO products_fts(products_fts, rowid, name) VALUES ('delete', old.id, old.name); END",
+    "CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE OF name ON products BEGIN "
+    "INSERT INTO products_fts(products_fts, rowid, name) VALUES ('delete', old.id, old.name); "
+    "INSERT INTO products_fts(rowid, name) VALUES (new.id, new.name); END",
+    "INSERT INTO products_fts(products_fts) VALUES ('rebuild')",
+)
+
+POSTGRES_TRGM_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_products_name_trgm ON products USING gin (name gin_trgm_ops)",
+)
+
+
+def install_search_index(connection: Connection) -> bool:
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        statements = SQLITE_FTS_DDL
+    elif dialect == "postgresql":
+        statements = POSTGRES_TRGM_DDL
+    else:
+        return False
+
+    try:
+        with connection.begin_nested():
+            for statement in statements:
+                connection.exec_driver_sql(statement)
+    except DBAPIError:
+        return False
+    return True
+
+
+def drop_search_index(connection: Connection) -> None:
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("DROP TABLE IF EXISTS products_fts")
+    elif connection.dialect.name == "postgresql":
+        connection.exec_driver_sql("DROP INDEX IF EXISTS ix_products_name_trgm")
@@ -1,10 +1,145 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from app.core.config import settings
+from app.core.metrics import instrument_engine
 
 
-connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
-engine = create_engine(settings.database_url, connect_args=connect_args)
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+psycopg",
+    "postgresql+psycopg2": "postgresql+psycopg",
+}
 
+
+def async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+def is_memory_sqlite(url: str | URL) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def engine_options(url: str) -> dict:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    options: dict = {"pool_pre_ping": settings.database_pool_pre_ping}
+    connect_args: dict = {}
+    if backend == "sqlite":
+        if parsed.get_driver_name() == "pysqlite":
+            connect_args["check_same_thread"] = False
+    elif backend == "postgresql" and settings.database_statement_timeout_ms:
+        timeout = str(settings.database_statement_timeout_ms)
+        if parsed.get_driver_name() == "asyncpg":
+            connect_args["server_settings"] = {"statement_timeout": timeout}
+        else:
+            connect_args["options"] = f"-c statement_timeout={timeout}"
+    if connect_args:
+        options["connect_args"] = connect_args
+    if not is_memory_sqlite(url):
+        options.update(
+            pool_size=settings.database_pool_size,
+            max_overflow=settings.database_max_overflow,
+            pool_timeout=settings.database_pool_timeout,
+            pool_recycle=settings.database_pool_recycle,
+        )
+    return options
+
+
+def sqlite_pragmas(url: str | URL) -> list[tuple[str, str | int]]:
+    pragmas: list[tuple[str, str | int]] = [
+        ("busy_timeout", settings.sqlite_busy_timeout_ms),
+        ("synchronous", settings.sqlite_synchronous),
+        ("cache_size", settings.sqlite_cache_size),
+        ("mmap_size", settings.sqlite_mmap_size),
+    ]
+    if not is_memory_sqlite(url):
+        pragmas.insert(0, ("journal_mode", settings.sqlite_journal_mode))
+    return pragmas
+
+
+def configure_engine(engine: Engine) -> Engine:
+    if settings.request_metrics_enabled:
+        instrument_engine(engine)
+    if engine.dialect.name != "sqlite":
+        return engine
+    pragmas = sqlite_pragmas(engine.url)
+
+    @event.listens_for(engine, "connect")
+    def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return engine
+
+
+def pool_stats(engine: Engine) -> dict:
+    pool = engine.pool
+    stats = {"dialect": engine.dialect.name, "pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            timeout=pool.timeout(),
+        )
+    return stats
+
+
+def database_stats() -> dict:
+    engines = {
+        "sync": engine,
+        "read": read_engine,
+        "async": async_engine and async_engine.sync_engine,
+        "async_read": async_read_engine and async_read_engine.sync_engine,
+    }
+    return {name: pool_stats(bound) for name, bound in engines.items() if bound is not None}
+
+
+def build_engine(url: str) -> Engine:
+    return configure_engine(create_engine(url, **engine_options(url)))
+
+
+engine = build_engine(settings.database_url)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+read_engine = None
+ReadSessionLocal = None
+if settings.database_read_url:
+    read_engine = build_engine(settings.database_read_url)
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+async_engine = None
+AsyncSessionLocal = None
+async_read_engine = None
+AsyncReadSessionLocal = None
+if settings.database_async:
+    from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+    def build_async_engine(url: str) -> AsyncEngine:
+        created = create_async_engine(url, **engine_options(url))
+        configure_engine(created.sync_engine)
+        return created
+
+    async_engine = build_async_engine(
+        settings.database_async_url or async_database_url(settings.database_url)
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autocommit=False, autoflush=False, info={"async": True}
+    )
+    if settings.database_read_url:
+        async_read_engine = build_async_engine(async_database_url(settings.database_read_url))
+        AsyncReadSessionLocal = async_sessionmaker(
+            async_read_engine, autocommit=False, autoflush=False, info={"async": True}
+        )
@@ -1,19 +1,55 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
 
+from app.api.admin import router as admin_router
+from app.api.async_mode import async_router
 from app.api.auth import router as auth_router
 from app.api.export import router as export_router
+from app.api.imports import router as imports_router
 from app.api.movements import router as movements_router
 from app.api.products import router as products_router
 from app.api.settings import router as settings_router
 from app.api.stock import router as stock_router
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.metrics import RequestMetricsMiddleware
+from app.core.password_pool import stop_password_pool
+from app.core.static_files import StaticSite
+from app.db.session import SessionLocal, async_engine
+from app.services.inventory import start_inventory_index, stop_inventory_index
+from app.services.low_stock import start_low_stock_cache, stop_low_stock_cache
+from app.services.stock_events import start_stock_events, stop_stock_events
 
 
-app = FastAPI(title=settings.app_name)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.inventory_index_enabled:
+        index = start_inventory_index(SessionLocal)
+        if async_engine is not None:
+            index.watch(async_engine.sync_engine)
+    if settings.low_stock_cache_enabled:
+        cache = start_low_stock_cache(SessionLocal)
+        if async_engine is not None:
+            cache.watch(async_engine.sync_engine)
+    if settings.stock_events_enabled:
+        events = start_stock_events(
+            SessionLocal, settings.stock_events_backend, settings.stock_events_buffer
+        )
+        if async_engine is not None:
+            events.watch(async_engine.sync_engine)
+    yield
+    stop_password_pool()
+    stop_stock_events()
+    stop_low_stock_cache()
+    stop_inventory_index()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -22,16 +58,32 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality,
+)
+if settings.request_metrics_enabled:
+    app.add_middleware(
+        RequestMetricsMiddleware,
+        slow_query_ms=settings.slow_query_ms,
+        n_plus_one_threshold=settings.n_plus_one_threshold,
+    )
 
+app.include_router(admin_router, prefix="/api")
 app.include_router(auth_router, prefix="/api")
-app.include_router(export_router, prefix="/api")
-app.include_router(movements_router, prefix="/api")
-app.include_router(products_router, prefix="/api")
-app.include_router(settings_router, prefix="/api")
-app.include_router(stock_router, prefix="/api")
+for router in (
+    export_router,
+    imports_router,
+    movements_router,
+    products_router,
+    settings_router,
+    stock_router,
+):
+    app.include_router(async_router(router) if settings.database_async else router, prefix="/api")
 
-static_dir = Path(__file__).resolve().parent / "static"
-index_file = static_dir / "index.html"
+static_site = StaticSite(Path(__file__).resolve().parent / "static")
 
 
 @app.get("/api/ping")
@@ -40,13 +92,8 @@ def ping() -> dict:
 
 
 @app.get("/{full_path:path}", include_in_schema=False)
-def spa_fallback(full_path: str):
-    if not index_file.exists():
+async def spa_fallback(full_path: str, request: Request):
+    asset = static_site.lookup(full_path)
+    if asset is None:
         raise HTTPException(status_code=404, detail="Frontend build not found")
-
-    if full_path:
-        candidate = static_dir / full_path
-        if candidate.is_file():
-            return FileResponse(candidate)
-
-    return FileResponse(index_file)
+    return static_site.response(asset, request)
@@ -1,6 +1,21 @@
+from app.models.balance_snapshot import BalanceSnapshot
+from app.models.data_version import DataVersion
+from app.models.ledger_archive import LedgerArchive
 from app.models.product import Product
+from app.models.product_balance import ProductBalance
 from app.models.settings import Settings
 from app.models.stock_movement import StockMovement
+from app.models.stock_movement_archive import StockMovementArchive
 from app.models.user import User
 
-__all__ = ["Product", "Settings", "StockMovement", "User"]
+__all__ = [
+    "BalanceSnapshot",
+    "DataVersion",
+    "LedgerArchive",
+    "Product",
+    "ProductBalance",
+    "Settings",
+    "StockMovement",
+    "StockMovementArchive",
+    "User",
+]
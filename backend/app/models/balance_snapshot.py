@@ -0,0 +1,17 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer
+
+from app.db.base import Base
+
+
+class BalanceSnapshot(Base):
+    __tablename__ = "balance_snapshots"
+    __table_args__ = (
+        Index("ix_balance_snapshots_snapshot_at_product_id", "snapshot_at", "product_id", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    snapshot_at = Column(DateTime(timezone=True), nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    in_sum = Column(Integer, default=0, nullable=False)
+    out_sum = Column(Integer, default=0, nullable=False)
+    balance = Column(Integer, default=0, nullable=False)
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, String
+
+from app.db.base import Base
+
+
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+
+    scope = Column(String(32), primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, DateTime, Integer
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class LedgerArchive(Base):
+    __tablename__ = "ledger_archives"
+
+    id = Column(Integer, primary_key=True)
+    cutoff = Column(DateTime(timezone=True), nullable=False, unique=True)
+    movements = Column(Integer, nullable=False)
+    products = Column(Integer, nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,7 +1,8 @@
-from sqlalchemy import Boolean, Column, DateTime, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, event
 from sqlalchemy.sql import func
 
 from app.db.base import Base
+from app.db.search_index import drop_search_index, install_search_index
 
 
 class Product(Base):
@@ -14,3 +15,15 @@ class Product(Base):
     low_stock_enabled = Column(Boolean, default=True, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+event.listen(
+    Product.__table__,
+    "after_create",
+    lambda target, connection, **kw: install_search_index(connection),
+)
+event.listen(
+    Product.__table__,
+    "before_drop",
+    lambda target, connection, **kw: drop_search_index(connection),
+)
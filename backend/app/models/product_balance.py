@@ -0,0 +1,20 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class ProductBalance(Base):
+    __tablename__ = "product_balances"
+
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    in_sum = Column(Integer, default=0, nullable=False)
+    out_sum = Column(Integer, default=0, nullable=False)
+    balance = Column(Integer, default=0, nullable=False, index=True)
+    last_movement_id = Column(Integer, nullable=True)
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
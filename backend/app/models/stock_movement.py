@@ -1,4 +1,6 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.sql import func
 
 from app.db.base import Base
@@ -6,6 +8,16 @@ from app.db.base import Base
 
 class StockMovement(Base):
     __tablename__ = "stock_movements"
+    __table_args__ = (
+        Index(
+            "ix_stock_movements_product_id_movement_type_quantity",
+            "product_id",
+            "movement_type",
+            "quantity",
+        ),
+        Index("ix_stock_movements_product_id_created_at_id", "product_id", "created_at", "id"),
+        Index("ix_stock_movements_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False, index=True)
@@ -13,4 +25,9 @@ class StockMovement(Base):
     quantity = Column(Integer, nullable=False)
     note = Column(String(500), nullable=True)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        nullable=False,
+    )
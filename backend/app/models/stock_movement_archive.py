@@ -0,0 +1,24 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+
+from app.db.base import Base
+
+
+class StockMovementArchive(Base):
+    __tablename__ = "stock_movements_archive"
+    __table_args__ = (
+        Index(
+            "ix_stock_movements_archive_product_id_created_at_id",
+            "product_id",
+            "created_at",
+            "id",
+        ),
+        Index("ix_stock_movements_archive_created_at_id", "created_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    movement_type = Column(String(3), nullable=False)
+    quantity = Column(Integer, nullable=False)
+    note = Column(String(500), nullable=True)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
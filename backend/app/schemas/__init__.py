@@ -1,6 +1,20 @@
 from app.schemas.auth import LoginRequest, TokenResponse, UserMe
-from app.schemas.movement import MovementCreate, MovementList, MovementOut
-from app.schemas.product import ProductCreate, ProductList, ProductOut, ProductUpdate
+from app.schemas.movement import (
+    MovementBulkCreate,
+    MovementBulkError,
+    MovementBulkResult,
+    MovementCreate,
+    MovementList,
+    MovementOut,
+)
+from app.schemas.product import (
+    ProductCreate,
+    ProductImportError,
+    ProductImportResult,
+    ProductList,
+    ProductOut,
+    ProductUpdate,
+)
 from app.schemas.settings import SettingsOut, SettingsUpdate
 from app.schemas.stock import StockOverviewItem, StockOverviewList
 
@@ -8,10 +22,15 @@ __all__ = [
     "LoginRequest",
     "TokenResponse",
     "UserMe",
+    "MovementBulkCreate",
+    "MovementBulkError",
+    "MovementBulkResult",
     "MovementCreate",
     "MovementList",
     "MovementOut",
     "ProductCreate",
+    "ProductImportError",
+    "ProductImportResult",
     "ProductList",
     "ProductOut",
     "ProductUpdate",
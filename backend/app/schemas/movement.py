@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 try:
     from pydantic import BaseModel, ConfigDict, field_validator
@@ -61,6 +61,41 @@ class MovementOut(MovementBase):
 
 class MovementList(BaseModel):
     items: List[MovementOut]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
+
+
+MAX_BULK_ITEMS = 10_000
+
+
+class MovementBulkCreate(BaseModel):
+    items: List[dict]
+    mode: Literal["atomic", "partial"] = "atomic"
+
+    if field_validator:
+        @field_validator("items")
+        @classmethod
+        def validate_item_count(cls, value):
+            if len(value) > MAX_BULK_ITEMS:
+                raise ValueError(f"At most {MAX_BULK_ITEMS} items per request.")
+            return value
+    else:
+        @validator("items")
+        def validate_item_count(cls, value):
+            if len(value) > MAX_BULK_ITEMS:
+                raise ValueError(f"At most {MAX_BULK_ITEMS} items per request.")
+            return value
+
+
+class MovementBulkError(BaseModel):
+    index: int
+    detail: str
+
+
+class MovementBulkResult(BaseModel):
+    created: int
+    failed: int
+    ids: List[int]
+    errors: List[MovementBulkError]
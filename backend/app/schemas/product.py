@@ -88,6 +88,20 @@ class ProductOut(ProductBase):
 
 class ProductList(BaseModel):
     items: List[ProductOut]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
+
+
+class ProductImportError(BaseModel):
+    index: int
+    detail: str
+
+
+class ProductImportResult(BaseModel):
+    rows: int
+    created: int
+    updated: int
+    failed: int
+    errors: List[ProductImportError]
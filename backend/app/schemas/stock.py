@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -18,6 +18,7 @@ class StockOverviewItem(BaseModel):
 
 class StockOverviewList(BaseModel):
     items: List[StockOverviewItem]
-    total: int
+    total: Optional[int] = None
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
@@ -0,0 +1,63 @@
+import argparse
+import sys
+from datetime import datetime, timedelta, timezone
+
+import app.models  # noqa: F401
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.user import User
+from app.services.archive import archive_movements
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Move old stock movements into stock_movements_archive and replace them "
+            "with per-product opening balances."
+        )
+    )
+    cutoff = parser.add_mutually_exclusive_group(required=True)
+    cutoff.add_argument(
+        "--before", type=datetime.fromisoformat, help="Archive movements before this ISO 8601 time."
+    )
+    cutoff.add_argument(
+        "--older-than-days", type=int, help="Archive movements older than this many days."
+    )
+    parser.add_argument(
+        "--user-id",
+        type=int,
+        default=None,
+        help="Author of the opening balance rows. Defaults to the admin user.",
+    )
+    args = parser.parse_args()
+
+    if args.before is not None:
+        before = args.before
+    else:
+        before = datetime.now(timezone.utc) - timedelta(days=args.older_than_days)
+
+    db = SessionLocal()
+    try:
+        user_id = args.user_id
+        if user_id is None:
+            user_id = db.query(User.id).filter(User.email == settings.admin_email).scalar()
+        if user_id is None:
+            print("No admin user found; pass --user-id.", file=sys.stderr)
+            sys.exit(1)
+        archive = archive_movements(db, before, user_id)
+        if archive is None:
+            message = "Ledger is already archived up to that time."
+        else:
+            message = (
+                f"Archived {archive.movements} movement(s) before {archive.cutoff.isoformat()} "
+                f"into opening balances for {archive.products} product(s)."
+            )
+        db.commit()
+    finally:
+        db.close()
+
+    print(message)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import argparse
+import sys
+
+import app.models  # noqa: F401
+from app.db.session import SessionLocal
+from app.services.balance import find_balance_mismatches, rebuild_balances
+
+
+def verify() -> int:
+    db = SessionLocal()
+    try:
+        mismatches = find_balance_mismatches(db)
+    finally:
+        db.close()
+
+    for mismatch in mismatches:
+        print(
+            f"product {mismatch.product_id}: "
+            f"ledger in={mismatch.expected_in} out={mismatch.expected_out} "
+            f"balance={mismatch.expected_balance}, "
+            f"stored in={mismatch.stored_in} out={mismatch.stored_out} "
+            f"balance={mismatch.stored_balance}"
+        )
+    if mismatches:
+        print(f"{len(mismatches)} product balance(s) differ from the ledger.")
+        return 1
+    print("Product balances match the ledger.")
+    return 0
+
+
+def rebuild() -> int:
+    db = SessionLocal()
+    try:
+        count = rebuild_balances(db)
+        db.commit()
+    finally:
+        db.close()
+    print(f"Rebuilt {count} product balance(s) from the ledger.")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check or rebuild the product_balances table.")
+    parser.add_argument("command", choices=["verify", "rebuild"])
+    args = parser.parse_args()
+    commands = {"verify": verify, "rebuild": rebuild}
+    sys.exit(commands[args.command]())
+
+
+if __name__ == "__main__":
+    main()
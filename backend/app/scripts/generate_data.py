@@ -0,0 +1,284 @@
+import argparse
+import csv
+import io
+import itertools
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Table, func, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401
+from app.core.security import hash_password
+from app.db.base import Base
+from app.models.product import Product
+from app.models.stock_movement import StockMovement
+from app.models.user import User
+from app.services.balance import rebuild_balances
+
+
+MOVEMENT_COLUMNS = (
+    "id",
+    "product_id",
+    "movement_type",
+    "quantity",
+    "note",
+    "created_by",
+    "created_at",
+)
+UNITS = ("pcs", "pcs", "pcs", "kg", "l", "box", "pack", "m")
+NAME_WORDS = (
+    "Flour Sugar Salt Rice Pasta Coffee Tea Milk Butter Oil "
+    "Soap Gloves Tape Paper Cable Screws Bolts Filter Battery Paint"
+).split()
+NAME_VARIANTS = ("Premium", "Basic", "Organic", "Large", "Small", "Bulk", "Spare", "Extra")
+IN_QUANTITIES = (5, 10, 12, 20, 24, 25, 40, 48, 50, 100)
+IN_NOTES = ("Delivery", "Supplier restock", "Returned to stock")
+OUT_NOTES = ("Damaged", "Inventory correction", "Internal use")
+NOTE_RATE = 0.15
+DEFAULT_END = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def product_name(rng: random.Random, product_id: int) -> str:
+    return f"{rng.choice(NAME_VARIANTS)} {rng.choice(NAME_WORDS)} {product_id}"
+
+
+def zipf_weights(count: int, exponent: float) -> list[float]:
+    return list(itertools.accumulate(1 / rank**exponent for rank in range(1, count + 1)))
+
+
+def next_id(connection: Connection, column) -> int:
+    return int(connection.execute(select(func.coalesce(func.max(column), 0))).scalar()) + 1
+
+
+def copy_rows(connection: Connection, table: str, columns: tuple[str, ...], rows: list) -> None:
+    driver_connection = connection.connection.driver_connection
+    statement = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    if connection.dialect.driver == "psycopg":
+        with driver_connection.cursor() as cursor, cursor.copy(statement) as copy:
+            for row in rows:
+                copy.write_row(row)
+        return
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    with driver_connection.cursor() as cursor:
+        cursor.copy_expert(f"{statement} WITH (FORMAT csv)", buffer)
+
+
+def uses_copy(connection: Connection) -> bool:
+    return connection.dialect.name == "postgresql" and connection.dialect.driver in {
+        "psycopg",
+        "psycopg2",
+    }
+
+
+def insert_rows(connection: Connection, table: Table, columns: tuple[str, ...], rows: list) -> None:
+    if uses_copy(connection):
+        copy_rows(connection, table.name, columns, rows)
+        return
+    dialect = connection.dialect
+    compiled = insert(table).compile(dialect=dialect, column_keys=list(columns))
+    processors = [
+        (position, processor)
+        for position, name in enumerate(columns)
+        if (processor := table.c[name].type.bind_processor(dialect)) is not None
+    ]
+    if processors:
+        rows = [list(row) for row in rows]
+        for row in rows:
+            for position, processor in processors:
+                if row[position] is not None:
+                    row[position] = processor(row[position])
+    if compiled.positional:
+        order = [columns.index(name) for name in compiled.positiontup]
+        parameters = [tuple(row[position] for position in order) for row in rows]
+    else:
+        parameters = [dict(zip(columns, row)) for row in rows]
+    connection.exec_driver_sql(compiled.string, parameters)
+
+
+@contextmanager
+def deferred_indexes(connection: Connection, table: Table, enabled: bool):
+    indexes = list(table.indexes) if enabled else []
+    for index in indexes:
+        index.drop(connection)
+    yield
+    for index in indexes:
+        index.create(connection)
+
+
+def reset_sequences(connection: Connection) -> None:
+    if connection.dialect.name != "postgresql":
+        return
+    for table in (User.__tablename__, Product.__tablename__, StockMovement.__tablename__):
+        connection.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f"(SELECT coalesce(max(id), 1) FROM {table}))"
+            )
+        )
+
+
+def generate(
+    engine: Engine,
+    products: int,
+    movements: int,
+    seed: int = 42,
+    users: int = 5,
+    years: float = 3,
+    zipf: float = 1.1,
+    in_ratio: float = 0.2,
+    batch_size: int = 50_000,
+    end: datetime = DEFAULT_END,
+    progress=None,
+) -> dict:
+    rng = random.Random(seed)
+    Base.metadata.create_all(engine)
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    span = timedelta(days=365 * years).total_seconds()
+    start = end - timedelta(seconds=span)
+
+    with engine.begin() as connection:
+        first_user = next_id(connection, User.id)
+        first_product = next_id(connection, Product.id)
+        first_movement = next_id(connection, StockMovement.id)
+
+        hashed = hash_password("change-me")
+        user_ids = list(range(first_user, first_user + users))
+        connection.execute(
+            insert(User),
+            [
+                {"id": user_id, "email": f"user{user_id}@example.com", "hashed_password": hashed}
+                for user_id in user_ids
+            ],
+        )
+
+        product_ids = list(range(first_product, first_product + products))
+        for offset in range(0, products, batch_size):
+            connection.execute(
+                insert(Product),
+                [
+                    {
+                        "id": product_id,
+                        "name": product_name(rng, product_id),
+                        "unit": rng.choice(UNITS),
+                        "min_stock": rng.choice((0, 5, 10, 20, 50)),
+                        "low_stock_enabled": rng.random() < 0.9,
+                        "is_active": rng.random() < 0.97,
+                    }
+                    for product_id in product_ids[offset : offset + batch_size]
+                ],
+            )
+
+        popularity = product_ids[:]
+        rng.shuffle(popularity)
+        weights = zipf_weights(products, zipf)
+        slot = span / max(movements, 1)
+        empty_ledger = first_movement == 1
+        stocked: set[int] = set()
+        with deferred_indexes(connection, StockMovement.__table__, empty_ledger):
+            for offset in range(0, movements, batch_size):
+                count = min(batch_size, movements - offset)
+                chosen = rng.choices(popularity, cum_weights=weights, k=count)
+                rows = []
+                for index, product_id in enumerate(chosen, start=offset):
+                    if product_id not in stocked or rng.random() < in_ratio:
+                        stocked.add(product_id)
+                        movement_type = "IN"
+                        quantity = rng.choice(IN_QUANTITIES)
+                        note = rng.choice(IN_NOTES) if rng.random() < NOTE_RATE * 3 else None
+                    else:
+                        movement_type = "OUT"
+                        quantity = int(rng.expovariate(1 / 3)) + 1
+                        note = rng.choice(OUT_NOTES) if rng.random() < NOTE_RATE else None
+                    rows.append(
+                        (
+                            first_movement + index,
+                            product_id,
+                            movement_type,
+                            quantity,
+                            note,
+                            rng.choice(user_ids),
+                            start + timedelta(seconds=(index + rng.random()) * slot),
+                        )
+                    )
+                insert_rows(connection, StockMovement.__table__, MOVEMENT_COLUMNS, rows)
+                if progress is not None:
+                    progress(offset + count)
+        reset_sequences(connection)
+
+    with Session(engine) as db:
+        rebuild_balances(db)
+        db.commit()
+
+    return {
+        "users": users,
+        "products": products,
+        "movements": movements,
+        "start": start,
+        "end": end,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic product and movement ledger for benchmarking."
+    )
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--movements", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--years", type=float, default=3, help="time span of the ledger")
+    parser.add_argument("--zipf", type=float, default=1.1, help="product popularity exponent")
+    parser.add_argument("--in-ratio", type=float, default=0.2, help="share of IN movements")
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--end",
+        type=datetime.fromisoformat,
+        default=DEFAULT_END,
+        help=f"time of the newest movement (ISO 8601, default {DEFAULT_END.isoformat()})",
+    )
+    parser.add_argument(
+        "--database-url", help="target database (defaults to DATABASE_URL from settings)"
+    )
+    args = parser.parse_args()
+
+    if args.database_url:
+        from app.db.session import build_engine
+
+        engine = build_engine(args.database_url)
+    else:
+        from app.db.session import engine
+
+    started = time.perf_counter()
+
+    def progress(done: int) -> None:
+        elapsed = time.perf_counter() - started
+        print(f"{done:,} / {args.movements:,} movements ({done / elapsed:,.0f}/s)", flush=True)
+
+    generate(
+        engine,
+        args.products,
+        args.movements,
+        seed=args.seed,
+        users=args.users,
+        years=args.years,
+        zipf=args.zipf,
+        in_ratio=args.in_ratio,
+        batch_size=args.batch_size,
+        end=args.end,
+        progress=progress,
+    )
+    print(
+        f"Generated {args.products:,} products and {args.movements:,} movements "
+        f"in {time.perf_counter() - started:.1f}s."
+    )
+
+
+if __name__ == "__main__":
+    main()
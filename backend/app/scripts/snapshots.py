@@ -0,0 +1,38 @@
+import argparse
+from datetime import datetime
+
+import app.models  # noqa: F401
+from app.db.session import SessionLocal
+from app.services.balance import take_due_snapshot, take_snapshot
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Checkpoint per-product balances into balance_snapshots."
+    )
+    parser.add_argument(
+        "--at",
+        type=datetime.fromisoformat,
+        default=None,
+        help="Snapshot time (ISO 8601). Defaults to the last completed interval boundary.",
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.at is not None:
+            taken_at = args.at if take_snapshot(db, args.at) else None
+        else:
+            taken_at = take_due_snapshot(db)
+        db.commit()
+    finally:
+        db.close()
+
+    if taken_at:
+        print(f"Balance snapshot taken at {taken_at.isoformat()}.")
+    else:
+        print("Balance snapshot is up to date.")
+
+
+if __name__ == "__main__":
+    main()
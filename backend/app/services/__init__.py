@@ -1,3 +1,13 @@
-from app.services.balance import get_product_balance
+from app.services.balance import (
+    apply_movement,
+    find_balance_mismatches,
+    get_product_balance,
+    rebuild_balances,
+)
 
-__all__ = ["get_product_balance"]
+__all__ = [
+    "apply_movement",
+    "find_balance_mismatches",
+    "get_product_balance",
+    "rebuild_balances",
+]
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, delete, func, insert, select, union_all
+from sqlalchemy.orm import Session
+
+from app.db.changes import mark_changed
+from app.models.ledger_archive import LedgerArchive
+from app.models.stock_movement import StockMovement
+from app.models.stock_movement_archive import StockMovementArchive
+from app.services.balance import IN_QUANTITY, OUT_QUANTITY, archive_cutoff, to_utc
+
+
+LEDGER_COLUMNS = (
+    "id",
+    "product_id",
+    "movement_type",
+    "quantity",
+    "note",
+    "created_by",
+    "created_at",
+)
+OPENING_BALANCE_NOTE = "Opening balance"
+
+live_movements = StockMovement.__table__
+archived_movements = StockMovementArchive.__table__
+
+
+def archive_movements(db: Session, cutoff: datetime, created_by: int) -> LedgerArchive | None:
+    cutoff = to_utc(cutoff)
+    previous = archive_cutoff(db)
+    if previous is not None and cutoff <= previous:
+        return None
+
+    before_cutoff = live_movements.c.created_at < cutoff
+    archived = before_cutoff
+    if previous is not None:
+        archived = and_(before_cutoff, live_movements.c.created_at >= previous)
+    moved = db.execute(
+        insert(archived_movements).from_select(
+            LEDGER_COLUMNS,
+            select(*(live_movements.c[name] for name in LEDGER_COLUMNS)).where(archived),
+        )
+    ).rowcount
+
+    boundary = db.scalar(select(func.max(live_movements.c.id)).where(before_cutoff))
+    totals = db.execute(
+        select(
+            StockMovement.product_id,
+            func.sum(IN_QUANTITY).label("in_sum"),
+            func.sum(OUT_QUANTITY).label("out_sum"),
+        )
+        .where(StockMovement.created_at < cutoff)
+        .group_by(StockMovement.product_id)
+        .order_by(StockMovement.product_id)
+    ).all()
+
+    opening_at = cutoff - timedelta(microseconds=1)
+    openings = [
+        {
+            "product_id": row.product_id,
+            "movement_type": movement_type,
+            "quantity": int(quantity),
+            "note": OPENING_BALANCE_NOTE,
+            "created_by": created_by,
+            "created_at": opening_at,
+        }
+        for row in totals
+        for movement_type, quantity in (("IN", row.in_sum), ("OUT", row.out_sum))
+        if quantity
+    ]
+    if openings:
+        db.execute(insert(live_movements), openings)
+    if boundary is not None:
+        db.execute(
+            delete(live_movements).where(before_cutoff, live_movements.c.id <= boundary)
+        )
+
+    archive = LedgerArchive(cutoff=cutoff, movements=moved, products=len(totals))
+    db.add(archive)
+    db.flush()
+    mark_changed(db, None)
+    return archive
+
+
+def movement_history(db: Session, start_at: datetime | None):
+    return history_since(archive_cutoff(db), start_at)
+
+
+def history_since(cutoff: datetime | None, start_at: datetime | None):
+    if start_at is None or cutoff is None or to_utc(start_at) >= cutoff:
+        return live_movements
+    return union_all(
+        select(*(archived_movements.c[name] for name in LEDGER_COLUMNS)).where(
+            archived_movements.c.created_at >= to_utc(start_at)
+        ),
+        select(*(live_movements.c[name] for name in LEDGER_COLUMNS)).where(
+            live_movements.c.created_at >= cutoff
+        ),
+    ).subquery("movement_history")
@@ -1,21 +1,357 @@
-from sqlalchemy import case, func
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import bindparam, case, delete, func, insert, literal, select, union_all, update
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.db.changes import mark_changed
+from app.models.balance_snapshot import BalanceSnapshot
+from app.models.ledger_archive import LedgerArchive
+from app.models.product import Product
+from app.models.product_balance import ProductBalance
 from app.models.stock_movement import StockMovement
+from app.models.stock_movement_archive import StockMovementArchive
 
 
-def get_product_balance(db: Session, product_id: int) -> int:
-    in_sum = func.coalesce(
-        func.sum(case((StockMovement.movement_type == "IN", StockMovement.quantity), else_=0)),
-        0,
-    )
-    out_sum = func.coalesce(
-        func.sum(case((StockMovement.movement_type == "OUT", StockMovement.quantity), else_=0)),
-        0,
+BALANCE_LOOKUP_CHUNK = 1000
+
+
+@dataclass
+class BalanceMismatch:
+    product_id: int
+    expected_in: int
+    expected_out: int
+    stored_in: int
+    stored_out: int
+    stored_balance: int
+
+    @property
+    def expected_balance(self) -> int:
+        return self.expected_in - self.expected_out
+
+
+def directed_quantity(ledger, movement_type: str):
+    return case((ledger.movement_type == movement_type, ledger.quantity), else_=0)
+
+
+IN_QUANTITY = directed_quantity(StockMovement, "IN")
+OUT_QUANTITY = directed_quantity(StockMovement, "OUT")
+
+
+def ledger_totals():
+    in_sum = func.coalesce(func.sum(IN_QUANTITY), 0)
+    out_sum = func.coalesce(func.sum(OUT_QUANTITY), 0)
+    return (
+        select(
+            StockMovement.product_id.label("product_id"),
+            in_sum.label("in_sum"),
+            out_sum.label("out_sum"),
+            func.max(StockMovement.id).label("last_movement_id"),
+        )
+        .group_by(StockMovement.product_id)
+        .subquery()
     )
+
+
+def get_product_balance(db: Session, product_id: int) -> int:
     balance = (
-        db.query((in_sum - out_sum).label("balance"))
-        .filter(StockMovement.product_id == product_id)
+        db.query(ProductBalance.balance)
+        .filter(ProductBalance.product_id == product_id)
         .scalar()
     )
     return int(balance or 0)
+
+
+def create_balance(db: Session, product_id: int) -> ProductBalance:
+    balance = ProductBalance(product_id=product_id, in_sum=0, out_sum=0, balance=0)
+    db.add(balance)
+    db.flush()
+    return balance
+
+
+def apply_balance_delta(
+    db: Session,
+    product_id: int,
+    in_delta: int,
+    out_delta: int,
+    last_movement_id: int | None,
+) -> None:
+    last_id = func.coalesce(ProductBalance.last_movement_id, 0)
+    result = db.execute(
+        update(ProductBalance)
+        .where(ProductBalance.product_id == product_id)
+        .values(
+            in_sum=ProductBalance.in_sum + in_delta,
+            out_sum=ProductBalance.out_sum + out_delta,
+            balance=ProductBalance.balance + (in_delta - out_delta),
+            last_movement_id=case(
+                (last_id < (last_movement_id or 0), last_movement_id),
+                else_=ProductBalance.last_movement_id,
+            ),
+            updated_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    mark_changed(db, [product_id])
+    if result.rowcount == 0:
+        db.add(
+            ProductBalance(
+                product_id=product_id,
+                in_sum=in_delta,
+                out_sum=out_delta,
+                balance=in_delta - out_delta,
+                last_movement_id=last_movement_id,
+            )
+        )
+        db.flush()
+
+
+def apply_balance_deltas(db: Session, deltas: dict[int, tuple[int, int, int | None]]) -> None:
+    if not deltas:
+        return
+
+    mark_changed(db, deltas)
+    table = ProductBalance.__table__
+    product_ids = list(deltas)
+    existing = set()
+    for start in range(0, len(product_ids), BALANCE_LOOKUP_CHUNK):
+        chunk = product_ids[start : start + BALANCE_LOOKUP_CHUNK]
+        existing.update(db.scalars(select(table.c.product_id).where(table.c.product_id.in_(chunk))))
+    missing = [product_id for product_id in deltas if product_id not in existing]
+    if missing:
+        db.execute(
+            insert(table),
+            [
+                {"product_id": product_id, "in_sum": 0, "out_sum": 0, "balance": 0}
+                for product_id in missing
+            ],
+        )
+
+    last_id = func.coalesce(table.c.last_movement_id, 0)
+    new_last_id = bindparam("b_last_movement_id")
+    db.execute(
+        update(table)
+        .where(table.c.product_id == bindparam("b_product_id"))
+        .values(
+            in_sum=table.c.in_sum + bindparam("b_in_delta"),
+            out_sum=table.c.out_sum + bindparam("b_out_delta"),
+            balance=table.c.balance + bindparam("b_in_delta") - bindparam("b_out_delta"),
+            last_movement_id=case(
+                (last_id < func.coalesce(new_last_id, 0), new_last_id),
+                else_=table.c.last_movement_id,
+            ),
+            updated_at=func.now(),
+        ),
+        [
+            {
+                "b_product_id": product_id,
+                "b_in_delta": in_delta,
+                "b_out_delta": out_delta,
+                "b_last_movement_id": last_movement_id,
+            }
+            for product_id, (in_delta, out_delta, last_movement_id) in deltas.items()
+        ],
+    )
+
+
+def apply_movement(db: Session, movement: StockMovement) -> None:
+    if movement.id is None:
+        db.flush()
+    in_delta = movement.quantity if movement.movement_type == "IN" else 0
+    out_delta = movement.quantity if movement.movement_type == "OUT" else 0
+    apply_balance_delta(db, movement.product_id, in_delta, out_delta, movement.id)
+
+
+def delete_balance(db: Session, product_id: int) -> None:
+    mark_changed(db, [product_id])
+    db.execute(
+        delete(ProductBalance)
+        .where(ProductBalance.product_id == product_id)
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        delete(BalanceSnapshot)
+        .where(BalanceSnapshot.product_id == product_id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def find_balance_mismatches(db: Session) -> list[BalanceMismatch]:
+    totals = ledger_totals()
+    expected_in = func.coalesce(totals.c.in_sum, 0)
+    expected_out = func.coalesce(totals.c.out_sum, 0)
+    stored_in = func.coalesce(ProductBalance.in_sum, 0)
+    stored_out = func.coalesce(ProductBalance.out_sum, 0)
+    stored_balance = func.coalesce(ProductBalance.balance, 0)
+    rows = db.execute(
+        select(
+            Product.id,
+            expected_in.label("expected_in"),
+            expected_out.label("expected_out"),
+            stored_in.label("stored_in"),
+            stored_out.label("stored_out"),
+            stored_balance.label("stored_balance"),
+        )
+        .outerjoin(totals, totals.c.product_id == Product.id)
+        .outerjoin(ProductBalance, ProductBalance.product_id == Product.id)
+        .where(
+            (expected_in != stored_in)
+            | (expected_out != stored_out)
+            | ((expected_in - expected_out) != stored_balance)
+        )
+        .order_by(Product.id)
+    ).all()
+    return [
+        BalanceMismatch(
+            product_id=row.id,
+            expected_in=int(row.expected_in),
+            expected_out=int(row.expected_out),
+            stored_in=int(row.stored_in),
+            stored_out=int(row.stored_out),
+            stored_balance=int(row.stored_balance),
+        )
+        for row in rows
+    ]
+
+
+def rebuild_balances(db: Session) -> int:
+    totals = ledger_totals()
+    in_sum = func.coalesce(totals.c.in_sum, 0)
+    out_sum = func.coalesce(totals.c.out_sum, 0)
+    db.execute(delete(ProductBalance))
+    mark_changed(db, None)
+    result = db.execute(
+        insert(ProductBalance).from_select(
+            ["product_id", "in_sum", "out_sum", "balance", "last_movement_id", "updated_at"],
+            select(
+                Product.id,
+                in_sum,
+                out_sum,
+                in_sum - out_sum,
+                totals.c.last_movement_id,
+                func.now(),
+            ).outerjoin(totals, totals.c.product_id == Product.id),
+        )
+    )
+    return result.rowcount
+
+
+def to_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+ARCHIVE_CUTOFF = select(func.max(LedgerArchive.cutoff))
+
+
+def archive_cutoff(db: Session) -> datetime | None:
+    cutoff = db.scalar(ARCHIVE_CUTOFF)
+    return to_utc(cutoff) if cutoff is not None else None
+
+
+def latest_snapshot_at(
+    db: Session, as_of: datetime, not_before: datetime | None = None
+) -> datetime | None:
+    query = db.query(func.max(BalanceSnapshot.snapshot_at)).filter(
+        BalanceSnapshot.snapshot_at <= as_of
+    )
+    if not_before is not None:
+        query = query.filter(BalanceSnapshot.snapshot_at >= not_before)
+    return query.scalar()
+
+
+def balances_as_of(db: Session, as_of: datetime, product_id: int | None = None):
+    as_of = to_utc(as_of)
+    cutoff = archive_cutoff(db)
+    archived = cutoff is not None and as_of < cutoff
+    ledger = StockMovementArchive if archived else StockMovement
+    snapshot_at = latest_snapshot_at(db, as_of, None if archived else cutoff)
+
+    movements = select(
+        ledger.product_id.label("product_id"),
+        directed_quantity(ledger, "IN").label("in_qty"),
+        directed_quantity(ledger, "OUT").label("out_qty"),
+    ).where(ledger.created_at <= as_of)
+    if product_id is not None:
+        movements = movements.where(ledger.product_id == product_id)
+
+    if snapshot_at is None:
+        rows = movements.subquery()
+    else:
+        snapshot = select(
+            BalanceSnapshot.product_id,
+            BalanceSnapshot.in_sum,
+            BalanceSnapshot.out_sum,
+        ).where(BalanceSnapshot.snapshot_at == snapshot_at)
+        if product_id is not None:
+            snapshot = snapshot.where(BalanceSnapshot.product_id == product_id)
+        rows = union_all(
+            movements.where(ledger.created_at > snapshot_at),
+            snapshot,
+        ).subquery()
+
+    in_sum = func.coalesce(func.sum(rows.c.in_qty), 0)
+    out_sum = func.coalesce(func.sum(rows.c.out_qty), 0)
+    return (
+        select(
+            rows.c.product_id.label("product_id"),
+            in_sum.label("in_sum"),
+            out_sum.label("out_sum"),
+            (in_sum - out_sum).label("balance"),
+        )
+        .group_by(rows.c.product_id)
+        .subquery()
+    )
+
+
+def get_balance_as_of(
+    db: Session, product_id: int | None, as_of: datetime
+) -> int | dict[int, int]:
+    balances = balances_as_of(db, as_of, product_id=product_id)
+    rows = db.execute(select(balances.c.product_id, balances.c.balance)).all()
+    if product_id is not None:
+        return int(rows[0].balance) if rows else 0
+    return {row.product_id: int(row.balance) for row in rows}
+
+
+def snapshot_boundary(now: datetime | None = None) -> datetime:
+    now = to_utc(now or datetime.now(timezone.utc))
+    interval = timedelta(hours=settings.balance_snapshot_interval_hours)
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    settled = now - timedelta(seconds=settings.balance_snapshot_lag_seconds)
+    return epoch + ((settled - epoch) // interval) * interval
+
+
+def take_snapshot(db: Session, snapshot_at: datetime) -> int:
+    snapshot_at = to_utc(snapshot_at)
+    exists = (
+        db.query(BalanceSnapshot.id)
+        .filter(BalanceSnapshot.snapshot_at == snapshot_at)
+        .first()
+    )
+    if exists:
+        return 0
+
+    balances = balances_as_of(db, snapshot_at)
+    result = db.execute(
+        insert(BalanceSnapshot).from_select(
+            ["snapshot_at", "product_id", "in_sum", "out_sum", "balance"],
+            select(
+                literal(snapshot_at, BalanceSnapshot.snapshot_at.type),
+                balances.c.product_id,
+                balances.c.in_sum,
+                balances.c.out_sum,
+                balances.c.balance,
+            ),
+        )
+    )
+    return result.rowcount
+
+
+def take_due_snapshot(db: Session, now: datetime | None = None) -> datetime | None:
+    boundary = snapshot_boundary(now)
+    if take_snapshot(db, boundary) == 0:
+        return None
+    return boundary
@@ -0,0 +1,277 @@
+from array import array
+from collections.abc import Iterable
+
+from sqlalchemy import func, literal, select, tuple_
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db.changes import ChangeFollower, subscribe, unsubscribe
+from app.models.product import Product
+from app.schemas.stock import StockOverviewList
+from app.services.search import name_filter
+from app.services.stock_query import PRODUCT_ROWS, PRODUCT_ROWS_BY_ID
+
+
+INVENTORY_LOAD_CHUNK = 1000
+LOW_STOCK_ENABLED = 1
+ACTIVE = 2
+NAME_ORDER = select(Product.id).order_by(Product.name, Product.id)
+NAME_KEY = tuple_(Product.name, Product.id)
+
+
+class InventoryIndex(ChangeFollower):
+    def __init__(self, session_factory: sessionmaker):
+        super().__init__(session_factory)
+        self._clear()
+
+    def _clear(self) -> None:
+        self.ids = array("q")
+        self.names: list[str] = []
+        self.name_ranks = array("q")
+        self.units: list[str] = []
+        self.min_stock = array("q")
+        self.balances = array("q")
+        self.flags = bytearray()
+        self.created_at: list = []
+        self.positions: dict[int, int] = {}
+        self._orders: dict[tuple[str, bool, bool], list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def load(self) -> None:
+        with self._lock, self.session_factory() as db:
+            self._clear()
+            for row in db.execute(
+                PRODUCT_ROWS, execution_options={"yield_per": INVENTORY_LOAD_CHUNK}
+            ):
+                self._upsert(row)
+            self._rank_names(db)
+            self.loaded = True
+
+    def refresh(self, product_ids: Iterable[int], bind: Engine | None = None) -> None:
+        product_ids = list(product_ids)
+        with self._lock, self.session_factory(bind=bind or self.engine) as db:
+            reordered = False
+            for start in range(0, len(product_ids), INVENTORY_LOAD_CHUNK):
+                chunk = product_ids[start : start + INVENTORY_LOAD_CHUNK]
+                found = set()
+                for row in db.execute(PRODUCT_ROWS_BY_ID, {"product_ids": chunk}):
+                    reordered = self._upsert(row) or reordered
+                    found.add(row.id)
+                for product_id in chunk:
+                    if product_id not in found:
+                        reordered = self._remove(product_id) or reordered
+            if reordered:
+                self._rank_names(db)
+
+    def _rank_names(self, db: Session) -> None:
+        ranks = array("q", bytes(8 * len(self.ids)))
+        for rank, product_id in enumerate(db.scalars(NAME_ORDER)):
+            position = self.positions.get(product_id)
+            if position is not None:
+                ranks[position] = rank
+        self.name_ranks = ranks
+        self._orders.clear()
+
+    def _upsert(self, row) -> bool:
+        flags = (LOW_STOCK_ENABLED if row.low_stock_enabled else 0) | (ACTIVE if row.is_active else 0)
+        position = self.positions.get(row.id)
+        if position is None:
+            self.positions[row.id] = len(self.ids)
+            self.ids.append(row.id)
+            self.names.append(row.name)
+            self.name_ranks.append(0)
+            self.units.append(row.unit)
+            self.min_stock.append(row.min_stock)
+            self.balances.append(int(row.balance))
+            self.flags.append(flags)
+            self.created_at.append(row.created_at)
+            renamed = True
+        else:
+            renamed = self.names[position] != row.name
+            self.names[position] = row.name
+            self.units[position] = row.unit
+            self.min_stock[position] = row.min_stock
+            self.balances[position] = int(row.balance)
+            self.flags[position] = flags
+            self.created_at[position] = row.created_at
+        self._orders.clear()
+        return renamed
+
+    def _remove(self, product_id: int) -> bool:
+        position = self.positions.pop(product_id, None)
+        if position is None:
+            return False
+        last = len(self.ids) - 1
+        columns = (
+            self.ids,
+            self.names,
+            self.name_ranks,
+            self.units,
+            self.min_stock,
+            self.balances,
+            self.flags,
+            self.created_at,
+        )
+        if position != last:
+            for column in columns:
+                column[position] = column[last]
+            self.positions[self.ids[position]] = position
+        for column in columns:
+            del column[last]
+        self._orders.clear()
+        return True
+
+    def _is_low(self, position: int) -> bool:
+        return bool(self.flags[position] & LOW_STOCK_ENABLED) and (
+            self.balances[position] <= self.min_stock[position]
+        )
+
+    def _sorted(self, sort_by: str, descending: bool, low_stock_first: bool) -> list[int]:
+        key = (sort_by, descending, low_stock_first)
+        order = self._orders.get(key)
+        if order is None:
+            column = self.name_ranks if sort_by == "name" else self.balances
+            order = sorted(range(len(self.ids)), key=self.ids.__getitem__, reverse=descending)
+            order.sort(key=column.__getitem__, reverse=descending)
+            if low_stock_first:
+                order.sort(key=self._is_low, reverse=True)
+            self._orders[key] = order
+        return order
+
+    def _order_values(self, position: int, sort_by: str, low_stock_first: bool) -> list:
+        if sort_by == "name":
+            values = [self.name_ranks[position]]
+        else:
+            values = [self.balances[position], self.ids[position]]
+        if low_stock_first:
+            values.insert(0, self._is_low(position))
+        return values
+
+    def _sort_values(self, position: int, sort_by: str, low_stock_first: bool) -> list:
+        value = self.names[position] if sort_by == "name" else self.balances[position]
+        values = [value, self.ids[position]]
+        if low_stock_first:
+            values.insert(0, self._is_low(position))
+        return values
+
+    def _item(self, position: int) -> dict:
+        flags = self.flags[position]
+        return {
+            "id": self.ids[position],
+            "name": self.names[position],
+            "unit": self.units[position],
+            "min_stock": self.min_stock[position],
+            "low_stock_enabled": bool(flags & LOW_STOCK_ENABLED),
+            "is_active": bool(flags & ACTIVE),
+            "created_at": self.created_at[position],
+            "balance": self.balances[position],
+            "low_stock": self._is_low(position),
+        }
+
+    def overview(
+        self,
+        search: str | None = None,
+        low_stock_only: bool = False,
+        active_only: bool = True,
+        sort_by: str = "name",
+        sort_dir: str = "asc",
+        low_stock_first: bool = False,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: str | None = None,
+        include_total: bool = True,
+    ) -> StockOverviewList:
+        descending = sort_dir == "desc"
+        scope = f"stock:{sort_by}:{sort_dir}:{int(low_stock_first)}"
+        after = decode_cursor(cursor, scope, 3 if low_stock_first else 2) if cursor else None
+        directions = [descending] if sort_by == "name" else [descending, descending]
+        if low_stock_first:
+            directions.insert(0, True)
+        found = None
+        if search or (after is not None and sort_by == "name"):
+            with self.session_factory() as db:
+                if search:
+                    found = set(db.scalars(select(Product.id).where(name_filter(db, search))))
+                if after is not None and sort_by == "name":
+                    after = [*after[:-2], self._name_boundary(db, *after[-2:], descending)]
+
+        with self._lock:
+            matches = [
+                position
+                for position in self._sorted(sort_by, descending, low_stock_first)
+                if (found is None or self.ids[position] in found)
+                and (not active_only or self.flags[position] & ACTIVE)
+                and (not low_stock_only or self._is_low(position))
+            ]
+            start = skip
+            if after is not None:
+                start = next(
+                    (
+                        index
+                        for index, position in enumerate(matches)
+                        if _follows(
+                            self._order_values(position, sort_by, low_stock_first),
+                            after,
+                            directions,
+                        )
+                    ),
+                    len(matches),
+                )
+            page = matches[start : start + limit + 1]
+            next_cursor = None
+            if len(page) > limit:
+                page = page[:limit]
+                next_cursor = encode_cursor(
+                    scope, self._sort_values(page[-1], sort_by, low_stock_first)
+                )
+            items = [self._item(position) for position in page]
+
+        return StockOverviewList(
+            items=items,
+            total=len(matches) if include_total else None,
+            skip=skip,
+            limit=limit,
+            next_cursor=next_cursor,
+        )
+
+
+    def _name_boundary(self, db: Session, name: str, product_id: int, descending: bool) -> float:
+        cursor_key = tuple_(literal(name, Product.name.type), literal(product_id))
+        condition = NAME_KEY < cursor_key if descending else NAME_KEY <= cursor_key
+        return db.scalar(select(func.count()).select_from(Product).where(condition)) - 0.5
+
+
+def _follows(values: list, after: list, directions: list[bool]) -> bool:
+    for value, boundary, descending in zip(values, after, directions):
+        if value != boundary:
+            return value < boundary if descending else value > boundary
+    return False
+
+
+_index: InventoryIndex | None = None
+
+
+def get_inventory_index() -> InventoryIndex | None:
+    if _index is not None and _index.loaded:
+        return _index
+    return None
+
+
+def start_inventory_index(session_factory: sessionmaker) -> InventoryIndex:
+    global _index
+    stop_inventory_index()
+    index = InventoryIndex(session_factory)
+    index.load()
+    subscribe(index.on_commit)
+    _index = index
+    return index
+
+
+def stop_inventory_index() -> None:
+    global _index
+    if _index is not None:
+        unsubscribe(_index.on_commit)
+        _index = None
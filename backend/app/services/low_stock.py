@@ -0,0 +1,63 @@
+from collections.abc import Iterable
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.changes import ChangeFollower, subscribe, unsubscribe
+from app.services.stock_query import LOW_STOCK_IDS, LOW_STOCK_IDS_BY_ID
+
+
+LOW_STOCK_REFRESH_CHUNK = 1000
+
+
+class LowStockCache(ChangeFollower):
+    def __init__(self, session_factory: sessionmaker):
+        super().__init__(session_factory)
+        self.ids: set[int] = set()
+
+    def load(self) -> None:
+        with self._lock, self.session_factory() as db:
+            self.ids = set(db.scalars(LOW_STOCK_IDS))
+            self.loaded = True
+
+    def refresh(self, product_ids: Iterable[int], bind: Engine | None = None) -> None:
+        product_ids = list(product_ids)
+        with self._lock, self.session_factory(bind=bind or self.engine) as db:
+            for start in range(0, len(product_ids), LOW_STOCK_REFRESH_CHUNK):
+                chunk = product_ids[start : start + LOW_STOCK_REFRESH_CHUNK]
+                low = db.scalars(LOW_STOCK_IDS_BY_ID, {"product_ids": chunk}).all()
+                self.ids.difference_update(chunk)
+                self.ids.update(low)
+
+    def count(self) -> int:
+        return len(self.ids)
+
+    def low_stock_ids(self) -> frozenset[int]:
+        with self._lock:
+            return frozenset(self.ids)
+
+
+_cache: LowStockCache | None = None
+
+
+def get_low_stock_cache() -> LowStockCache | None:
+    if _cache is not None and _cache.loaded:
+        return _cache
+    return None
+
+
+def start_low_stock_cache(session_factory: sessionmaker) -> LowStockCache:
+    global _cache
+    stop_low_stock_cache()
+    cache = LowStockCache(session_factory)
+    cache.load()
+    subscribe(cache.on_commit)
+    _cache = cache
+    return cache
+
+
+def stop_low_stock_cache() -> None:
+    global _cache
+    if _cache is not None:
+        unsubscribe(_cache.on_commit)
+        _cache = None
@@ -0,0 +1,157 @@
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from typing import TextIO
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.models.product import Product
+from app.models.stock_movement import StockMovement
+from app.schemas.movement import MovementBulkError, MovementBulkResult, MovementCreate
+from app.services.balance import apply_balance_deltas
+
+
+BULK_BATCH_SIZE = 1000
+MOVEMENT_UPLOAD_COLUMNS = ("product_id", "movement_type", "quantity", "note")
+
+
+class BulkIngestError(Exception):
+    def __init__(self, errors: list[MovementBulkError]):
+        super().__init__(f"{len(errors)} movement(s) rejected")
+        self.errors = errors
+
+
+class MovementIngest:
+    def __init__(self, db: Session, created_by: int, atomic: bool = True):
+        self.db = db
+        self.created_by = created_by
+        self.atomic = atomic
+        self.created_ids: list[int] = []
+        self.errors: list[MovementBulkError] = []
+        self.known_products: set[int] = set()
+        self.deltas: dict[int, list[int]] = {}
+
+    def reject(self, index: int, detail: str) -> None:
+        self.errors.append(MovementBulkError(index=index, detail=detail))
+
+    def add(self, rows: Iterable[tuple[int, MovementCreate | str]]) -> None:
+        valid: list[tuple[int, MovementCreate]] = []
+        for index, item in rows:
+            if isinstance(item, str):
+                self.reject(index, item)
+            else:
+                valid.append((index, item))
+
+        unknown = {item.product_id for _, item in valid} - self.known_products
+        if unknown:
+            self.known_products.update(
+                self.db.scalars(select(Product.id).where(Product.id.in_(unknown)))
+            )
+
+        accepted = []
+        for index, item in valid:
+            if item.product_id in self.known_products:
+                accepted.append(item)
+            else:
+                self.reject(index, "Product not found")
+
+        if not accepted or (self.atomic and self.errors):
+            return
+
+        inserted = self.db.execute(
+            insert(StockMovement.__table__).returning(
+                StockMovement.__table__.c.id, StockMovement.__table__.c.product_id
+            ),
+            [
+                {
+                    "product_id": item.product_id,
+                    "movement_type": item.movement_type,
+                    "quantity": item.quantity,
+                    "note": item.note,
+                    "created_by": self.created_by,
+                }
+                for item in accepted
+            ],
+        ).all()
+        self.created_ids.extend(sorted(movement_id for movement_id, _ in inserted))
+
+        last_ids = {}
+        for movement_id, product_id in inserted:
+            last_ids[product_id] = max(last_ids.get(product_id, 0), movement_id)
+        for item in accepted:
+            delta = self.deltas.setdefault(item.product_id, [0, 0, 0])
+            delta[0 if item.movement_type == "IN" else 1] += item.quantity
+            delta[2] = max(delta[2], last_ids[item.product_id])
+
+    def finish(self) -> MovementBulkResult:
+        if self.atomic and self.errors:
+            raise BulkIngestError(self.errors)
+
+        apply_balance_deltas(
+            self.db,
+            {product_id: tuple(delta) for product_id, delta in self.deltas.items()},
+        )
+        return MovementBulkResult(
+            created=len(self.created_ids),
+            failed=len(self.errors),
+            ids=self.created_ids,
+            errors=self.errors,
+        )
+
+
+def bulk_create_movements(
+    db: Session,
+    items: Iterable[tuple[int, MovementCreate | str]],
+    created_by: int,
+    atomic: bool = True,
+) -> MovementBulkResult:
+    ingest = MovementIngest(db, created_by, atomic=atomic)
+    batch = []
+    for row in items:
+        batch.append(row)
+        if len(batch) == BULK_BATCH_SIZE:
+            ingest.add(batch)
+            batch = []
+    if batch:
+        ingest.add(batch)
+    return ingest.finish()
+
+
+def _csv_records(stream: TextIO) -> Iterator[dict | str]:
+    for row in csv.DictReader(stream):
+        yield {
+            column: row[column]
+            for column in MOVEMENT_UPLOAD_COLUMNS
+            if row.get(column) not in (None, "")
+        }
+
+
+def _ndjson_records(stream: TextIO) -> Iterator[dict | str]:
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield "Invalid JSON"
+            continue
+        yield record if isinstance(record, dict) else "Expected a JSON object"
+
+
+def validate_movement_rows(
+    records: Iterable[dict | str],
+) -> Iterator[tuple[int, MovementCreate | str]]:
+    for index, record in enumerate(records):
+        if isinstance(record, str):
+            yield index, record
+            continue
+        try:
+            yield index, MovementCreate(**record)
+        except ValidationError as exc:
+            yield index, "; ".join(error["msg"] for error in exc.errors())
+
+
+def parse_movement_rows(stream: TextIO, ndjson: bool) -> Iterator[tuple[int, MovementCreate | str]]:
+    return validate_movement_rows(_ndjson_records(stream) if ndjson else _csv_records(stream))
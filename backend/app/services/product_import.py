@@ -0,0 +1,158 @@
+import csv
+from collections.abc import Iterator
+from typing import TextIO
+
+from pydantic import ValidationError
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.db.changes import mark_changed
+from app.models.product import Product
+from app.models.stock_movement import StockMovement
+from app.schemas.product import ProductBase, ProductImportError, ProductImportResult
+from app.services.balance import apply_balance_deltas
+
+
+IMPORT_BATCH_SIZE = 1000
+PRODUCT_IMPORT_COLUMNS = ("name", "unit", "min_stock", "low_stock_enabled", "is_active")
+
+
+def parse_product_rows(stream: TextIO) -> Iterator[tuple[int, tuple[ProductBase, int] | str]]:
+    for index, row in enumerate(csv.DictReader(stream)):
+        fields = {
+            column: row[column]
+            for column in PRODUCT_IMPORT_COLUMNS
+            if row.get(column) not in (None, "")
+        }
+        try:
+            product = ProductBase(**fields)
+            balance = int(row.get("balance") or 0)
+        except ValidationError as exc:
+            yield index, "; ".join(error["msg"] for error in exc.errors())
+            continue
+        except ValueError:
+            yield index, "Balance must be an integer."
+            continue
+        yield index, (product, balance)
+
+
+class ProductImport:
+    def __init__(self, db: Session, created_by: int):
+        self.db = db
+        self.created_by = created_by
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.errors: list[ProductImportError] = []
+
+    def add(self, rows: list[tuple[int, tuple[ProductBase, int] | str]]) -> None:
+        latest: dict[tuple[str, str], tuple[ProductBase, int]] = {}
+        for index, item in rows:
+            self.rows += 1
+            if isinstance(item, str):
+                self.errors.append(ProductImportError(index=index, detail=item))
+            else:
+                latest[(item[0].name, item[0].unit)] = item
+        if not latest:
+            return
+
+        existing = {
+            (name, unit): product_id
+            for product_id, name, unit in self.db.execute(
+                select(Product.id, Product.name, Product.unit).where(
+                    Product.name.in_({name for name, _ in latest})
+                )
+            )
+        }
+
+        updates = []
+        inserts = []
+        for key, (product, balance) in latest.items():
+            if key in existing:
+                updates.append({"b_id": existing[key], **self._values(product)})
+            else:
+                inserts.append((product, balance))
+
+        if updates:
+            table = Product.__table__
+            self.db.execute(
+                update(table)
+                .where(table.c.id == bindparam("b_id"))
+                .values({column: bindparam(column) for column in PRODUCT_IMPORT_COLUMNS[2:]}),
+                updates,
+            )
+            mark_changed(self.db, [row["b_id"] for row in updates])
+            self.updated += len(updates)
+
+        if inserts:
+            self._insert(inserts)
+
+    def _values(self, product: ProductBase) -> dict:
+        return {
+            "min_stock": product.min_stock,
+            "low_stock_enabled": product.low_stock_enabled,
+            "is_active": product.is_active,
+        }
+
+    def _insert(self, inserts: list[tuple[ProductBase, int]]) -> None:
+        products = Product.__table__
+        inserted = self.db.execute(
+            insert(products).returning(products.c.id, products.c.name, products.c.unit),
+            [
+                {"name": product.name, "unit": product.unit, **self._values(product)}
+                for product, _ in inserts
+            ],
+        ).all()
+        product_ids = {(name, unit): product_id for product_id, name, unit in inserted}
+        self.created += len(inserted)
+
+        opening = [
+            (product_ids[(product.name, product.unit)], balance)
+            for product, balance in inserts
+            if balance
+        ]
+        last_ids = {}
+        if opening:
+            movements = StockMovement.__table__
+            last_ids = dict(
+                self.db.execute(
+                    insert(movements).returning(movements.c.product_id, movements.c.id),
+                    [
+                        {
+                            "product_id": product_id,
+                            "movement_type": "IN" if balance > 0 else "OUT",
+                            "quantity": abs(balance),
+                            "note": "Initial stock",
+                            "created_by": self.created_by,
+                        }
+                        for product_id, balance in opening
+                    ],
+                ).all()
+            )
+
+        deltas = {product_id: (0, 0, None) for product_id in product_ids.values()}
+        for product_id, balance in opening:
+            deltas[product_id] = (max(balance, 0), max(-balance, 0), last_ids[product_id])
+        apply_balance_deltas(self.db, deltas)
+
+    def finish(self) -> ProductImportResult:
+        return ProductImportResult(
+            rows=self.rows,
+            created=self.created,
+            updated=self.updated,
+            failed=len(self.errors),
+            errors=self.errors,
+        )
+
+
+def import_products(db: Session, stream: TextIO, created_by: int) -> ProductImportResult:
+    job = ProductImport(db, created_by)
+    batch = []
+    for row in parse_product_rows(stream):
+        batch.append(row)
+        if len(batch) == IMPORT_BATCH_SIZE:
+            job.add(batch)
+            batch = []
+    if batch:
+        job.add(batch)
+    return job.finish()
@@ -0,0 +1,106 @@
+import threading
+
+from sqlalchemy import bindparam, case, column, func, literal_column, select, table, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.config import settings
+from app.db.search_index import SQLITE_FTS_TABLE
+from app.models.product import Product
+
+
+FTS_MIN_TERM_LENGTH = 3
+
+products_fts = table(SQLITE_FTS_TABLE, column("rowid"), column("name"), column("rank"))
+
+_backends: dict[Engine, str] = {}
+_backends_lock = threading.Lock()
+
+
+def _detect_backend(db: Session) -> str:
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        found = db.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": SQLITE_FTS_TABLE},
+        ).first()
+        return "fts5" if found else "ilike"
+    if dialect == "postgresql":
+        found = db.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first()
+        return "pg_trgm" if found else "ilike"
+    return "ilike"
+
+
+def search_backend(db: Session) -> str:
+    if settings.product_search_backend != "auto":
+        return settings.product_search_backend
+    bind = db.get_bind()
+    with _backends_lock:
+        backend = _backends.get(bind)
+    if backend is None:
+        backend = _detect_backend(db)
+        with _backends_lock:
+            _backends[bind] = backend
+    return backend
+
+
+def reset_search_backend() -> None:
+    with _backends_lock:
+        _backends.clear()
+
+
+def _fts_query(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _fts_matches(term):
+    return select(products_fts.c.rowid).where(literal_column(SQLITE_FTS_TABLE).op("MATCH")(term))
+
+
+def name_match_mode(db: Session, term: str) -> str:
+    if search_backend(db) == "fts5" and len(term) >= FTS_MIN_TERM_LENGTH:
+        return "fts5"
+    return "like"
+
+
+def name_condition(mode: str, term: ColumnElement | None = None) -> ColumnElement:
+    if term is None:
+        term = bindparam("search_term")
+    if mode == "fts5":
+        return Product.id.in_(_fts_matches(term))
+    return Product.name.ilike(term)
+
+
+def name_term(mode: str, term: str) -> str:
+    if mode == "fts5":
+        return _fts_query(term)
+    return f"%{term}%"
+
+
+def name_filter(db: Session, term: str) -> ColumnElement:
+    mode = name_match_mode(db, term)
+    return name_condition(mode, bindparam("search_term", name_term(mode, term)))
+
+
+def search_products(db: Session, term: str, limit: int, active_only: bool = True) -> list[Product]:
+    backend = search_backend(db)
+    query = db.query(Product)
+    if active_only:
+        query = query.filter(Product.is_active.is_(True))
+
+    if backend == "fts5" and len(term) >= FTS_MIN_TERM_LENGTH:
+        matches = _fts_matches(_fts_query(term)).add_columns(products_fts.c.rank).subquery()
+        query = query.join(matches, matches.c.rowid == Product.id).order_by(
+            matches.c.rank, Product.name, Product.id
+        )
+    elif backend == "pg_trgm":
+        query = query.filter(Product.name.ilike(f"%{term}%")).order_by(
+            func.similarity(Product.name, term).desc(), Product.name, Product.id
+        )
+    else:
+        prefix_first = case((Product.name.ilike(f"{term}%"), 0), else_=1)
+        query = query.filter(Product.name.ilike(f"%{term}%")).order_by(
+            prefix_first, func.length(Product.name), Product.name, Product.id
+        )
+    return query.limit(limit).all()
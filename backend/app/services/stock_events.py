@@ -0,0 +1,298 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.changes import subscribe, unsubscribe
+from app.services.stock_query import PRODUCT_ROWS_BY_ID
+
+
+logger = logging.getLogger(__name__)
+
+STOCK_EVENTS_CHANNEL = "stock_events"
+STOCK_EVENTS_CHUNK = 1000
+NOTIFY_BATCH = 50
+RESET = ("reset", {})
+
+StockEvent = tuple[str, dict]
+
+
+class _Subscriber:
+    def __init__(self, size: int):
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(size)
+        self.overflowed = False
+
+    def deliver(self, item: tuple[int, str, dict]) -> None:
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class StockEventBroadcaster:
+    def __init__(self, session_factory: sessionmaker, buffer_size: int = 1000):
+        self.session_factory = session_factory
+        self.engine: Engine = session_factory.kw["bind"]
+        self.binds: set[Engine] = {self.engine}
+        self.epoch = format(time.time_ns(), "x")
+        self.buffer_size = buffer_size
+        self._events: deque[tuple[int, str, dict]] = deque(maxlen=buffer_size)
+        self._last_id = 0
+        self._subscribers: set[_Subscriber] = set()
+        self._lock = threading.Lock()
+
+    def watch(self, bind: Engine) -> None:
+        self.binds.add(bind)
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+    def listening(self) -> bool:
+        with self._lock:
+            return bool(self._subscribers)
+
+    def on_commit(self, bind: Engine, product_ids: frozenset[int] | None) -> None:
+        if bind not in self.binds:
+            return
+        if not self.listening():
+            self.mark_stale()
+            return
+        try:
+            if product_ids is None or len(product_ids) > self.buffer_size:
+                events = [RESET]
+            else:
+                events = self.changes(product_ids, bind)
+            if events:
+                self.send(events, bind)
+        except Exception:
+            logger.exception("Publishing stock events failed; asking clients to reload")
+            self.publish([RESET])
+
+    def changes(self, product_ids: Iterable[int], bind: Engine) -> list[StockEvent]:
+        product_ids = sorted(product_ids)
+        events = []
+        with self.session_factory(bind=bind) as db:
+            for start in range(0, len(product_ids), STOCK_EVENTS_CHUNK):
+                chunk = product_ids[start : start + STOCK_EVENTS_CHUNK]
+                rows = {
+                    row.id: row
+                    for row in db.execute(PRODUCT_ROWS_BY_ID, {"product_ids": chunk})
+                }
+                for product_id in chunk:
+                    row = rows.get(product_id)
+                    if row is None:
+                        events.append(("deleted", {"product_id": product_id}))
+                        continue
+                    events.append(
+                        (
+                            "balance",
+                            {
+                                "product_id": product_id,
+                                "balance": int(row.balance),
+                                "low_stock": bool(row.low_stock),
+                                "is_active": row.is_active,
+                            },
+                        )
+                    )
+        return events
+
+    def send(self, events: list[StockEvent], bind: Engine) -> None:
+        self.publish(events)
+
+    def publish(self, events: Iterable[StockEvent]) -> None:
+        with self._lock:
+            published = []
+            for name, data in events:
+                self._last_id += 1
+                item = (self._last_id, name, data)
+                self._events.append(item)
+                published.append(item)
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            for item in published:
+                try:
+                    subscriber.loop.call_soon_threadsafe(subscriber.deliver, item)
+                except RuntimeError:
+                    self._unsubscribe(subscriber)
+                    break
+
+    def mark_stale(self) -> None:
+        with self._lock:
+            if self._events and self._events[-1][1] == RESET[0]:
+                return
+        self.publish([RESET])
+
+    def _unsubscribe(self, subscriber: _Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def event_id(self, sequence: int) -> str:
+        return f"{self.epoch}-{sequence}"
+
+    def backlog(self, last_event_id: str | None) -> list[tuple[int, str, dict]] | None:
+        with self._lock:
+            if not last_event_id:
+                return []
+            epoch, _, sequence = last_event_id.partition("-")
+            if epoch != self.epoch or not sequence.isdigit():
+                return None
+            after = int(sequence)
+            if after > self._last_id:
+                return None
+            oldest = self._events[0][0] if self._events else self._last_id + 1
+            if after < oldest - 1:
+                return None
+            return [item for item in self._events if item[0] > after]
+
+    def format(self, item: tuple[int, str, dict]) -> bytes:
+        sequence, name, data = item
+        payload = json.dumps(data, separators=(",", ":"))
+        return f"id: {self.event_id(sequence)}\nevent: {name}\ndata: {payload}\n\n".encode()
+
+    async def stream(
+        self,
+        last_event_id: str | None,
+        is_disconnected: Callable[[], Awaitable[bool]],
+        keepalive_seconds: float = 15,
+    ) -> AsyncIterator[bytes]:
+        subscriber = _Subscriber(self.buffer_size)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        try:
+            yield b"retry: 3000\n\n"
+            backlog = self.backlog(last_event_id)
+            if backlog is None:
+                with self._lock:
+                    current = self._last_id
+                backlog = [(current, *RESET)]
+            sent = 0
+            for item in backlog:
+                yield self.format(item)
+                sent = item[0]
+            while not subscriber.overflowed and not await is_disconnected():
+                try:
+                    item = await asyncio.wait_for(subscriber.queue.get(), keepalive_seconds)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                if item[0] <= sent:
+                    continue
+                yield self.format(item)
+                sent = item[0]
+        finally:
+            self._unsubscribe(subscriber)
+
+
+class PostgresStockEventBroadcaster(StockEventBroadcaster):
+    def __init__(self, session_factory: sessionmaker, buffer_size: int = 1000):
+        super().__init__(session_factory, buffer_size)
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def listening(self) -> bool:
+        return True
+
+    def send(self, events: list[StockEvent], bind: Engine) -> None:
+        with bind.connect() as connection:
+            for start in range(0, len(events), NOTIFY_BATCH):
+                payload = json.dumps(events[start : start + NOTIFY_BATCH], separators=(",", ":"))
+                connection.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": STOCK_EVENTS_CHANNEL, "payload": payload},
+                )
+            connection.commit()
+
+    def start(self) -> None:
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._listen, name="stock-events-listener", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _receive(self, payload: str) -> None:
+        self.publish(tuple(event) for event in json.loads(payload))
+
+    def _listen(self) -> None:
+        while not self._stopped.is_set():
+            connection = None
+            try:
+                connection = self.engine.raw_connection()
+                connection.detach()
+                driver_connection = connection.driver_connection
+                driver_connection.autocommit = True
+                driver_connection.cursor().execute(f"LISTEN {STOCK_EVENTS_CHANNEL}")
+                if self.engine.dialect.driver == "psycopg2":
+                    self._poll_psycopg2(driver_connection)
+                else:
+                    self._poll_psycopg(driver_connection)
+            except Exception:
+                logger.exception("Stock events listener lost its connection; reconnecting")
+                self.publish([RESET])
+                self._stopped.wait(1)
+            finally:
+                if connection is not None:
+                    connection.close()
+
+    def _poll_psycopg(self, driver_connection) -> None:
+        while not self._stopped.is_set():
+            for notify in driver_connection.notifies(timeout=1.0):
+                self._receive(notify.payload)
+
+    def _poll_psycopg2(self, driver_connection) -> None:
+        while not self._stopped.is_set():
+            if select.select([driver_connection], [], [], 1.0) == ([], [], []):
+                continue
+            driver_connection.poll()
+            while driver_connection.notifies:
+                self._receive(driver_connection.notifies.pop(0).payload)
+
+
+_broadcaster: StockEventBroadcaster | None = None
+
+
+def get_stock_events() -> StockEventBroadcaster | None:
+    return _broadcaster
+
+
+def start_stock_events(
+    session_factory: sessionmaker, backend: str = "auto", buffer_size: int = 1000
+) -> StockEventBroadcaster:
+    global _broadcaster
+    stop_stock_events()
+    engine = session_factory.kw["bind"]
+    if backend == "auto":
+        backend = "postgres" if engine.dialect.name == "postgresql" else "memory"
+    broadcaster_class = (
+        PostgresStockEventBroadcaster if backend == "postgres" else StockEventBroadcaster
+    )
+    broadcaster = broadcaster_class(session_factory, buffer_size)
+    broadcaster.start()
+    subscribe(broadcaster.on_commit)
+    _broadcaster = broadcaster
+    return broadcaster
+
+
+def stop_stock_events() -> None:
+    global _broadcaster
+    if _broadcaster is not None:
+        unsubscribe(_broadcaster.on_commit)
+        _broadcaster.stop()
+        _broadcaster = None
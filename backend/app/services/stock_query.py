@@ -0,0 +1,162 @@
+from collections.abc import Callable
+from datetime import datetime
+
+from sqlalchemy import bindparam, case, func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.core.pagination import SortKey, order_by_keys, page_statement
+from app.models.product import Product
+from app.models.product_balance import ProductBalance
+from app.services.balance import balances_as_of, to_utc
+from app.services.search import name_condition, name_match_mode, name_term
+
+
+def balance_columns(balances):
+    balance = func.coalesce(balances.c.balance, 0)
+    low_stock = case(
+        (
+            (Product.low_stock_enabled.is_(True)) & (balance <= Product.min_stock),
+            True,
+        ),
+        else_=False,
+    )
+    return balance, low_stock
+
+
+class StockQuery:
+    def __init__(self, balances):
+        self.balance, self.low_stock = balance_columns(balances)
+        self.rows = select(
+            Product.id,
+            Product.name,
+            Product.unit,
+            Product.min_stock,
+            Product.low_stock_enabled,
+            Product.is_active,
+            Product.created_at,
+            self.balance.label("balance"),
+            self.low_stock.label("low_stock"),
+        ).outerjoin(balances, balances.c.product_id == Product.id)
+        self.historical = balances is not ProductBalance.__table__
+        self._statements: dict[tuple, Select] = {}
+
+    def sort_keys(self, sort_by: str, sort_dir: str, low_stock_first: bool) -> SortKey:
+        sort_columns = {"name": Product.name, "balance": self.balance}
+        descending = sort_dir == "desc"
+        keys = [(sort_columns[sort_by], descending), (Product.id, descending)]
+        if low_stock_first:
+            keys.insert(0, (self.low_stock, True))
+        return keys
+
+    def _cached(self, key: tuple, build: Callable[[], Select]) -> Select:
+        statement = self._statements.get(key)
+        if statement is None:
+            statement = self._statements[key] = build()
+        return statement
+
+    def filtered(self, search_mode: str | None, active_only: bool, low_stock_only: bool) -> Select:
+        def build() -> Select:
+            statement = self.rows
+            if self.historical:
+                statement = statement.where(Product.created_at <= bindparam("as_of"))
+            if search_mode:
+                statement = statement.where(name_condition(search_mode))
+            if active_only:
+                statement = statement.where(Product.is_active.is_(True))
+            if low_stock_only:
+                statement = statement.where(self.low_stock.is_(True))
+            return statement
+
+        return self._cached(("filtered", search_mode, active_only, low_stock_only), build)
+
+    def count(self, search_mode: str | None, active_only: bool, low_stock_only: bool) -> Select:
+        return self._cached(
+            ("count", search_mode, active_only, low_stock_only),
+            lambda: select(func.count()).select_from(
+                self.filtered(search_mode, active_only, low_stock_only).subquery()
+            ),
+        )
+
+    def ordered(
+        self,
+        search_mode: str | None,
+        active_only: bool,
+        low_stock_only: bool,
+        sort_by: str,
+        sort_dir: str,
+        low_stock_first: bool,
+    ) -> Select:
+        return self._cached(
+            (
+                "ordered",
+                search_mode,
+                active_only,
+                low_stock_only,
+                sort_by,
+                sort_dir,
+                low_stock_first,
+            ),
+            lambda: self.filtered(search_mode, active_only, low_stock_only).order_by(
+                *order_by_keys(self.sort_keys(sort_by, sort_dir, low_stock_first))
+            ),
+        )
+
+    def page(
+        self,
+        search_mode: str | None,
+        active_only: bool,
+        low_stock_only: bool,
+        sort_by: str,
+        sort_dir: str,
+        low_stock_first: bool,
+        with_cursor: bool,
+    ) -> Select:
+        return self._cached(
+            (
+                "page",
+                search_mode,
+                active_only,
+                low_stock_only,
+                sort_by,
+                sort_dir,
+                low_stock_first,
+                with_cursor,
+            ),
+            lambda: page_statement(
+                self.filtered(search_mode, active_only, low_stock_only),
+                self.sort_keys(sort_by, sort_dir, low_stock_first),
+                with_cursor,
+            ),
+        )
+
+
+CURRENT_STOCK = StockQuery(ProductBalance.__table__)
+PRODUCT_ROWS = CURRENT_STOCK.rows.order_by(Product.id)
+PRODUCT_ROWS_BY_ID = CURRENT_STOCK.rows.where(
+    Product.id.in_(bindparam("product_ids", expanding=True))
+)
+LOW_STOCK_COUNT = CURRENT_STOCK.count(None, True, True)
+LOW_STOCK_IDS = CURRENT_STOCK.filtered(None, True, True).with_only_columns(Product.id)
+LOW_STOCK_IDS_BY_ID = LOW_STOCK_IDS.where(
+    Product.id.in_(bindparam("product_ids", expanding=True))
+)
+
+
+def stock_query(db: Session, as_of: datetime | None = None) -> StockQuery:
+    if as_of is None:
+        return CURRENT_STOCK
+    return StockQuery(balances_as_of(db, as_of))
+
+
+def stock_params(
+    db: Session, search: str | None, as_of: datetime | None = None
+) -> tuple[str | None, dict]:
+    params = {}
+    search_mode = None
+    if search:
+        search_mode = name_match_mode(db, search)
+        params["search_term"] = name_term(search_mode, search)
+    if as_of is not None:
+        params["as_of"] = to_utc(as_of)
+    return search_mode, params
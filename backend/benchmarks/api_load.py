@@ -0,0 +1,341 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+SCENARIOS = {"inventory": 5, "movements": 3, "posting": 2, "export": 1}
+
+
+@dataclass
+class Ledger:
+    user_id: int
+    products: int
+    end: datetime
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(max(int(len(ordered) * fraction + 0.5) - 1, 0), len(ordered) - 1)]
+
+
+class Recorder:
+    def __init__(self):
+        self.timings: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    async def request(self, client, label: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+            await response.aread()
+            response.raise_for_status()
+        except Exception:
+            self.errors[label] += 1
+            return None
+        self.timings[label].append(time.perf_counter() - started)
+        return response
+
+    def summary(self, elapsed: float) -> dict:
+        endpoints = {}
+        for label in sorted(set(self.timings) | set(self.errors)):
+            ordered = sorted(self.timings[label]) or [0.0]
+            endpoints[label] = {
+                "count": len(self.timings[label]),
+                "errors": self.errors[label],
+                "rps": round(len(self.timings[label]) / elapsed, 2),
+                "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+                "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+                "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+                "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+            }
+        return endpoints
+
+
+async def inventory_page(client, recorder: Recorder, rng: random.Random, ledger: Ledger) -> None:
+    sort_by = rng.choice(("name", "balance"))
+    await asyncio.gather(
+        recorder.request(
+            client,
+            "GET /api/stock/overview",
+            "GET",
+            "/api/stock/overview",
+            params={"limit": 50, "sort_by": sort_by, "low_stock_first": "true"},
+        ),
+        recorder.request(client, "GET /api/stock/low/count", "GET", "/api/stock/low/count"),
+        recorder.request(client, "GET /api/settings", "GET", "/api/settings"),
+    )
+
+
+async def movement_listing(client, recorder: Recorder, rng: random.Random, ledger: Ledger) -> None:
+    params = {"limit": 50}
+    if rng.random() < 0.5:
+        params["product_id"] = rng.randint(1, ledger.products)
+    if rng.random() < 0.3:
+        params["movement_type"] = rng.choice(("IN", "OUT"))
+    response = await recorder.request(
+        client, "GET /api/movements", "GET", "/api/movements", params=params
+    )
+    cursor = response.json().get("next_cursor") if response is not None else None
+    if cursor:
+        await recorder.request(
+            client,
+            "GET /api/movements (next page)",
+            "GET",
+            "/api/movements",
+            params={**params, "cursor": cursor, "include_total": "false"},
+        )
+
+
+async def movement_burst(client, recorder: Recorder, rng: random.Random, ledger: Ledger) -> None:
+    for _ in range(rng.randint(3, 8)):
+        await recorder.request(
+            client,
+            "POST /api/movements",
+            "POST",
+            "/api/movements",
+            json={
+                "product_id": rng.randint(1, ledger.products),
+                "movement_type": "OUT" if rng.random() < 0.8 else "IN",
+                "quantity": rng.randint(1, 5),
+            },
+        )
+
+
+async def export_movements(client, recorder: Recorder, rng: random.Random, ledger: Ledger) -> None:
+    end = ledger.end
+    await recorder.request(
+        client,
+        "GET /api/export/movements.csv",
+        "GET",
+        "/api/export/movements.csv",
+        params={
+            "start_at": (end - timedelta(days=rng.choice((1, 7)))).isoformat(),
+            "end_at": end.isoformat(),
+        },
+    )
+
+
+SCENARIO_RUNNERS = {
+    "inventory": inventory_page,
+    "movements": movement_listing,
+    "posting": movement_burst,
+    "export": export_movements,
+}
+
+
+async def drive(client, users: int, duration: float, ledger: Ledger, seed: int) -> dict:
+    recorder = Recorder()
+    names = list(SCENARIOS)
+    weights = [SCENARIOS[name] for name in names]
+    deadline = time.perf_counter() + duration
+
+    async def user(index: int) -> None:
+        rng = random.Random(seed * 1000 + index)
+        while time.perf_counter() < deadline:
+            scenario = rng.choices(names, weights)[0]
+            await SCENARIO_RUNNERS[scenario](client, recorder, rng, ledger)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(user(index) for index in range(users)))
+    return recorder.summary(time.perf_counter() - started)
+
+
+@asynccontextmanager
+async def in_process_client(cookies: dict):
+    import httpx
+
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench", cookies=cookies
+        ) as client:
+            yield client
+
+
+@asynccontextmanager
+async def uvicorn_client(cookies: dict, workers: int):
+    import httpx
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+        env=os.environ.copy(),
+    )
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}",
+            cookies=cookies,
+            limits=httpx.Limits(max_connections=None),
+            timeout=60,
+        ) as client:
+            for _ in range(100):
+                try:
+                    await client.get("/api/ping")
+                    break
+                except httpx.TransportError:
+                    await asyncio.sleep(0.1)
+            yield client
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def load_ledger(user_id: int | None) -> Ledger | None:
+    from sqlalchemy import func
+
+    from app.db.session import SessionLocal
+    from app.models.product import Product
+    from app.models.stock_movement import StockMovement
+    from app.models.user import User
+
+    with SessionLocal() as db:
+        users = db.query(User.id).filter(User.is_active.is_(True))
+        if user_id is not None:
+            users = users.filter(User.id == user_id)
+        found = users.order_by(User.id).limit(1).scalar()
+        products = db.query(func.max(Product.id)).scalar()
+        end = db.query(func.max(StockMovement.created_at)).scalar()
+    if found is None or not products or end is None:
+        return None
+    return Ledger(found, products, end if end.tzinfo else end.replace(tzinfo=timezone.utc))
+
+
+async def run(args, ledger: Ledger) -> dict:
+    from app.core.jwt import create_access_token
+
+    cookies = {"access_token": create_access_token(str(ledger.user_id))}
+    client_context = (
+        uvicorn_client(cookies, args.workers)
+        if args.server == "uvicorn"
+        else in_process_client(cookies)
+    )
+    async with client_context as client:
+        if args.warmup:
+            await drive(client, args.users, args.warmup, ledger, args.seed + 1)
+        return await drive(client, args.users, args.duration, ledger, args.seed)
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_ms: float) -> list[str]:
+    regressions = []
+    for label, current in results["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(label)
+        if not previous or not current["count"]:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            limit = previous[metric] * (1 + threshold)
+            if current[metric] > limit and current[metric] - previous[metric] > min_ms:
+                regressions.append(
+                    f"{label} {metric}: {previous[metric]:.1f} -> {current[metric]:.1f} ms"
+                )
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{label} errors: {previous['errors']} -> {current['errors']}")
+    return regressions
+
+
+def report(results: dict) -> None:
+    print(f"{'endpoint':<34} {'count':>7} {'err':>5} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for label, stats in results["endpoints"].items():
+        print(
+            f"{label:<34} {stats['count']:>7} {stats['errors']:>5} {stats['rps']:>8.1f} "
+            f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Drive a realistic request mix against the API and report per-endpoint latency."
+    )
+    parser.add_argument("--server", choices=["inprocess", "uvicorn"], default="inprocess")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--users", type=int, default=16, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--warmup", type=float, default=3)
+    parser.add_argument("--products", type=int, default=5000)
+    parser.add_argument("--movements", type=int, default=500_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", help="use an existing generated database")
+    parser.add_argument("--user-id", type=int, help="authenticate as this user (default: first)")
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare against an earlier JSON result")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed p95/p99 growth")
+    parser.add_argument("--min-ms", type=float, default=2.0, help="ignore smaller regressions")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.database_url:
+            os.environ["DATABASE_URL"] = args.database_url
+        else:
+            os.environ["DATABASE_URL"] = f"sqlite:///{Path(workdir) / 'load.db'}"
+            from app.db.session import build_engine
+            from app.scripts.generate_data import generate
+
+            engine = build_engine(os.environ["DATABASE_URL"])
+            generate(engine, args.products, args.movements, seed=args.seed)
+            engine.dispose()
+
+        ledger = load_ledger(args.user_id)
+        if ledger is None:
+            sys.exit("No active user, products or movements found in the benchmark database.")
+        endpoints = asyncio.run(run(args, ledger))
+
+    results = {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": {
+            key: value
+            for key, value in vars(args).items()
+            if key not in {"output", "baseline", "database_url", "user_id"}
+        },
+        "endpoints": endpoints,
+    }
+    report(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+    if args.baseline:
+        regressions = compare(
+            results, json.loads(args.baseline.read_text()), args.threshold, args.min_ms
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+PATHS = (
+    "/api/stock/overview?limit=50",
+    "/api/stock/overview?limit=50&sort_by=balance&low_stock_first=true",
+    "/api/movements?limit=50",
+    "/api/products?search=Product%201&limit=20",
+    "/api/stock/low/count",
+)
+
+
+def populate(database_url: str, products: int, movements: int, seed: int) -> None:
+    import app.models  # noqa: F401
+    from app.db.base import Base
+    from app.models.product import Product
+    from app.models.stock_movement import StockMovement
+    from app.models.user import User
+    from app.services.balance import rebuild_balances
+
+    rng = random.Random(seed)
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.execute(insert(User), [{"id": 1, "email": "bench@example.com", "hashed_password": "-"}])
+    session.execute(
+        insert(Product),
+        [
+            {"id": index + 1, "name": f"Product {index + 1}", "unit": "pcs", "min_stock": 10}
+            for index in range(products)
+        ],
+    )
+    session.execute(
+        insert(StockMovement),
+        [
+            {
+                "product_id": rng.randint(1, products),
+                "movement_type": "IN" if rng.random() < 0.6 else "OUT",
+                "quantity": rng.randint(1, 20),
+                "created_by": 1,
+            }
+            for _ in range(movements)
+        ],
+    )
+    rebuild_balances(session)
+    session.commit()
+    session.close()
+    engine.dispose()
+
+
+async def run_load(requests: int, concurrency: int) -> tuple[list[float], int]:
+    import httpx
+
+    from app.core.jwt import create_access_token
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    timings: list[float] = []
+    failures = 0
+    queue = iter(range(requests))
+
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://bench",
+        cookies={"access_token": create_access_token("1")},
+    ) as client:
+
+        async def worker() -> None:
+            nonlocal failures
+            for index in queue:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(PATHS[index % len(PATHS)])
+                    response.raise_for_status()
+                except Exception:
+                    failures += 1
+                    continue
+                timings.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return timings, failures
+
+
+def report(mode: str, timings: list[float], failures: int, elapsed: float) -> None:
+    ordered = sorted(timings) or [0.0]
+    p95 = ordered[max(int(len(ordered) * 0.95) - 1, 0)]
+    print(
+        f"{mode}: {len(timings)} ok, {failures} failed in {elapsed:.2f}s "
+        f"({len(timings) / elapsed:,.0f} req/s), "
+        f"p50 {statistics.median(ordered) * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare sync and async database modes under concurrent load."
+    )
+    parser.add_argument("--mode", choices=["both", "sync", "async"], default="both")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--movements", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    if args.mode != "both":
+        started = time.perf_counter()
+        timings, failures = asyncio.run(run_load(args.requests, args.concurrency))
+        report(args.mode, timings, failures, time.perf_counter() - started)
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database_url = args.database_url or f"sqlite:///{Path(workdir) / 'load.db'}"
+        populate(database_url, args.products, args.movements, args.seed)
+        for mode in ("sync", "async"):
+            env = {
+                **os.environ,
+                "DATABASE_URL": database_url,
+                "DATABASE_ASYNC": "true" if mode == "async" else "false",
+            }
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.async_load",
+                    "--mode",
+                    mode,
+                    "--requests",
+                    str(args.requests),
+                    "--concurrency",
+                    str(args.concurrency),
+                ],
+                env=env,
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
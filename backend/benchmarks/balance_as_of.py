@@ -0,0 +1,117 @@
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import case, create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401
+from app.db.base import Base
+from app.models.product import Product
+from app.models.stock_movement import StockMovement
+from app.models.user import User
+from app.services.balance import get_balance_as_of, take_snapshot
+
+
+START = datetime(2022, 1, 1, tzinfo=timezone.utc)
+
+
+def populate(session, products: int, movements: int, days: int, seed: int) -> None:
+    rng = random.Random(seed)
+    session.execute(insert(User), [{"id": 1, "email": "bench@example.com", "hashed_password": "-"}])
+    session.execute(
+        insert(Product),
+        [{"id": index + 1, "name": f"Product {index + 1}", "unit": "pcs"} for index in range(products)],
+    )
+    step = timedelta(days=days) / movements
+    batch = []
+    for index in range(movements):
+        batch.append(
+            {
+                "product_id": rng.randint(1, products),
+                "movement_type": "IN" if rng.random() < 0.55 else "OUT",
+                "quantity": rng.randint(1, 20),
+                "created_by": 1,
+                "created_at": START + step * index,
+            }
+        )
+        if len(batch) == 10_000:
+            session.execute(insert(StockMovement), batch)
+            batch.clear()
+    if batch:
+        session.execute(insert(StockMovement), batch)
+    session.commit()
+
+
+def full_scan_balances(session, as_of: datetime) -> dict[int, int]:
+    signed = case(
+        (StockMovement.movement_type == "IN", StockMovement.quantity),
+        else_=-StockMovement.quantity,
+    )
+    rows = session.execute(
+        select(StockMovement.product_id, func.sum(signed))
+        .where(StockMovement.created_at <= as_of)
+        .group_by(StockMovement.product_id)
+    ).all()
+    return {product_id: int(balance) for product_id, balance in rows}
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def run(size: int, products: int, days: int, repeat: int, seed: int, workdir: Path) -> dict:
+    engine = create_engine(f"sqlite:///{workdir / f'as_of_{size}.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        populate(session, products, size, days, seed)
+        for day in range(1, days + 1):
+            take_snapshot(session, START + timedelta(days=day))
+        session.commit()
+
+        as_of = START + timedelta(days=days - 1, hours=18)
+        assert get_balance_as_of(session, None, as_of) == full_scan_balances(session, as_of)
+        return {
+            "movements": size,
+            "snapshot_ms": timed(lambda: get_balance_as_of(session, None, as_of), repeat),
+            "single_product_ms": timed(lambda: get_balance_as_of(session, 1, as_of), repeat),
+            "full_scan_ms": timed(lambda: full_scan_balances(session, as_of), repeat),
+        }
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare snapshot + delta balance lookups with a full ledger scan."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--products", type=int, default=1_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'movements':>12} {'snapshot+delta ms':>18} {'one product ms':>15} {'full scan ms':>13}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            result = run(size, args.products, args.days, args.repeat, args.seed, Path(workdir))
+            print(
+                f"{result['movements']:>12} {result['snapshot_ms']:>18.2f} "
+                f"{result['single_product_ms']:>15.2f} {result['full_scan_ms']:>13.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import io
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401
+from app.db.base import Base
+from app.models.product import Product
+from app.models.user import User
+from app.services.movements import bulk_create_movements, parse_movement_rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time bulk movement ingestion on SQLite.")
+    parser.add_argument("--movements", type=int, default=10_000)
+    parser.add_argument("--products", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    lines = "".join(
+        f'{{"product_id": {index % args.products + 1}, "movement_type": "IN", "quantity": 1}}\n'
+        for index in range(args.movements)
+    )
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_engine(f"sqlite:///{Path(workdir) / 'bulk.db'}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        session.execute(insert(User), [{"id": 1, "email": "bench@example.com", "hashed_password": "-"}])
+        session.execute(
+            insert(Product),
+            [{"id": index + 1, "name": f"Product {index + 1}", "unit": "pcs"} for index in range(args.products)],
+        )
+        session.commit()
+
+        for run in range(args.repeat):
+            started = time.perf_counter()
+            result = bulk_create_movements(
+                session, parse_movement_rows(io.StringIO(lines), ndjson=True), created_by=1
+            )
+            session.commit()
+            elapsed = time.perf_counter() - started
+            print(
+                f"run {run + 1}: {result.created} movements in {elapsed:.3f}s "
+                f"({result.created / elapsed:,.0f}/s)"
+            )
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+API_PATHS = ("/api/stock/overview?limit=50", "/api/stock/low/count", "/api/ping")
+PASSWORD = "shift-start"
+
+
+def populate(database_url: str, users: int, products: int, iterations: int) -> None:
+    import app.models  # noqa: F401
+    from app.core.security import hash_password
+    from app.db.base import Base
+    from app.models.product import Product
+    from app.models.user import User
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    hashed = hash_password(PASSWORD, iterations)
+    session.execute(
+        insert(User),
+        [
+            {"id": index + 1, "email": f"user{index + 1}@example.com", "hashed_password": hashed}
+            for index in range(users)
+        ],
+    )
+    session.execute(
+        insert(Product),
+        [
+            {"id": index + 1, "name": f"Product {index + 1}", "unit": "pcs", "min_stock": 10}
+            for index in range(products)
+        ],
+    )
+    session.commit()
+    session.close()
+    engine.dispose()
+
+
+async def run_storm(
+    users: int, logins: int, api_concurrency: int, duration: float
+) -> tuple[list[float], dict[int, int]]:
+    import httpx
+
+    from app.core.jwt import create_access_token
+    from app.core.password_pool import stop_password_pool
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    deadline = time.perf_counter() + duration
+    api_timings: list[float] = []
+    login_statuses: dict[int, int] = {}
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        token = create_access_token("1")
+
+        async def login_worker(worker: int) -> None:
+            index = worker
+            while time.perf_counter() < deadline:
+                email = f"user{index % users + 1}@example.com"
+                response = await client.post(
+                    "/api/auth/login", json={"email": email, "password": PASSWORD}
+                )
+                status = response.status_code
+                login_statuses[status] = login_statuses.get(status, 0) + 1
+                if response.status_code == 429:
+                    await asyncio.sleep(float(response.headers.get("retry-after", "1")))
+                index += logins
+
+        async def api_worker(worker: int) -> None:
+            index = worker
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await client.get(
+                    API_PATHS[index % len(API_PATHS)], cookies={"access_token": token}
+                )
+                response.raise_for_status()
+                api_timings.append(time.perf_counter() - started)
+                index += 1
+
+        await asyncio.gather(
+            *(login_worker(worker) for worker in range(logins)),
+            *(api_worker(worker) for worker in range(api_concurrency)),
+        )
+    stop_password_pool()
+    return api_timings, login_statuses
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[max(int(len(ordered) * fraction) - 1, 0)]
+
+
+def report(mode: str, timings: list[float], statuses: dict[int, int], duration: float) -> None:
+    ordered = sorted(timings) or [0.0]
+    logins = ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items()))
+    print(
+        f"{mode}: API {len(timings) / duration:,.0f} req/s, "
+        f"p50 {percentile(ordered, 0.5) * 1000:.1f} ms, "
+        f"p99 {percentile(ordered, 0.99) * 1000:.1f} ms; logins {{{logins}}}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure API latency while a burst of logins hashes passwords."
+    )
+    parser.add_argument("--mode", choices=["both", "threads", "pool"], default="both")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=40, help="concurrent login clients")
+    parser.add_argument("--api-concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--iterations", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--products", type=int, default=2000)
+    args = parser.parse_args()
+
+    if args.mode != "both":
+        timings, statuses = asyncio.run(
+            run_storm(args.users, args.logins, args.api_concurrency, args.duration)
+        )
+        report(args.mode, timings, statuses, args.duration)
+        return
+
+    with tempfile.TemporaryDirectory() as workdir:
+        database_url = f"sqlite:///{Path(workdir) / 'logins.db'}"
+        populate(database_url, args.users, args.products, args.iterations)
+        for mode, workers, queue in (
+            ("threads", 0, args.logins),
+            ("pool", args.workers, args.workers * 4),
+        ):
+            env = {
+                **os.environ,
+                "DATABASE_URL": database_url,
+                "PASSWORD_HASH_ITERATIONS": str(args.iterations),
+                "PASSWORD_HASH_WORKERS": str(workers),
+                "PASSWORD_HASH_QUEUE": str(queue),
+            }
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.login_storm",
+                    "--mode",
+                    mode,
+                    "--users",
+                    str(args.users),
+                    "--logins",
+                    str(args.logins),
+                    "--api-concurrency",
+                    str(args.api_concurrency),
+                    "--duration",
+                    str(args.duration),
+                ],
+                env=env,
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
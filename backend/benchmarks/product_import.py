@@ -0,0 +1,60 @@
+import argparse
+import io
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401
+from app.db.base import Base
+from app.models.user import User
+from app.services.product_import import import_products
+
+
+HEADER = "id,name,unit,min_stock,low_stock_enabled,is_active,created_at,balance\n"
+
+
+def build_csv(products: int, seed: int) -> str:
+    rng = random.Random(seed)
+    units = ["pcs", "kg", "l", "box"]
+    lines = [HEADER]
+    for index in range(products):
+        lines.append(
+            f",Product {index},{rng.choice(units)},{rng.randint(0, 20)},True,True,,"
+            f"{rng.randint(0, 500)}\n"
+        )
+    return "".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure CSV product import throughput on SQLite.")
+    parser.add_argument("--products", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    content = build_csv(args.products, args.seed)
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_engine(f"sqlite:///{Path(workdir) / 'import.db'}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        session.execute(insert(User), [{"id": 1, "email": "bench@example.com", "hashed_password": "-"}])
+        session.commit()
+
+        for label in ("create", "update"):
+            started = time.perf_counter()
+            result = import_products(session, io.StringIO(content), created_by=1)
+            session.commit()
+            elapsed = time.perf_counter() - started
+            print(
+                f"{label}: {result.rows} rows ({result.created} created, {result.updated} updated) "
+                f"in {elapsed:.2f}s ({result.rows / elapsed:,.0f} rows/s)"
+            )
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401
+from app.core.config import settings
+from app.db.base import Base
+from app.models.product import Product
+from app.services.search import reset_search_backend, search_backend, search_products
+
+WORDS = [
+    "steel", "copper", "brass", "bolt", "screw", "washer", "pipe", "valve", "cable", "anchor",
+    "hinge", "bracket", "gasket", "flange", "nozzle", "filter", "sensor", "switch", "relay", "fuse",
+]
+
+
+def seed_products(session, products: int, seed: int) -> None:
+    rng = random.Random(seed)
+    rows = [
+        {
+            "name": f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {rng.randint(1, 999)}",
+            "unit": "pcs",
+            "min_stock": 0,
+            "low_stock_enabled": True,
+            "is_active": True,
+        }
+        for _ in range(products)
+    ]
+    for start in range(0, len(rows), 10_000):
+        session.execute(insert(Product.__table__), rows[start : start + 10_000])
+    session.commit()
+
+
+def measure(session, terms: list[str], repeat: int) -> list[float]:
+    timings = []
+    for _ in range(repeat):
+        for term in terms:
+            started = time.perf_counter()
+            search_products(session, term, limit=10)
+            timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare FTS5 and ILIKE product search on SQLite.")
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    terms = ["bolt", "copper pip", "gasket 12", "nozzle", "relay fu"]
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_engine(f"sqlite:///{Path(workdir) / 'search.db'}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        seed_products(session, args.products, args.seed)
+
+        for backend in ("auto", "ilike"):
+            settings.product_search_backend = backend
+            reset_search_backend()
+            backend = search_backend(session)
+            timings = measure(session, terms, args.repeat)
+            print(
+                f"{backend}: {args.products} products, median {statistics.median(timings):.2f} ms, "
+                f"max {max(timings):.2f} ms"
+            )
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401
+from app.db.base import Base
+from app.models.product import Product
+from app.models.stock_movement import StockMovement
+from app.models.user import User
+from app.services.balance import rebuild_balances
+
+
+PATHS = {
+    "overview": "/api/stock/overview?limit=200&include_total=false",
+    "movements": "/api/movements?limit=200&include_total=false",
+}
+ENCODINGS = ("identity", "gzip", "br")
+
+
+def populate(session, products: int, movements: int, seed: int) -> None:
+    rng = random.Random(seed)
+    session.execute(insert(User), [{"id": 1, "email": "bench@example.com", "hashed_password": "-"}])
+    session.execute(
+        insert(Product),
+        [
+            {"id": index + 1, "name": f"Product {index + 1}", "unit": "pcs", "min_stock": 10}
+            for index in range(products)
+        ],
+    )
+    session.execute(
+        insert(StockMovement),
+        [
+            {
+                "product_id": rng.randint(1, products),
+                "movement_type": "IN" if rng.random() < 0.6 else "OUT",
+                "quantity": rng.randint(1, 20),
+                "note": "Delivery" if rng.random() < 0.3 else None,
+                "created_by": 1,
+            }
+            for _ in range(movements)
+        ],
+    )
+    rebuild_balances(session)
+    session.commit()
+
+
+async def measure(client, path: str, encoding: str, iterations: int) -> tuple[list[float], int]:
+    headers = {"Accept-Encoding": encoding}
+    for _ in range(20):
+        await client.get(path, headers=headers)
+    timings = []
+    size = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        response = await client.get(path, headers=headers)
+        timings.append(time.perf_counter() - started)
+        response.raise_for_status()
+        size = response.num_bytes_downloaded
+    return timings, size
+
+
+async def run(session_factory, iterations: int) -> None:
+    import httpx
+
+    from app.core.jwt import create_access_token
+    from app.db.deps import get_db
+    from app.main import app
+
+    def get_bench_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = get_bench_db
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://bench",
+        cookies={"access_token": create_access_token("1")},
+    ) as client:
+        for label, path in PATHS.items():
+            for encoding in ENCODINGS:
+                timings, size = await measure(client, path, encoding, iterations)
+                print(
+                    f"{label} [{encoding}]: {statistics.mean(timings) * 1000:.2f} ms/request, "
+                    f"{size:,} bytes"
+                )
+    app.dependency_overrides.clear()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure response time and bytes on the wire for 200-item list pages."
+    )
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--movements", type=int, default=20_000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_engine(f"sqlite:///{Path(workdir) / 'serialization.db'}")
+        Base.metadata.create_all(engine)
+        session_factory = sessionmaker(bind=engine)
+        with session_factory() as session:
+            populate(session, args.products, args.movements, args.seed)
+        asyncio.run(run(session_factory, args.iterations))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
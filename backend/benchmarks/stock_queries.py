@@ -0,0 +1,110 @@
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401
+from app.api.export import export_stock_overview
+from app.api.stock import low_stock_count, stock_overview
+from app.db.base import Base
+from app.models.product import Product
+from app.models.product_balance import ProductBalance
+
+
+OVERVIEW_DEFAULTS = dict(
+    search=None,
+    low_stock_only=False,
+    active_only=True,
+    sort_by="name",
+    sort_dir="asc",
+    low_stock_first=False,
+    as_of=None,
+    skip=0,
+    limit=50,
+    cursor=None,
+    include_total=True,
+)
+
+
+async def drain(response) -> None:
+    async for _ in response.body_iterator:
+        pass
+
+
+def scenarios(session, loop):
+    return {
+        "overview": lambda: stock_overview(db=session, **OVERVIEW_DEFAULTS),
+        "overview search": lambda: stock_overview(
+            db=session,
+            **{**OVERVIEW_DEFAULTS, "search": "Product 1", "low_stock_first": True},
+        ),
+        "overview low stock": lambda: stock_overview(
+            db=session,
+            **{**OVERVIEW_DEFAULTS, "low_stock_only": True, "sort_by": "balance"},
+        ),
+        "low stock count": lambda: low_stock_count(db=session),
+        "export": lambda: loop.run_until_complete(
+            drain(
+                export_stock_overview(
+                    search=None,
+                    low_stock_only=False,
+                    active_only=True,
+                    sort_by="name",
+                    sort_dir="asc",
+                    low_stock_first=False,
+                    as_of=None,
+                    db=session,
+                )
+            )
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure per-request Python overhead of the stock overview queries."
+    )
+    parser.add_argument("--products", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_engine(f"sqlite:///{Path(workdir) / 'queries.db'}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        session.execute(
+            insert(Product),
+            [
+                {"id": index + 1, "name": f"Product {index + 1}", "unit": "pcs", "min_stock": 5}
+                for index in range(args.products)
+            ],
+        )
+        session.execute(
+            insert(ProductBalance),
+            [
+                {"product_id": index + 1, "in_sum": index, "out_sum": 0, "balance": index}
+                for index in range(args.products)
+            ],
+        )
+        session.commit()
+
+        loop = asyncio.new_event_loop()
+        for label, call in scenarios(session, loop).items():
+            for _ in range(50):
+                call()
+            started = time.perf_counter()
+            for _ in range(args.iterations):
+                call()
+            elapsed = time.perf_counter() - started
+            print(f"{label}: {elapsed / args.iterations * 1_000_000:,.0f} us/call")
+        loop.close()
+        session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,4 +2,5 @@
 set -e
 
 python -m app.scripts.init_db
+export DATABASE_STATEMENT_TIMEOUT_MS="${DATABASE_STATEMENT_TIMEOUT_MS:-30000}"
 exec uvicorn app.main:app --host 0.0.0.0 --port 8000
@@ -10,6 +10,8 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from app.core.auth import clear_user_cache
+from app.core.jwt import clear_token_cache
 from app.core.security import hash_password
 from app.db.base import Base
 from app.models.user import User
@@ -34,6 +36,8 @@ def clean_db():
         db.commit()
     finally:
         db.close()
+    clear_user_cache()
+    clear_token_cache()
     yield
 
 
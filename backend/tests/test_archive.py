@@ -0,0 +1,129 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert
+
+from app.api.export import export_movements
+from app.api.movements import list_movements
+from app.models.product import Product
+from app.models.stock_movement import StockMovement
+from app.models.stock_movement_archive import StockMovementArchive
+from app.services.archive import OPENING_BALANCE_NOTE, archive_movements
+from app.services.balance import find_balance_mismatches, get_balance_as_of, rebuild_balances
+
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def seed(db, user_id: int) -> None:
+    db.execute(
+        insert(Product),
+        [{"id": 1, "name": "Water", "unit": "pcs"}, {"id": 2, "name": "Salt", "unit": "kg"}],
+    )
+    db.execute(
+        insert(StockMovement),
+        [
+            {
+                "product_id": 1 + index % 2,
+                "movement_type": "OUT" if index % 4 == 3 else "IN",
+                "quantity": index + 1,
+                "created_by": user_id,
+                "created_at": START + timedelta(days=index),
+            }
+            for index in range(10)
+        ],
+    )
+    rebuild_balances(db)
+    db.commit()
+
+
+def list_all(db, start_at=None, end_at=None):
+    return list_movements(
+        product_id=None,
+        movement_type=None,
+        skip=0,
+        limit=200,
+        cursor=None,
+        include_total=True,
+        start_at=start_at,
+        end_at=end_at,
+        db=db,
+    )
+
+
+def export_lines(db, start_at) -> list[str]:
+    response = export_movements(start_at=start_at, end_at=None, db=db)
+
+    async def run() -> bytes:
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    return asyncio.run(run()).decode("utf-8-sig").splitlines()
+
+
+def test_archive_keeps_balances_and_history(db_session, admin_user):
+    seed(db_session, admin_user.id)
+    history = list_all(db_session)
+    before = {
+        day: get_balance_as_of(db_session, None, START + timedelta(days=day, hours=1))
+        for day in (2, 6, 9)
+    }
+
+    archive = archive_movements(db_session, START + timedelta(days=5), admin_user.id)
+    db_session.commit()
+
+    assert (archive.movements, archive.products) == (5, 2)
+    assert db_session.query(StockMovementArchive).count() == 5
+    live = db_session.query(StockMovement).order_by(StockMovement.created_at).all()
+    openings = [row for row in live if row.note == OPENING_BALANCE_NOTE]
+    assert [(row.product_id, row.movement_type, row.quantity) for row in openings] == [
+        (1, "IN", 9),
+        (2, "IN", 2),
+        (2, "OUT", 4),
+    ]
+    assert len(live) == 8
+    assert find_balance_mismatches(db_session) == []
+    for day, balances in before.items():
+        assert get_balance_as_of(db_session, None, START + timedelta(days=day, hours=1)) == (
+            balances
+        )
+
+    recent = list_all(db_session)
+    assert recent.total == 8
+    assert OPENING_BALANCE_NOTE in {item.note for item in recent.items}
+
+    full = list_all(db_session, start_at=START)
+    assert full.total == 10
+    assert [item.id for item in full.items] == [item.id for item in history.items]
+
+    window = list_all(
+        db_session, start_at=START + timedelta(days=3), end_at=START + timedelta(days=6)
+    )
+    assert [item.created_at.day for item in window.items] == [7, 6, 5, 4]
+    shifted = timezone(timedelta(hours=5))
+    window = list_all(
+        db_session,
+        start_at=(START + timedelta(days=3)).astimezone(shifted),
+        end_at=(START + timedelta(days=6)).astimezone(shifted),
+    )
+    assert [item.created_at.day for item in window.items] == [7, 6, 5, 4]
+
+    lines = export_lines(db_session, START + timedelta(days=1))
+    assert len(lines) == 10
+    assert OPENING_BALANCE_NOTE not in "".join(lines)
+    assert export_lines(db_session, (START + timedelta(days=1)).astimezone(shifted)) == lines
+
+
+def test_archive_can_move_the_cutoff_forward(db_session, admin_user):
+    seed(db_session, admin_user.id)
+    archive_movements(db_session, START + timedelta(days=3), admin_user.id)
+    db_session.commit()
+
+    assert archive_movements(db_session, START + timedelta(days=2), admin_user.id) is None
+    archive = archive_movements(db_session, START + timedelta(days=8), admin_user.id)
+    db_session.commit()
+
+    assert archive.movements == 5
+    assert db_session.query(StockMovementArchive).count() == 8
+    assert find_balance_mismatches(db_session) == []
+    assert get_balance_as_of(db_session, 2, START + timedelta(days=4, hours=1)) == 2 - 4
+    assert list_all(db_session, start_at=START).total == 10
@@ -0,0 +1,107 @@
+import asyncio
+import inspect
+import threading
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.api.async_mode import async_endpoint, async_router
+from app.api.export import router as export_router
+from app.api.movements import router as movements_router
+from app.api.products import router as products_router
+from app.api.settings import router as settings_router
+from app.api.stock import router as stock_router
+from app.core.jwt import create_access_token
+from app.db.base import Base
+from app.db.deps import get_async_db
+from app.models.user import User
+
+
+def build_async_app(database_url: str) -> FastAPI:
+    engine = create_async_engine(database_url, poolclass=NullPool)
+    session_factory = async_sessionmaker(engine, autoflush=False, info={"async": True})
+
+    async def prepare() -> None:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+            await connection.execute(
+                insert(User), [{"id": 1, "email": "async@example.com", "hashed_password": "-"}]
+            )
+
+    asyncio.run(prepare())
+
+    async def get_test_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    routers = (export_router, movements_router, products_router, settings_router, stock_router)
+    for router in routers:
+        app.include_router(async_router(router), prefix="/api")
+    app.dependency_overrides[get_async_db] = get_test_db
+    return app
+
+
+def test_async_routes_share_sync_handlers(tmp_path):
+    app = build_async_app(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+    assert all(
+        inspect.iscoroutinefunction(route.endpoint)
+        for route in async_router(products_router).routes
+    )
+
+    client = TestClient(app)
+    client.cookies.set("access_token", create_access_token("1"))
+
+    product = client.post(
+        "/api/products", json={"name": "Rice", "unit": "kg", "min_stock": 4, "initial_stock": 10}
+    )
+    assert product.status_code == 201
+    product_id = product.json()["id"]
+
+    movement = client.post(
+        "/api/movements", json={"product_id": product_id, "movement_type": "OUT", "quantity": 3}
+    )
+    assert movement.status_code == 201
+    upload = client.post(
+        "/api/movements/bulk/upload",
+        content=f"product_id,movement_type,quantity\n{product_id},OUT,4\n",
+        headers={"content-type": "text/csv"},
+    )
+    assert upload.json()["created"] == 1
+
+    overview = client.get("/api/stock/overview")
+    assert [
+        (item["name"], item["balance"], item["low_stock"]) for item in overview.json()["items"]
+    ] == [("Rice", 3, True)]
+    searched = client.get("/api/stock/overview", params={"search": "ric", "sort_by": "balance"})
+    assert [item["name"] for item in searched.json()["items"]] == ["Rice"]
+
+    first = client.get("/api/movements", params={"limit": 2}).json()
+    assert first["total"] == 3
+    second = client.get(
+        "/api/movements", params={"limit": 2, "cursor": first["next_cursor"]}
+    ).json()
+    assert [item["quantity"] for item in first["items"] + second["items"]] == [4, 3, 10]
+    assert second["next_cursor"] is None
+
+    etag = {"If-None-Match": overview.headers["etag"]}
+    assert client.get("/api/stock/overview", headers=etag).status_code == 304
+    export = client.get("/api/export/movements.csv")
+    assert export.status_code == 200
+    assert export.text.count("\n") == 4
+    assert client.get("/api/settings").status_code == 200
+    assert TestClient(app).get("/api/stock/overview").status_code == 401
+
+
+def test_sync_handlers_without_async_session_leave_the_event_loop():
+    def handler(db=None) -> int:
+        return threading.get_ident()
+
+    async def run() -> tuple[int, int]:
+        return threading.get_ident(), await async_endpoint(handler)(db=None)
+
+    loop_thread, handler_thread = asyncio.run(run())
+    assert loop_thread != handler_thread
@@ -1,10 +1,20 @@
+import asyncio
+
 import pytest
 from fastapi import HTTPException, Response
 from starlette.requests import Request
 
-from app.api.auth import login
-from app.core.auth import get_current_user
-from app.core.jwt import create_access_token
+from app.api.auth import login, logout
+from app.core.auth import auth_cache_stats, get_current_user
+from app.core.config import settings
+from app.core.jwt import create_access_token, decode_access_token, token_cache_stats
+from app.core.password_pool import PasswordPool, PasswordPoolBusy, stop_password_pool
+from app.core.security import (
+    LEGACY_ITERATIONS,
+    hash_password,
+    password_needs_rehash,
+    verify_password,
+)
 from app.schemas.auth import LoginRequest
 
 
@@ -32,7 +42,7 @@ def test_get_current_user_requires_token(db_session):
 def test_login_and_current_user(db_session, admin_user):
     response = Response()
     payload = LoginRequest(email="admin@example.com", password="change-me")
-    token_response = login(payload=payload, response=response, db=db_session)
+    token_response = asyncio.run(login(payload=payload, response=response, db=db_session))
     assert token_response.access_token
     assert "set-cookie" in response.headers
 
@@ -40,3 +50,97 @@ def test_login_and_current_user(db_session, admin_user):
     request = make_request_with_cookie(token)
     current_user = get_current_user(request=request, db=db_session)
     assert current_user.email == "admin@example.com"
+
+
+def test_current_user_lookup_is_cached_and_invalidated(db_session, admin_user):
+    token = create_access_token(str(admin_user.id))
+
+    get_current_user(request=make_request_with_cookie(token), db=db_session)
+    before = auth_cache_stats()
+    request = make_request_with_cookie(token)
+    first = get_current_user(request=request, db=db_session)
+    second = get_current_user(request=request, db=db_session)
+    after = auth_cache_stats()
+
+    assert first is second
+    assert first.email == "admin@example.com"
+    assert after["db_hits"] == before["db_hits"]
+    assert after["cache_hits"] == before["cache_hits"] + 1
+
+    admin_user.is_active = False
+    db_session.commit()
+    with pytest.raises(HTTPException) as exc_info:
+        get_current_user(request=make_request_with_cookie(token), db=db_session)
+    assert exc_info.value.status_code == 401
+
+
+def test_login_upgrades_password_hash_iterations(db_session, admin_user, monkeypatch):
+    legacy = hash_password("change-me", LEGACY_ITERATIONS).split(":", 1)[1]
+    assert verify_password("change-me", legacy)
+    admin_user.hashed_password = legacy
+    db_session.commit()
+    monkeypatch.setattr(settings, "password_hash_iterations", 2_000)
+    assert password_needs_rehash(legacy)
+
+    payload = LoginRequest(email="admin@example.com", password="change-me")
+    try:
+        asyncio.run(login(payload=payload, response=Response(), db=db_session))
+        db_session.refresh(admin_user)
+        assert admin_user.hashed_password.startswith("2000:")
+        assert not password_needs_rehash(admin_user.hashed_password)
+
+        wrong = LoginRequest(email="admin@example.com", password="wrong")
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(login(payload=wrong, response=Response(), db=db_session))
+        assert exc_info.value.status_code == 401
+    finally:
+        stop_password_pool()
+
+
+def test_password_pool_sheds_when_queue_is_full():
+    pool = PasswordPool(workers=0, queue_limit=1)
+    hashed = hash_password("secret", 1_000)
+    try:
+        assert asyncio.run(pool.verify("secret", hashed))
+        pool.pending = 2
+        with pytest.raises(PasswordPoolBusy):
+            asyncio.run(pool.verify("secret", hashed))
+        assert pool.stats()["rejected"] == 1
+    finally:
+        pool.shutdown()
+
+
+def test_password_pool_replaces_broken_workers():
+    pool = PasswordPool(workers=1, queue_limit=1)
+    hashed = hash_password("secret", 1_000)
+    try:
+        assert asyncio.run(pool.verify("secret", hashed))
+        broken = pool.executor
+        for process in list(broken._processes.values()):
+            process.kill()
+            process.join()
+        assert asyncio.run(pool.verify("secret", hashed))
+        assert pool.executor is not broken
+        assert pool.stats()["pending"] == 0
+    finally:
+        pool.shutdown()
+
+
+def test_verified_tokens_are_cached_until_logout_revokes_them(db_session, admin_user):
+    token = create_access_token(str(admin_user.id))
+    assert token != create_access_token(str(admin_user.id))
+
+    before = token_cache_stats()
+    assert decode_access_token(token)["sub"] == str(admin_user.id)
+    assert decode_access_token(token)["sub"] == str(admin_user.id)
+    after = token_cache_stats()
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+    assert after["cached_tokens"] == 1
+
+    logout(request=make_request_with_cookie(token), response=Response())
+    assert token_cache_stats()["cached_tokens"] == 0
+    with pytest.raises(HTTPException) as exc_info:
+        get_current_user(request=make_request_with_cookie(token), db=db_session)
+    assert exc_info.value.status_code == 401
+    assert exc_info.value.detail == "Invalid token"
@@ -1,8 +1,19 @@
+from datetime import datetime, timedelta, timezone
+
 from app.api.movements import create_movement
-from app.api.products import create_product
+from app.api.products import create_product, delete_product
 from app.api.stock import stock_overview
+from app.models.product_balance import ProductBalance
+from app.models.stock_movement import StockMovement
 from app.schemas.movement import MovementCreate
 from app.schemas.product import ProductCreate
+from app.services.balance import (
+    find_balance_mismatches,
+    get_balance_as_of,
+    get_product_balance,
+    rebuild_balances,
+    take_snapshot,
+)
 
 
 def test_balance_calculation(db_session, admin_user):
@@ -55,3 +66,85 @@ def test_balance_calculation(db_session, admin_user):
     assert overview.total == 1
     assert len(overview.items) == 1
     assert overview.items[0].balance == 7
+
+
+def test_balance_table_tracks_ledger(db_session, admin_user):
+    product = create_product(
+        payload=ProductCreate(name="Flour", unit="kg", initial_stock=5),
+        db=db_session,
+        current_user=admin_user,
+    )
+    create_movement(
+        payload=MovementCreate(product_id=product.id, movement_type="OUT", quantity=2),
+        db=db_session,
+        current_user=admin_user,
+    )
+
+    balance = db_session.get(ProductBalance, product.id)
+    db_session.refresh(balance)
+    assert (balance.in_sum, balance.out_sum, balance.balance) == (5, 2, 3)
+    assert get_product_balance(db_session, product.id) == 3
+    assert find_balance_mismatches(db_session) == []
+
+    balance.balance = 100
+    db_session.commit()
+    mismatches = find_balance_mismatches(db_session)
+    assert [mismatch.product_id for mismatch in mismatches] == [product.id]
+
+    rebuild_balances(db_session)
+    db_session.commit()
+    assert find_balance_mismatches(db_session) == []
+    assert get_product_balance(db_session, product.id) == 3
+
+    delete_product(product_id=product.id, db=db_session)
+    assert db_session.get(ProductBalance, product.id) is None
+
+
+def test_balance_as_of_uses_snapshot_and_delta(db_session, admin_user):
+    product = create_product(
+        payload=ProductCreate(name="Rice", unit="kg"),
+        db=db_session,
+        current_user=admin_user,
+    )
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for day, (movement_type, quantity) in enumerate(
+        [("IN", 10), ("OUT", 4), ("IN", 7), ("OUT", 1)]
+    ):
+        db_session.add(
+            StockMovement(
+                product_id=product.id,
+                movement_type=movement_type,
+                quantity=quantity,
+                created_by=admin_user.id,
+                created_at=start + timedelta(days=day, hours=12),
+            )
+        )
+    db_session.commit()
+
+    expected = {1: 10, 2: 6, 3: 13, 4: 12}
+    for day, balance in expected.items():
+        as_of = start + timedelta(days=day)
+        assert get_balance_as_of(db_session, product.id, as_of) == balance
+
+    assert take_snapshot(db_session, start + timedelta(days=2)) == 1
+    assert take_snapshot(db_session, start + timedelta(days=2)) == 0
+    db_session.commit()
+
+    for day, balance in expected.items():
+        as_of = start + timedelta(days=day)
+        assert get_balance_as_of(db_session, product.id, as_of) == balance
+        assert get_balance_as_of(db_session, None, as_of) == {product.id: balance}
+
+    overview = stock_overview(
+        search=None,
+        low_stock_only=False,
+        active_only=True,
+        sort_by="name",
+        sort_dir="asc",
+        low_stock_first=False,
+        as_of=datetime.now(timezone.utc),
+        skip=0,
+        limit=50,
+        db=db_session,
+    )
+    assert overview.items[0].balance == 12
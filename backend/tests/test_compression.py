@@ -0,0 +1,54 @@
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, accepted_encodings
+
+
+def build_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/large")
+    def large():
+        return {"items": [{"id": index, "name": f"Product {index}"} for index in range(200)]}
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/events")
+    def events():
+        return PlainTextResponse("data: x\n\n" * 500, media_type="text/event-stream")
+
+    return TestClient(app)
+
+
+def test_accepted_encodings_honours_quality_values():
+    assert accepted_encodings("gzip, br;q=0.5") == {"gzip", "br"}
+    assert accepted_encodings("br;q=0, gzip") == {"gzip"}
+    assert accepted_encodings("") == set()
+
+
+def test_compression_prefers_brotli_and_skips_small_bodies():
+    client = build_client()
+    expected = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in expected.headers
+
+    compressed = client.get("/large", headers={"Accept-Encoding": "gzip, br"})
+    assert compressed.headers["content-encoding"] == "br"
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert int(compressed.headers["content-length"]) < len(expected.content)
+    assert compressed.json() == expected.json()
+
+    zipped = client.get("/large", headers={"Accept-Encoding": "gzip, br;q=0"})
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.json() == expected.json()
+
+    small = client.get("/small", headers={"Accept-Encoding": "br"})
+    assert "content-encoding" not in small.headers
+    assert small.json() == {"ok": True}
+
+    events = client.get("/events", headers={"Accept-Encoding": "br"})
+    assert "content-encoding" not in events.headers
+
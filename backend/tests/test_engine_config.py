@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, text
+
+from app.api.admin import admin_stats
+from app.core.config import settings
+from app.db.session import async_database_url, configure_engine, engine_options, pool_stats
+
+
+def test_sqlite_file_engine_is_tuned_for_concurrent_writers(tmp_path):
+    url = f"sqlite:///{tmp_path / 'tuned.db'}"
+    engine = configure_engine(create_engine(url, **engine_options(url)))
+    try:
+        with engine.connect() as connection:
+            assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert connection.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+            assert connection.exec_driver_sql("PRAGMA busy_timeout").scalar() == 5000
+            connection.execute(text("CREATE TABLE counter (value INTEGER)"))
+            connection.commit()
+
+        def write(value: int) -> None:
+            with engine.begin() as connection:
+                for offset in range(20):
+                    connection.execute(
+                        text("INSERT INTO counter (value) VALUES (:value)"),
+                        {"value": value * 100 + offset},
+                    )
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(write, range(8)))
+
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT count(*) FROM counter")).scalar() == 160
+
+        stats = pool_stats(engine)
+        assert stats["pool"] == "QueuePool"
+        assert stats["size"] == 10
+        assert stats["checked_out"] == 0
+    finally:
+        engine.dispose()
+
+
+def test_postgres_engine_options_set_statement_timeout(monkeypatch):
+    assert "connect_args" not in engine_options("postgresql+psycopg://user:secret@db/stockcheck")
+
+    monkeypatch.setattr(settings, "database_statement_timeout_ms", 30000)
+    sync_options = engine_options("postgresql+psycopg://user:secret@db/stockcheck")
+    assert sync_options["connect_args"] == {"options": "-c statement_timeout=30000"}
+    assert sync_options["pool_size"] == 10
+    assert sync_options["pool_pre_ping"] is True
+
+    async_options = engine_options("postgresql+asyncpg://user:secret@db/stockcheck")
+    assert async_options["connect_args"] == {"server_settings": {"statement_timeout": "30000"}}
+
+
+def test_async_database_url_uses_installed_drivers():
+    assert async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    for url in ("postgresql://u:p@db/stock", "postgresql+psycopg2://u:p@db/stock"):
+        assert async_database_url(url) == "postgresql+psycopg://u:p@db/stock"
+
+
+def test_admin_stats_reports_pool_usage():
+    stats = admin_stats()
+    assert stats["database"]["sync"]["dialect"] == "sqlite"
+    assert "checked_out" in stats["database"]["sync"]
@@ -0,0 +1,145 @@
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.api.movements import router as movements_router
+from app.api.products import router as products_router
+from app.api.settings import router as settings_router
+from app.api.stock import router as stock_router
+from app.core.etag import etag_matches
+from app.core.jwt import create_access_token
+from app.db.base import Base
+from app.db import changes
+from app.db.changes import SETTINGS_VERSION, STOCK_VERSION, current_version, version_tag
+from app.db.deps import get_db
+from app.models.product import Product
+
+
+def build_client(db_session, admin_user) -> TestClient:
+    app = FastAPI()
+    for router in (movements_router, products_router, settings_router, stock_router):
+        app.include_router(router, prefix="/api")
+
+    def get_test_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = get_test_db
+    client = TestClient(app)
+    client.cookies.set("access_token", create_access_token(str(admin_user.id)))
+    return client
+
+
+def test_etag_matches_weak_and_strong_forms():
+    assert etag_matches('W/"stock-3"', 'W/"stock-3"')
+    assert etag_matches('"other", "stock-3"', 'W/"stock-3"')
+    assert etag_matches("*", 'W/"stock-3"')
+    assert not etag_matches('W/"stock-2"', 'W/"stock-3"')
+    assert not etag_matches(None, 'W/"stock-3"')
+
+
+def test_list_endpoints_return_304_until_data_changes(db_session, admin_user):
+    client = build_client(db_session, admin_user)
+    paths = ("/api/stock/overview", "/api/products", "/api/movements")
+
+    tags = {}
+    for path in paths:
+        response = client.get(path)
+        assert response.status_code == 200
+        tags[path] = response.headers["etag"]
+        unchanged = client.get(path, headers={"If-None-Match": tags[path]})
+        assert unchanged.status_code == 304
+        assert unchanged.content == b""
+        assert unchanged.headers["etag"] == tags[path]
+
+    product = client.post("/api/products", json={"name": "Tea", "unit": "box", "initial_stock": 3})
+    assert product.status_code == 201
+    for path in paths:
+        response = client.get(path, headers={"If-None-Match": tags[path]})
+        assert response.status_code == 200
+        assert response.headers["etag"] != tags[path]
+        tags[path] = response.headers["etag"]
+
+    movement = client.post(
+        "/api/movements",
+        json={"product_id": product.json()["id"], "movement_type": "OUT", "quantity": 1},
+    )
+    assert movement.status_code == 201
+    overview = client.get("/api/stock/overview", headers={"If-None-Match": tags[paths[0]]})
+    assert overview.status_code == 200
+    assert overview.json()["items"][0]["balance"] == 2
+
+    client.get("/api/settings")
+    tag = client.get("/api/settings").headers["etag"]
+    assert client.get("/api/settings", headers={"If-None-Match": tag}).status_code == 304
+    assert client.get("/api/stock/overview", headers={"If-None-Match": tag}).status_code == 200
+    client.put("/api/settings", json={"popup_cooldown_hours": 6})
+    refreshed = client.get("/api/settings", headers={"If-None-Match": tag})
+    assert refreshed.status_code == 200
+    assert refreshed.json()["popup_cooldown_hours"] == 6
+
+
+def test_failed_version_bumps_change_the_tag_and_are_retried(db_session, monkeypatch):
+    monkeypatch.setattr(changes, "_version_epochs", {})
+    monkeypatch.setattr(changes, "BUMP_RETRY_SECONDS", 0)
+    attempts = []
+
+    def unavailable(connection, scope):
+        attempts.append(scope)
+        raise OperationalError("UPDATE data_versions", {}, Exception("connection lost"))
+
+    monkeypatch.setattr(changes, "_upsert_version", unavailable)
+    version = current_version(db_session, STOCK_VERSION)
+    tag = version_tag(db_session, STOCK_VERSION)
+    db_session.commit()
+
+    changes._bump_committed_versions(db_session.get_bind(), [STOCK_VERSION])
+    assert attempts == [STOCK_VERSION] * changes.BUMP_ATTEMPTS
+    assert current_version(db_session, STOCK_VERSION) == version
+    invalidated = version_tag(db_session, STOCK_VERSION)
+    assert invalidated != tag
+    db_session.commit()
+
+    monkeypatch.setattr(changes, "_upsert_version", changes.bump_version)
+    changes._bump_committed_versions(db_session.get_bind(), [SETTINGS_VERSION])
+    assert current_version(db_session, STOCK_VERSION) == version + 1
+    assert version_tag(db_session, STOCK_VERSION) not in (tag, invalidated)
+    assert not changes._unbumped_scopes
+
+
+@pytest.mark.skipif(
+    not os.getenv("TEST_POSTGRES_URL"), reason="set TEST_POSTGRES_URL to check version bumps"
+)
+def test_postgres_versions_are_bumped_after_commit():
+    engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    try:
+        with factory() as db:
+            before = current_version(db, STOCK_VERSION)
+        with factory() as db:
+            db.add(Product(name="Versioned", unit="pcs"))
+            db.flush()
+            event.listen(db.connection(), "before_cursor_execute", record)
+            db.commit()
+        assert not any("data_versions" in statement for statement in statements)
+        with factory() as db:
+            assert current_version(db, STOCK_VERSION) == before + 1
+            db.add(Product(name="Discarded", unit="pcs"))
+            db.flush()
+            db.rollback()
+        with factory() as db:
+            assert current_version(db, STOCK_VERSION) == before + 1
+            db.query(Product).filter(Product.name == "Versioned").delete()
+            db.commit()
+    finally:
+        engine.dispose()
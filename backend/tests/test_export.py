@@ -0,0 +1,101 @@
+import asyncio
+import os
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from app.api.export import export_movements, export_products, export_stock_overview
+from app.models.product import Product
+from app.models.stock_movement import StockMovement
+
+
+EXPORT_ROWS = int(os.environ.get("EXPORT_TEST_ROWS", "50000"))
+PEAK_MEMORY_LIMIT = 8 * 1024 * 1024
+
+
+def consume(response) -> tuple[int, int]:
+    async def run() -> tuple[int, int]:
+        lines = 0
+        size = 0
+        async for chunk in response.body_iterator:
+            lines += chunk.count(b"\n")
+            size += len(chunk)
+        return lines, size
+
+    return asyncio.run(run())
+
+
+def seed_movements(db, user_id: int) -> None:
+    db.execute(insert(Product), [{"id": 1, "name": "Water", "unit": "pcs"}])
+    started = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    batch = []
+    for index in range(EXPORT_ROWS):
+        batch.append(
+            {
+                "product_id": 1,
+                "movement_type": "IN" if index % 3 else "OUT",
+                "quantity": index % 50 + 1,
+                "note": "Delivery",
+                "created_by": user_id,
+                "created_at": started + timedelta(seconds=index),
+            }
+        )
+        if len(batch) == 10_000:
+            db.execute(insert(StockMovement), batch)
+            batch.clear()
+    if batch:
+        db.execute(insert(StockMovement), batch)
+
+
+def seed_products(db, user_id: int) -> None:
+    for start in range(0, EXPORT_ROWS, 10_000):
+        db.execute(
+            insert(Product),
+            [
+                {"id": index + 1, "name": f"Product {index + 1:06d}", "unit": "pcs"}
+                for index in range(start, min(start + 10_000, EXPORT_ROWS))
+            ],
+        )
+
+
+EXPORTS = {
+    "movements.csv": (
+        seed_movements,
+        lambda db: export_movements(start_at=None, end_at=None, db=db),
+    ),
+    "products.csv": (seed_products, lambda db: export_products(db=db)),
+    "stock_overview.csv": (
+        seed_products,
+        lambda db: export_stock_overview(
+            search=None,
+            low_stock_only=False,
+            active_only=True,
+            sort_by="name",
+            sort_dir="asc",
+            low_stock_first=False,
+            as_of=None,
+            db=db,
+        ),
+    ),
+}
+
+
+@pytest.mark.parametrize("export", list(EXPORTS))
+def test_export_streams_with_bounded_memory(db_session, admin_user, export):
+    seed, build_response = EXPORTS[export]
+    seed(db_session, admin_user.id)
+    db_session.commit()
+
+    tracemalloc.start()
+    try:
+        response = build_response(db_session)
+        lines, size = consume(response)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert lines == EXPORT_ROWS + 1
+    assert size > PEAK_MEMORY_LIMIT // 4
+    assert peak < PEAK_MEMORY_LIMIT
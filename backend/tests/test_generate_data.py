@@ -0,0 +1,51 @@
+from collections import Counter
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.models.product import Product
+from app.models.stock_movement import StockMovement
+from app.scripts.generate_data import DEFAULT_END, generate
+from app.services.balance import find_balance_mismatches
+
+
+def ledger(engine) -> list[tuple]:
+    with Session(engine) as db:
+        return db.execute(
+            select(
+                StockMovement.id,
+                StockMovement.product_id,
+                StockMovement.movement_type,
+                StockMovement.quantity,
+                StockMovement.created_at,
+            ).order_by(StockMovement.id)
+        ).all()
+
+
+def test_generate_data_is_deterministic_and_consistent(tmp_path):
+    engines = [create_engine(f"sqlite:///{tmp_path / f'run{index}.db'}") for index in range(2)]
+    try:
+        for engine in engines:
+            generate(engine, products=50, movements=3000, seed=7, years=2, batch_size=700)
+        first, second = (ledger(engine) for engine in engines)
+        assert first == second
+        assert len(first) == 3000
+
+        created = [row.created_at for row in first]
+        assert created == sorted(created)
+        assert (created[-1] - created[0]).days > 700
+        assert created[-1] <= DEFAULT_END
+
+        popularity = Counter(row.product_id for row in first).most_common()
+        assert popularity[0][1] > 10 * popularity[len(popularity) // 2][1]
+        types = Counter(row.movement_type for row in first)
+        assert types["OUT"] > types["IN"] > 0
+
+        with Session(engines[0]) as db:
+            assert db.query(Product).count() == 50
+            assert find_balance_mismatches(db) == []
+
+        generate(engines[0], products=10, movements=100, seed=8)
+        assert len(ledger(engines[0])) == 3100
+    finally:
+        for engine in engines:
+            engine.dispose()
@@ -0,0 +1,181 @@
+from hypothesis import HealthCheck, given, settings, strategies as st
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.api.movements import create_movement, create_movements_bulk
+from app.api.products import create_product, delete_product, update_product
+from app.api.stock import stock_overview
+from app.db.changes import subscribe, unsubscribe
+from app.models.product import Product
+from app.models.product_balance import ProductBalance
+from app.schemas.movement import MovementBulkCreate, MovementCreate
+from app.schemas.product import ProductCreate, ProductUpdate
+from app.services.balance import rebuild_balances
+from app.services.inventory import InventoryIndex
+
+
+products_strategy = st.lists(
+    st.tuples(
+        st.text(alphabet="abc ", min_size=1, max_size=6),
+        st.integers(min_value=0, max_value=5),
+        st.booleans(),
+        st.booleans(),
+        st.one_of(st.none(), st.integers(min_value=-3, max_value=8)),
+    ),
+    max_size=25,
+)
+query_strategy = st.fixed_dictionaries(
+    {
+        "search": st.one_of(st.none(), st.text(alphabet="abc", min_size=1, max_size=3)),
+        "low_stock_only": st.booleans(),
+        "active_only": st.booleans(),
+        "sort_by": st.sampled_from(["name", "balance"]),
+        "sort_dir": st.sampled_from(["asc", "desc"]),
+        "low_stock_first": st.booleans(),
+        "skip": st.integers(min_value=0, max_value=4),
+        "limit": st.integers(min_value=1, max_value=6),
+        "include_total": st.booleans(),
+    }
+)
+
+
+def _sql_overview(db, cursor=None, **query):
+    return stock_overview(as_of=None, cursor=cursor, db=db, **query)
+
+
+def _seed(db, products) -> None:
+    db.execute(delete(ProductBalance))
+    db.execute(delete(Product))
+    for name, min_stock, low_stock_enabled, is_active, balance in products:
+        product_id = db.execute(
+            insert(Product).returning(Product.id),
+            {
+                "name": name,
+                "unit": "pcs",
+                "min_stock": min_stock,
+                "low_stock_enabled": low_stock_enabled,
+                "is_active": is_active,
+            },
+        ).scalar_one()
+        if balance is not None:
+            db.add(ProductBalance(product_id=product_id, in_sum=0, out_sum=0, balance=balance))
+    db.commit()
+
+
+@settings(max_examples=60, deadline=None, suppress_health_check=[HealthCheck.function_scoped_fixture])
+@given(products=products_strategy, query=query_strategy)
+def test_inventory_index_matches_sql(db_session, products, query):
+    _seed(db_session, products)
+    index = InventoryIndex(sessionmaker(bind=db_session.get_bind()))
+    index.load()
+
+    expected = _sql_overview(db_session, **query)
+    assert index.overview(**query) == expected
+
+    cursor = expected.next_cursor
+    while cursor:
+        expected = _sql_overview(db_session, cursor=cursor, **query)
+        assert index.overview(cursor=cursor, **query) == expected
+        cursor = expected.next_cursor
+
+
+MIXED_NAMES = [
+    "apple",
+    "Banana",
+    "Äpfel",
+    "b_x",
+    "bax",
+    "100% Juice",
+    "banana split",
+    "Éclair",
+    "éclair",
+    "zebra",
+    "Zebra",
+]
+
+
+def test_inventory_index_matches_sql_for_mixed_names(db_session):
+    _seed(db_session, [(name, 3, True, True, len(name) % 5) for name in MIXED_NAMES])
+    index = InventoryIndex(sessionmaker(bind=db_session.get_bind()))
+    index.load()
+
+    for search in (None, "an", "AN", "ban", "_", "%", "éc", "ÉCL"):
+        for sort_by in ("name", "balance"):
+            for sort_dir in ("asc", "desc"):
+                for low_stock_first in (False, True):
+                    query = dict(
+                        search=search,
+                        low_stock_only=False,
+                        active_only=False,
+                        sort_by=sort_by,
+                        sort_dir=sort_dir,
+                        low_stock_first=low_stock_first,
+                        skip=0,
+                        limit=2,
+                        include_total=True,
+                    )
+                    expected = _sql_overview(db_session, **query)
+                    assert index.overview(**query) == expected
+                    sql_cursor = index_cursor = expected.next_cursor
+                    while sql_cursor:
+                        from_sql = _sql_overview(db_session, cursor=index_cursor, **query)
+                        from_index = index.overview(cursor=sql_cursor, **query)
+                        assert from_index == from_sql
+                        sql_cursor, index_cursor = from_sql.next_cursor, from_index.next_cursor
+
+
+def test_inventory_index_follows_commits(db_session, admin_user):
+    index = InventoryIndex(sessionmaker(bind=db_session.get_bind()))
+    index.load()
+    subscribe(index.on_commit)
+    try:
+        first = create_product(
+            payload=ProductCreate(name="Flour", unit="kg", min_stock=5, initial_stock=10),
+            db=db_session,
+            current_user=admin_user,
+        )
+        second = create_product(
+            payload=ProductCreate(name="Yeast", unit="g", min_stock=2, initial_stock=1),
+            db=db_session,
+            current_user=admin_user,
+        )
+        create_movement(
+            payload=MovementCreate(product_id=first.id, movement_type="OUT", quantity=7),
+            db=db_session,
+            current_user=admin_user,
+        )
+        create_movements_bulk(
+            payload=MovementBulkCreate(
+                items=[{"product_id": second.id, "movement_type": "IN", "quantity": 4}]
+            ),
+            db=db_session,
+            current_user=admin_user,
+        )
+        update_product(product_id=second.id, payload=ProductUpdate(name="Dry yeast"), db=db_session)
+
+        query = dict(
+            search=None,
+            low_stock_only=False,
+            active_only=True,
+            sort_by="balance",
+            sort_dir="asc",
+            low_stock_first=True,
+            skip=0,
+            limit=50,
+            include_total=True,
+        )
+        overview = index.overview(**query)
+        assert [(item.name, item.balance, item.low_stock) for item in overview.items] == [
+            ("Flour", 3, True),
+            ("Dry yeast", 5, False),
+        ]
+        assert overview == _sql_overview(db_session, **query)
+
+        delete_product(product_id=first.id, db=db_session)
+        db_session.execute(delete(ProductBalance))
+        rebuild_balances(db_session)
+        db_session.commit()
+        assert index.overview(**query) == _sql_overview(db_session, **query)
+        assert len(index) == 1
+    finally:
+        unsubscribe(index.on_commit)
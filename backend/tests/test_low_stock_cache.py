@@ -0,0 +1,62 @@
+from sqlalchemy.orm import sessionmaker
+
+from app.api.movements import create_movement
+from app.api.products import create_product, deactivate_product, delete_product, update_product
+from app.api.stock import low_stock_count
+from app.schemas.movement import MovementCreate
+from app.schemas.product import ProductCreate, ProductUpdate
+from app.services.low_stock import start_low_stock_cache, stop_low_stock_cache
+from app.services.stock_query import LOW_STOCK_COUNT
+
+
+def test_low_stock_cache_follows_commits(db_session, admin_user):
+    flour = create_product(
+        payload=ProductCreate(name="Flour", unit="kg", min_stock=5, initial_stock=10),
+        db=db_session,
+        current_user=admin_user,
+    )
+    cache = start_low_stock_cache(sessionmaker(bind=db_session.get_bind()))
+    try:
+
+        def assert_cached(expected_ids: set[int]) -> None:
+            assert cache.low_stock_ids() == expected_ids
+            assert low_stock_count(db=db_session) == {"count": len(expected_ids)}
+            assert db_session.execute(LOW_STOCK_COUNT).scalar_one() == len(expected_ids)
+
+        assert_cached(set())
+        salt = create_product(
+            payload=ProductCreate(name="Salt", unit="kg", min_stock=2),
+            db=db_session,
+            current_user=admin_user,
+        )
+        assert_cached({salt.id})
+
+        create_movement(
+            payload=MovementCreate(product_id=flour.id, movement_type="OUT", quantity=6),
+            db=db_session,
+            current_user=admin_user,
+        )
+        assert_cached({flour.id, salt.id})
+
+        update_product(product_id=flour.id, payload=ProductUpdate(min_stock=3), db=db_session)
+        assert_cached({salt.id})
+
+        update_product(
+            product_id=salt.id, payload=ProductUpdate(low_stock_enabled=False), db=db_session
+        )
+        assert_cached(set())
+
+        update_product(product_id=flour.id, payload=ProductUpdate(min_stock=4), db=db_session)
+        assert_cached({flour.id})
+
+        deactivate_product(product_id=flour.id, db=db_session)
+        assert_cached(set())
+
+        update_product(
+            product_id=salt.id, payload=ProductUpdate(low_stock_enabled=True), db=db_session
+        )
+        assert_cached({salt.id})
+        delete_product(product_id=salt.id, db=db_session)
+        assert_cached(set())
+    finally:
+        stop_low_stock_cache()
@@ -0,0 +1,143 @@
+import io
+import time
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from fastapi.testclient import TestClient
+
+from app.api.movements import create_movements_bulk
+from app.api.products import create_product
+from app.core.auth import get_current_user
+from app.db.deps import get_db
+from app.main import app
+from app.models.stock_movement import StockMovement
+from app.schemas.movement import MAX_BULK_ITEMS, MovementBulkCreate
+from app.schemas.product import ProductCreate
+from app.services.balance import find_balance_mismatches, get_product_balance
+from app.services.movements import bulk_create_movements, parse_movement_rows
+
+
+def make_product(db_session, admin_user, name="Beans"):
+    return create_product(
+        payload=ProductCreate(name=name, unit="kg"),
+        db=db_session,
+        current_user=admin_user,
+    )
+
+
+def test_bulk_atomic_rejects_whole_batch(db_session, admin_user):
+    product = make_product(db_session, admin_user)
+    payload = MovementBulkCreate(
+        items=[
+            {"product_id": product.id, "movement_type": "IN", "quantity": 5},
+            {"product_id": product.id + 100, "movement_type": "IN", "quantity": 1},
+        ]
+    )
+
+    with pytest.raises(HTTPException) as exc_info:
+        create_movements_bulk(payload=payload, db=db_session, current_user=admin_user)
+
+    assert exc_info.value.status_code == 422
+    assert exc_info.value.detail == [{"index": 1, "detail": "Product not found"}]
+    assert db_session.query(StockMovement).count() == 0
+
+
+def test_bulk_partial_accepts_valid_rows(db_session, admin_user):
+    first = make_product(db_session, admin_user, "Beans")
+    second = make_product(db_session, admin_user, "Lentils")
+    payload = MovementBulkCreate(
+        mode="partial",
+        items=[
+            {"product_id": first.id, "movement_type": "IN", "quantity": 5},
+            {"product_id": 999, "movement_type": "IN", "quantity": 1},
+            {"product_id": second.id, "movement_type": "IN", "quantity": 4},
+            {"product_id": first.id, "movement_type": "OUT", "quantity": 2},
+        ],
+    )
+
+    result = create_movements_bulk(payload=payload, db=db_session, current_user=admin_user)
+
+    assert (result.created, result.failed) == (3, 1)
+    assert result.errors[0].index == 1
+    assert get_product_balance(db_session, first.id) == 3
+    assert get_product_balance(db_session, second.id) == 4
+    assert find_balance_mismatches(db_session) == []
+
+
+def test_bulk_json_reports_invalid_rows_like_uploads(db_session, admin_user):
+    product = make_product(db_session, admin_user)
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_current_user] = lambda: admin_user
+    try:
+        response = TestClient(app).post(
+            "/api/movements/bulk",
+            json={
+                "mode": "partial",
+                "items": [
+                    {"product_id": product.id, "movement_type": "IN", "quantity": 6},
+                    {"product_id": product.id, "movement_type": "X", "quantity": 1},
+                    {"product_id": product.id, "movement_type": "OUT", "quantity": 0},
+                ],
+            },
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 201
+    assert response.json()["created"] == 1
+    assert [error["index"] for error in response.json()["errors"]] == [1, 2]
+    assert get_product_balance(db_session, product.id) == 6
+
+    with pytest.raises(ValidationError):
+        MovementBulkCreate(items=[{}] * (MAX_BULK_ITEMS + 1))
+
+
+def test_bulk_upload_csv_and_ndjson(db_session, admin_user):
+    product = make_product(db_session, admin_user)
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_current_user] = lambda: admin_user
+    try:
+        client = TestClient(app)
+        response = client.post(
+            "/api/movements/bulk/upload?mode=partial",
+            content=(
+                "product_id,movement_type,quantity,note\n"
+                f"{product.id},IN,10,Delivery\n"
+                f"{product.id},OUT,0,\n"
+            ),
+            headers={"Content-Type": "text/csv"},
+        )
+        assert response.status_code == 201
+        assert response.json()["created"] == 1
+        assert response.json()["errors"][0]["index"] == 1
+
+        response = client.post(
+            "/api/movements/bulk/upload",
+            content=f'{{"product_id": {product.id}, "movement_type": "OUT", "quantity": 3}}\n',
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert response.status_code == 201
+    finally:
+        app.dependency_overrides.clear()
+
+    assert get_product_balance(db_session, product.id) == 7
+
+
+def test_bulk_ingest_throughput(db_session, admin_user):
+    product = make_product(db_session, admin_user)
+    lines = "".join(
+        f'{{"product_id": {product.id}, "movement_type": "IN", "quantity": 1}}\n'
+        for _ in range(10_000)
+    )
+
+    started = time.perf_counter()
+    result = bulk_create_movements(
+        db_session, parse_movement_rows(io.StringIO(lines), ndjson=True), admin_user.id
+    )
+    db_session.commit()
+    elapsed = time.perf_counter() - started
+
+    assert result.created == 10_000
+    assert get_product_balance(db_session, product.id) == 10_000
+    assert elapsed < 5
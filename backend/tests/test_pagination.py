@@ -0,0 +1,110 @@
+import pytest
+from fastapi import HTTPException
+
+from app.api.movements import create_movement, list_movements
+from app.api.products import create_product
+from app.api.stock import stock_overview
+from app.schemas.movement import MovementCreate
+from app.schemas.product import ProductCreate
+
+
+def overview_page(db_session, **params):
+    defaults = {
+        "search": None,
+        "low_stock_only": False,
+        "active_only": True,
+        "sort_by": "name",
+        "sort_dir": "asc",
+        "low_stock_first": False,
+        "as_of": None,
+        "skip": 0,
+        "limit": 200,
+        "cursor": None,
+        "include_total": True,
+    }
+    defaults.update(params)
+    return stock_overview(db=db_session, **defaults)
+
+
+@pytest.mark.parametrize("sort_by", ["name", "balance"])
+@pytest.mark.parametrize("sort_dir", ["asc", "desc"])
+@pytest.mark.parametrize("low_stock_first", [False, True])
+def test_stock_overview_cursor_walk_matches_offset(
+    db_session, admin_user, sort_by, sort_dir, low_stock_first
+):
+    for index, stock in enumerate([4, 0, 9, 4, 2, 7, 4]):
+        create_product(
+            payload=ProductCreate(
+                name=f"Item {index % 3}",
+                unit="pcs",
+                min_stock=3,
+                initial_stock=stock,
+            ),
+            db=db_session,
+            current_user=admin_user,
+        )
+
+    params = {"sort_by": sort_by, "sort_dir": sort_dir, "low_stock_first": low_stock_first}
+    expected = [item.id for item in overview_page(db_session, **params).items]
+
+    seen = []
+    cursor = None
+    while True:
+        page = overview_page(
+            db_session, limit=3, cursor=cursor, include_total=False, **params
+        )
+        assert page.total is None
+        seen.extend(item.id for item in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen == expected
+
+
+def test_movements_cursor_walk_and_invalid_cursor(db_session, admin_user):
+    product = create_product(
+        payload=ProductCreate(name="Tea", unit="pcs"),
+        db=db_session,
+        current_user=admin_user,
+    )
+    for quantity in range(1, 6):
+        create_movement(
+            payload=MovementCreate(product_id=product.id, movement_type="IN", quantity=quantity),
+            db=db_session,
+            current_user=admin_user,
+        )
+
+    first = list_movements(
+        product_id=None, movement_type=None, skip=0, limit=2, cursor=None, db=db_session
+    )
+    assert first.total == 5
+    second = list_movements(
+        product_id=None,
+        movement_type=None,
+        skip=0,
+        limit=10,
+        cursor=first.next_cursor,
+        include_total=False,
+        db=db_session,
+    )
+    assert [item.quantity for item in first.items + second.items] == [5, 4, 3, 2, 1]
+    assert second.next_cursor is None
+
+    with pytest.raises(HTTPException) as exc_info:
+        overview_page(db_session, cursor=first.next_cursor)
+    assert exc_info.value.status_code == 400
+
+
+def test_stock_overview_empty_cursor_starts_from_first_page(db_session, admin_user):
+    for name in ("Cocoa", "Apples", "Bread"):
+        create_product(
+            payload=ProductCreate(name=name, unit="pcs"),
+            db=db_session,
+            current_user=admin_user,
+        )
+
+    page = overview_page(db_session, cursor="", limit=2)
+
+    assert [item.name for item in page.items] == ["Apples", "Bread"]
+    assert page.next_cursor is not None
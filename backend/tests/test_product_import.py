@@ -0,0 +1,76 @@
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.api.export import export_products
+from app.api.products import create_product
+from app.core.auth import get_current_user
+from app.db.deps import get_db
+from app.main import app
+from app.models.product import Product
+from app.models.stock_movement import StockMovement
+from app.schemas.product import ProductCreate
+from app.services.balance import find_balance_mismatches, get_product_balance
+
+
+def read_export(db_session) -> str:
+    response = export_products(db=db_session)
+
+    async def collect() -> bytes:
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    return asyncio.run(collect()).decode("utf-8-sig")
+
+
+def test_import_round_trips_products_export(db_session, admin_user):
+    create_product(
+        payload=ProductCreate(name="Oats", unit="kg", min_stock=2, initial_stock=8),
+        db=db_session,
+        current_user=admin_user,
+    )
+    create_product(
+        payload=ProductCreate(name="Honey", unit="jar", low_stock_enabled=False),
+        db=db_session,
+        current_user=admin_user,
+    )
+    exported = read_export(db_session)
+    updated = exported.replace("Oats,kg,2,", "Oats,kg,4,")
+    extra = "\n".join(
+        [
+            ",Syrup,bottle,1,True,True,,-3",
+            ",,bottle,1,True,True,,0",
+            ",Salt,kg,-1,True,True,,0",
+        ]
+    )
+
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_current_user] = lambda: admin_user
+    try:
+        response = TestClient(app).post(
+            "/api/import/products.csv",
+            content=(updated + extra + "\n").encode("utf-8-sig"),
+            headers={"Content-Type": "text/csv"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    summary = response.json()
+    assert (summary["rows"], summary["created"], summary["updated"], summary["failed"]) == (
+        5,
+        1,
+        2,
+        2,
+    )
+    assert [error["index"] for error in summary["errors"]] == [3, 4]
+
+    oats = db_session.query(Product).filter(Product.name == "Oats").one()
+    db_session.refresh(oats)
+    assert oats.min_stock == 4
+    assert get_product_balance(db_session, oats.id) == 8
+
+    syrup = db_session.query(Product).filter(Product.name == "Syrup").one()
+    assert get_product_balance(db_session, syrup.id) == -3
+    opening = db_session.query(StockMovement).filter(StockMovement.product_id == syrup.id).one()
+    assert (opening.movement_type, opening.quantity, opening.note) == ("OUT", 3, "Initial stock")
+    assert find_balance_mismatches(db_session) == []
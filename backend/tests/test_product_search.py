@@ -0,0 +1,47 @@
+from app.api.products import create_product, delete_product, search_product_names, update_product
+from app.schemas.product import ProductCreate, ProductUpdate
+from app.services.search import name_filter, search_backend
+from app.models.product import Product
+
+
+def _create(db_session, admin_user, name):
+    return create_product(
+        payload=ProductCreate(
+            name=name,
+            unit="pcs",
+            min_stock=0,
+            low_stock_enabled=True,
+            is_active=True,
+            initial_stock=0,
+        ),
+        db=db_session,
+        current_user=admin_user,
+    )
+
+
+def _names(db_session, term):
+    return sorted(p.name for p in db_session.query(Product).filter(name_filter(db_session, term)))
+
+
+def test_search_uses_fts_and_ranks_matches(db_session, admin_user):
+    assert search_backend(db_session) == "fts5"
+    for name in ["Steel bolt M8", "Bolt cutter", "Wood screw", "Anchor bolt"]:
+        _create(db_session, admin_user, name)
+
+    assert _names(db_session, "BOLT") == ["Anchor bolt", "Bolt cutter", "Steel bolt M8"]
+    assert _names(db_session, "wo") == ["Wood screw"]
+
+    results = search_product_names(q="bolt", limit=2, active_only=True, db=db_session)
+    assert len(results) == 2
+    assert all("bolt" in product.name.lower() for product in results)
+
+
+def test_search_index_follows_updates_and_deletes(db_session, admin_user):
+    product = _create(db_session, admin_user, "Copper pipe")
+    other = _create(db_session, admin_user, "Copper wire")
+
+    update_product(product_id=product.id, payload=ProductUpdate(name="Brass pipe"), db=db_session)
+    delete_product(product_id=other.id, db=db_session)
+
+    assert _names(db_session, "copper") == []
+    assert _names(db_session, "brass") == ["Brass pipe"]
@@ -0,0 +1,156 @@
+import asyncio
+import os
+import re
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.api.export import export_movements
+from app.api.movements import list_movements
+from app.db.base import Base
+from app.models.product import Product
+from app.models.stock_movement import StockMovement
+from app.services.balance import find_balance_mismatches, get_balance_as_of
+
+
+SQLITE_FORBIDDEN = (
+    re.compile(r"^SCAN stock_movements$"),
+    re.compile(r"USE TEMP B-TREE FOR (ORDER BY|RIGHT PART OF ORDER BY)"),
+)
+POSTGRES_FORBIDDEN = (re.compile(r"Seq Scan on stock_movements"),)
+
+
+@contextmanager
+def captured_queries(engine):
+    queries = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "stock_movements" in statement:
+            queries.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield queries
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def query_plan(connection, statement: str, parameters) -> list[str]:
+    if connection.dialect.name == "postgresql":
+        rows = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters).all()
+        return [row[0] for row in rows]
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return [row[-1] for row in rows]
+
+
+def drain(response) -> None:
+    async def run() -> None:
+        async for _ in response.body_iterator:
+            pass
+
+    asyncio.run(run())
+
+
+def run_hot_queries(db) -> None:
+    first_page = list_movements(
+        product_id=None,
+        movement_type=None,
+        skip=0,
+        limit=20,
+        cursor=None,
+        include_total=True,
+        db=db,
+    )
+    list_movements(
+        product_id=None,
+        movement_type=None,
+        skip=0,
+        limit=20,
+        cursor=first_page.next_cursor,
+        include_total=False,
+        db=db,
+    )
+    list_movements(
+        product_id=3,
+        movement_type=None,
+        skip=0,
+        limit=20,
+        cursor=None,
+        include_total=True,
+        db=db,
+    )
+    list_movements(
+        product_id=3,
+        movement_type="OUT",
+        skip=0,
+        limit=20,
+        cursor=None,
+        include_total=True,
+        db=db,
+    )
+    now = datetime.now(timezone.utc)
+    drain(export_movements(start_at=now - timedelta(days=2), end_at=now, db=db))
+    get_balance_as_of(db, 3, now - timedelta(days=1))
+    find_balance_mismatches(db)
+
+
+def seed_ledger(db, admin_user) -> None:
+    db.execute(
+        insert(Product),
+        [{"id": index, "name": f"P{index}", "unit": "pcs"} for index in range(1, 11)],
+    )
+    start = datetime.now(timezone.utc) - timedelta(days=5)
+    db.execute(
+        insert(StockMovement),
+        [
+            {
+                "product_id": index % 10 + 1,
+                "movement_type": "IN" if index % 3 else "OUT",
+                "quantity": index % 7 + 1,
+                "created_by": admin_user.id,
+                "created_at": start + timedelta(minutes=index),
+            }
+            for index in range(500)
+        ],
+    )
+    db.commit()
+
+
+def assert_index_served(db, queries, forbidden) -> None:
+    assert queries
+    connection = db.connection()
+    for statement, parameters in queries:
+        plan = query_plan(connection, statement, parameters)
+        offending = [line for line in plan for pattern in forbidden if pattern.search(line)]
+        assert not offending, f"{statement}\n" + "\n".join(plan)
+
+
+def test_ledger_queries_use_indexes(db_session, admin_user):
+    seed_ledger(db_session, admin_user)
+    with captured_queries(db_session.get_bind()) as queries:
+        run_hot_queries(db_session)
+    assert_index_served(db_session, queries, SQLITE_FORBIDDEN)
+
+
+@pytest.mark.skipif(
+    not os.getenv("TEST_POSTGRES_URL"), reason="set TEST_POSTGRES_URL to check Postgres plans"
+)
+def test_ledger_queries_use_indexes_on_postgres(admin_user):
+    engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        db.merge(admin_user)
+        seed_ledger(db, admin_user)
+        db.connection().exec_driver_sql("SET enable_seqscan = off")
+        with captured_queries(engine) as queries:
+            run_hot_queries(db)
+        assert_index_served(db, queries, POSTGRES_FORBIDDEN)
+    finally:
+        db.close()
+        Base.metadata.drop_all(engine)
+        engine.dispose()
@@ -0,0 +1,111 @@
+from contextlib import contextmanager
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.api.products import create_product, list_products
+from app.core.config import settings
+from app.core.jwt import create_access_token
+from app.db import session
+from app.db.base import Base
+from app.db.deps import get_db, get_read_db
+from app.db.routing import RECENT_WRITE_COOKIE
+from app.models.user import User
+from app.schemas.product import ProductCreate
+
+
+def make_request(user_id: int, *cookies: str) -> Request:
+    cookie = "; ".join([f"access_token={create_access_token(str(user_id))}", *cookies])
+    return Request(
+        {
+            "type": "http",
+            "headers": [(b"cookie", cookie.encode("utf-8"))],
+            "method": "GET",
+            "path": "/",
+            "query_string": b"",
+        }
+    )
+
+
+def make_database(path) -> sessionmaker:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(User),
+            [
+                {"id": 1, "email": "writer@example.com", "hashed_password": "-"},
+                {"id": 2, "email": "reader@example.com", "hashed_password": "-"},
+            ],
+        )
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def write_cookies(response: Response) -> list[str]:
+    return [
+        value.split(";", 1)[0]
+        for name, value in response.headers.items()
+        if name == "set-cookie" and value.startswith(f"{RECENT_WRITE_COOKIE}=")
+    ]
+
+
+@contextmanager
+def request_sessions(request: Request, response: Response | None = None):
+    primary = get_db(response if response is not None else Response())
+    db = next(primary)
+    reads = get_read_db(request, db)
+    try:
+        yield db, next(reads)
+    finally:
+        reads.close()
+        primary.close()
+
+
+def product_names(db) -> list[str]:
+    products = list_products(
+        search=None, skip=0, limit=50, cursor=None, include_total=False, db=db
+    )
+    return [product.name for product in products.items]
+
+
+def test_reads_use_replica_except_after_own_write(tmp_path, monkeypatch):
+    primary = make_database(tmp_path / "primary.db")
+    replica = make_database(tmp_path / "replica.db")
+    monkeypatch.setattr(session, "SessionLocal", primary)
+    monkeypatch.setattr(session, "ReadSessionLocal", replica)
+    try:
+        writer, reader, response = make_request(1), make_request(2), Response()
+        with request_sessions(writer, response) as (db, read_db):
+            assert read_db.get_bind() is replica.kw["bind"]
+            create_product(
+                payload=ProductCreate(name="Oats", unit="kg", min_stock=1),
+                db=db,
+                current_user=db.get(User, 1),
+            )
+
+        cookies = write_cookies(response)
+        assert len(cookies) == 1
+        with request_sessions(make_request(1, *cookies)) as (db, read_db):
+            assert read_db is db
+            assert product_names(read_db) == ["Oats"]
+        with request_sessions(make_request(1)) as (db, read_db):
+            assert read_db.get_bind() is replica.kw["bind"]
+
+        with request_sessions(reader) as (db, read_db):
+            assert read_db.get_bind() is replica.kw["bind"]
+            assert product_names(read_db) == []
+
+        expired = f"{RECENT_WRITE_COOKIE}=1.0"
+        with request_sessions(make_request(1, expired)) as (db, read_db):
+            assert read_db.get_bind() is replica.kw["bind"]
+
+        monkeypatch.setattr(settings, "database_read_your_writes_seconds", 0)
+        response = Response()
+        with request_sessions(make_request(1), response) as (db, read_db):
+            db.commit()
+        assert write_cookies(response) == []
+    finally:
+        primary.kw["bind"].dispose()
+        replica.kw["bind"].dispose()
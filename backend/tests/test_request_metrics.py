@@ -0,0 +1,107 @@
+import logging
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.api.admin import router as admin_router
+from app.api.products import router as products_router
+from app.api.stock import router as stock_router
+from app.core.config import settings
+from app.core.jwt import create_access_token
+from app.core.metrics import (
+    RequestMetrics,
+    RequestMetricsMiddleware,
+    RequestProfile,
+    _profile,
+    instrument_engine,
+)
+from app.db.deps import get_db
+from app.models.product import Product
+
+
+def test_request_metrics_time_routes_count_queries_and_flag_n_plus_one(
+    db_session, admin_user, caplog
+):
+    instrument_engine(db_session.get_bind())
+    metrics = RequestMetrics()
+    app = FastAPI()
+    app.add_middleware(
+        RequestMetricsMiddleware, metrics=metrics, slow_query_ms=60_000, n_plus_one_threshold=3
+    )
+    app.include_router(products_router, prefix="/api")
+    app.include_router(stock_router, prefix="/api")
+
+    @app.get("/api/names")
+    def names(db: Session = Depends(get_db)) -> list[str]:
+        ids = db.scalars(select(Product.id).order_by(Product.id)).all()
+        return [db.scalar(select(Product.name).where(Product.id == id_)) for id_ in ids]
+
+    def get_test_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = get_test_db
+    client = TestClient(app)
+    client.cookies.set("access_token", create_access_token(str(admin_user.id)))
+    for name in ("Flour", "Sugar", "Salt"):
+        assert client.post("/api/products", json={"name": name, "unit": "kg"}).status_code == 201
+
+    overview = client.get("/api/stock/overview")
+    timing = overview.headers["server-timing"]
+    assert timing.startswith("app;dur=")
+    assert 'db;dur=' in timing and 'queries"' in timing
+
+    with caplog.at_level(logging.WARNING, logger="app.core.metrics"):
+        assert client.get("/api/names").json() == ["Flour", "Sugar", "Salt"]
+    assert "Possible N+1 in GET /api/names: 3 executions" in caplog.text
+
+    text = metrics.render()
+    labels = 'method="GET",route="/api/stock/overview"'
+    assert f'stockcheck_request_duration_seconds_count{{{labels}}} 1' in text
+    assert f'stockcheck_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+    assert 'stockcheck_request_duration_seconds_count{method="POST",route="/api/products"} 3' in (
+        text
+    )
+    assert 'stockcheck_n_plus_one_total{method="GET",route="/api/names"} 1' in text
+    assert f"stockcheck_n_plus_one_total{{{labels}}} 0" in text
+    assert f"stockcheck_slow_queries_total{{{labels}}} 0" in text
+    queries = next(
+        line for line in text.splitlines() if line.startswith(f"stockcheck_db_queries_total{{{labels}")
+    )
+    assert int(queries.rsplit(" ", 1)[1]) > 0
+
+
+def test_request_profile_records_failed_statements(db_session):
+    instrument_engine(db_session.get_bind())
+    profile = RequestProfile(slow_query_seconds=60)
+    token = _profile.set(profile)
+    try:
+        with pytest.raises(OperationalError):
+            db_session.execute(text("SELECT * FROM missing_table"))
+        db_session.rollback()
+        db_session.execute(select(Product.id)).all()
+    finally:
+        _profile.reset(token)
+
+    assert profile.queries == 2
+    assert profile.statements["SELECT * FROM missing_table"] == 1
+
+
+def test_admin_endpoints_require_the_admin_token(admin_user, monkeypatch):
+    app = FastAPI()
+    app.include_router(admin_router, prefix="/api")
+    client = TestClient(app)
+    client.cookies.set("access_token", create_access_token(str(admin_user.id)))
+
+    assert client.get("/api/admin/metrics").status_code == 404
+
+    monkeypatch.setattr(settings, "admin_api_token", "scrape-secret")
+    assert client.get("/api/admin/metrics").status_code == 401
+    wrong = {"Authorization": "Bearer nope"}
+    assert client.get("/api/admin/stats", headers=wrong).status_code == 401
+    valid = {"Authorization": "Bearer scrape-secret"}
+    assert client.get("/api/admin/metrics", headers=valid).status_code == 200
+    assert "database" in client.get("/api/admin/stats", headers=valid).json()
@@ -0,0 +1,81 @@
+import gzip
+
+import brotli
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware
+from app.core.static_files import IMMUTABLE, REVALIDATE, StaticSite
+
+
+def build_client(directory) -> TestClient:
+    site = StaticSite(directory)
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=16)
+
+    @app.get("/{full_path:path}")
+    async def serve(full_path: str, request: Request):
+        return site.response(site.lookup(full_path), request)
+
+    return TestClient(app)
+
+
+def test_static_site_serves_precompressed_hashed_assets(tmp_path):
+    script = b"console.log('stock');" * 100
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "index.html").write_text("<!doctype html><div id=root></div>")
+    (tmp_path / "assets" / "index-B1x9QeKq.js").write_bytes(script)
+    (tmp_path / "assets" / "index-B1x9QeKq.js.br").write_bytes(brotli.compress(script))
+    (tmp_path / "assets" / "index-B1x9QeKq.js.gz").write_bytes(gzip.compress(script))
+    client = build_client(tmp_path)
+
+    response = client.get("/assets/index-B1x9QeKq.js", headers={"Accept-Encoding": "gzip, br"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["cache-control"] == IMMUTABLE
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["content-type"].startswith("text/javascript")
+    assert response.content == script
+
+    zipped = client.get("/assets/index-B1x9QeKq.js", headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.headers["etag"] != response.headers["etag"]
+    assert zipped.content == script
+
+    plain = client.get("/assets/index-B1x9QeKq.js", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.content == script
+
+    cached = client.get(
+        "/assets/index-B1x9QeKq.js",
+        headers={"Accept-Encoding": "br", "If-None-Match": response.headers["etag"]},
+    )
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["cache-control"] == IMMUTABLE
+
+    index = client.get("/products/12")
+    assert index.status_code == 200
+    assert index.headers["cache-control"] == REVALIDATE
+    assert "id=root" in index.text
+    revalidated = client.get("/", headers={"If-None-Match": index.headers["etag"]})
+    assert revalidated.status_code == 304
+
+
+def test_static_site_revalidates_unhashed_files_outside_assets(tmp_path):
+    (tmp_path / "index.html").write_text("<!doctype html>")
+    (tmp_path / "android-chrome-192x192.png").write_bytes(b"\x89PNG icon")
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets" / "logo-Dk3n1xQa.svg").write_text("<svg/>")
+    client = build_client(tmp_path)
+
+    icon = client.get("/android-chrome-192x192.png")
+    assert icon.status_code == 200
+    assert icon.headers["cache-control"] == REVALIDATE
+    assert client.get("/assets/logo-Dk3n1xQa.svg").headers["cache-control"] == IMMUTABLE
+
+
+def test_static_site_without_build_has_no_index(tmp_path):
+    site = StaticSite(tmp_path / "missing")
+    assert site.assets == {}
+    assert site.lookup("index.html") is None
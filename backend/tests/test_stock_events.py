@@ -0,0 +1,167 @@
+import asyncio
+import json
+import os
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.movements import create_movement, create_movements_bulk
+from app.api.products import create_product, deactivate_product
+from app.schemas.movement import MovementBulkCreate, MovementCreate
+from app.schemas.product import ProductCreate
+from app.services.stock_events import (
+    PostgresStockEventBroadcaster,
+    start_stock_events,
+    stop_stock_events,
+)
+
+
+def parse(chunk: bytes) -> tuple[str, str, dict]:
+    fields = dict(line.split(": ", 1) for line in chunk.decode().strip().split("\n"))
+    return fields["id"], fields["event"], json.loads(fields["data"])
+
+
+async def connected() -> bool:
+    return False
+
+
+def test_stock_events_publish_commits_and_resume(db_session, admin_user):
+    broadcaster = start_stock_events(sessionmaker(bind=db_session.get_bind()), "memory", 4)
+    try:
+
+        async def watch() -> tuple[int, list[tuple[str, str, dict]]]:
+            watcher = broadcaster.stream(None, connected, 5)
+            assert await anext(watcher) == b"retry: 3000\n\n"
+            product = await asyncio.to_thread(
+                create_product,
+                payload=ProductCreate(name="Flour", unit="kg", min_stock=5, initial_stock=10),
+                db=db_session,
+                current_user=admin_user,
+            )
+            await asyncio.to_thread(
+                create_movement,
+                payload=MovementCreate(product_id=product.id, movement_type="OUT", quantity=6),
+                db=db_session,
+                current_user=admin_user,
+            )
+            events = [parse(await anext(watcher)), parse(await anext(watcher))]
+            await watcher.aclose()
+            return product.id, events
+
+        product_id, watched = asyncio.run(watch())
+        first, second = broadcaster.backlog(broadcaster.event_id(0))
+        assert [parse(broadcaster.format(item)) for item in (first, second)] == watched
+        assert first[1:] == (
+            "balance",
+            {"product_id": product_id, "balance": 10, "low_stock": False, "is_active": True},
+        )
+        assert second[1:] == (
+            "balance",
+            {"product_id": product_id, "balance": 4, "low_stock": True, "is_active": True},
+        )
+
+        async def consume() -> list[tuple[str, str, dict]]:
+            stream = broadcaster.stream(broadcaster.event_id(first[0]), connected, 5)
+            assert await anext(stream) == b"retry: 3000\n\n"
+            resumed = parse(await anext(stream))
+            waiting = asyncio.ensure_future(anext(stream))
+            await asyncio.to_thread(deactivate_product, product_id=product_id, db=db_session)
+            live = parse(await waiting)
+            await stream.aclose()
+            return [resumed, live]
+
+        resumed, live = asyncio.run(consume())
+        assert resumed == (broadcaster.event_id(second[0]), "balance", second[2])
+        assert live[1:] == (
+            "balance",
+            {"product_id": product_id, "balance": 4, "low_stock": True, "is_active": False},
+        )
+
+        for _ in range(4):
+            create_movement(
+                payload=MovementCreate(product_id=product_id, movement_type="IN", quantity=1),
+                db=db_session,
+                current_user=admin_user,
+            )
+        assert broadcaster.backlog(broadcaster.event_id(first[0]))[-1] == (4, "reset", {})
+        assert broadcaster.backlog("stale-epoch-3") is None
+        for _ in range(4):
+            broadcaster.publish([("balance", {"product_id": product_id})])
+        assert broadcaster.backlog(broadcaster.event_id(first[0])) is None
+
+        async def reconnect() -> tuple[str, str, dict]:
+            stream = broadcaster.stream(broadcaster.event_id(first[0]), connected, 5)
+            await anext(stream)
+            reset = parse(await anext(stream))
+            await stream.aclose()
+            return reset
+
+        assert asyncio.run(reconnect()) == (broadcaster.event_id(8), "reset", {})
+    finally:
+        stop_stock_events()
+
+
+def test_stock_events_skip_lookups_without_listeners(db_session, admin_user, monkeypatch):
+    broadcaster = start_stock_events(sessionmaker(bind=db_session.get_bind()), "memory", 4)
+    looked_up = []
+    monkeypatch.setattr(
+        broadcaster, "changes", lambda product_ids, bind: looked_up.append(product_ids) or []
+    )
+    try:
+        products = [
+            create_product(
+                payload=ProductCreate(name=f"Item {index}", unit="pcs", initial_stock=3),
+                db=db_session,
+                current_user=admin_user,
+            )
+            for index in range(5)
+        ]
+        assert broadcaster.backlog(broadcaster.event_id(0)) == [(1, "reset", {})]
+
+        async def bulk() -> tuple[str, str, dict]:
+            stream = broadcaster.stream(broadcaster.event_id(1), connected, 5)
+            await anext(stream)
+            await asyncio.to_thread(
+                create_movements_bulk,
+                payload=MovementBulkCreate(
+                    items=[
+                        {"product_id": product.id, "movement_type": "OUT", "quantity": 1}
+                        for product in products
+                    ]
+                ),
+                db=db_session,
+                current_user=admin_user,
+            )
+            reset = parse(await anext(stream))
+            await stream.aclose()
+            return reset
+
+        assert asyncio.run(bulk()) == (broadcaster.event_id(2), "reset", {})
+        assert looked_up == []
+    finally:
+        stop_stock_events()
+
+
+@pytest.mark.skipif(
+    not os.getenv("TEST_POSTGRES_URL"), reason="set TEST_POSTGRES_URL to check LISTEN/NOTIFY"
+)
+def test_postgres_stock_events_fan_out_through_notify():
+    engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+    sender = PostgresStockEventBroadcaster(sessionmaker(bind=engine))
+    listener = PostgresStockEventBroadcaster(sessionmaker(bind=engine))
+    listener.start()
+    try:
+        event = ("balance", {"product_id": 1, "balance": 3, "low_stock": True, "is_active": True})
+        deadline = time.monotonic() + 10
+        received = []
+        while not received and time.monotonic() < deadline:
+            sender.send([event], engine)
+            time.sleep(0.2)
+            backlog = listener.backlog(listener.event_id(0))
+            received = [item for item in backlog if item[1] != "reset"]
+        assert received and received[0][1:] == event
+    finally:
+        listener.stop()
+        engine.dispose()
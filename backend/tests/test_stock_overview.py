@@ -1,6 +1,7 @@
 from app.api.products import create_product
 from app.api.stock import low_stock_count, stock_overview
 from app.schemas.product import ProductCreate
+from app.services.stock_query import stock_query
 
 
 def test_low_stock_detection(db_session, admin_user):
@@ -76,3 +77,11 @@ def test_stock_overview_search(db_session, admin_user):
     assert overview.total == 1
     assert len(overview.items) == 1
     assert overview.items[0].name == "Sea Salt"
+
+
+def test_stock_statements_are_built_once(db_session):
+    query = stock_query(db_session)
+    page = query.page("like", True, False, "balance", "desc", True, True)
+    assert stock_query(db_session) is query
+    assert query.page("like", True, False, "balance", "desc", True, True) is page
+    assert query.page("like", True, False, "balance", "desc", True, False) is not page